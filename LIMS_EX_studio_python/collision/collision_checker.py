@@ -0,0 +1,279 @@
+import numpy as np
+from .stl_mesh import MeshCache, IndexedMesh
+from ..ik_solver.urdf_kinematics import LIMSExForwardKinematics, parse_urdf
+from ..global_variables import LIMS_EX_URDF_PATH
+
+# sphere proxy 셀 크기 [m]
+DEFAULT_PROXY_CELL_SIZE = 0.03
+
+
+class SphereProxy:
+    """
+    link 메쉬를 감싸는 sphere 집합 (link 좌표계). 모든 삼각형이 sphere 합집합 안에 들어가므로 보수적(conservative).
+    2단 BVH: link bounding sphere -> 셀 sphere들.
+    """
+
+    def __init__(self, centers: np.ndarray, radii: np.ndarray):
+        self.centers = np.asarray(centers, dtype=float)
+        self.radii = np.asarray(radii, dtype=float)
+        lo = (self.centers - self.radii[:, None]).min(axis=0)
+        hi = (self.centers + self.radii[:, None]).max(axis=0)
+        self.bound_center = 0.5 * (lo + hi)
+        self.bound_radius = float(np.max(np.linalg.norm(self.centers - self.bound_center, axis=1) + self.radii))
+
+    @classmethod
+    def from_mesh(cls, mesh: IndexedMesh, cell_size: float = DEFAULT_PROXY_CELL_SIZE) -> "SphereProxy":
+        triangles = mesh.triangles().astype(float)
+
+        # 셀보다 긴 삼각형은 4분할 반복 (sphere가 과도하게 커지지 않도록)
+        while True:
+            edges = np.linalg.norm(triangles - np.roll(triangles, 1, axis=1), axis=2).max(axis=1)
+            large = edges > cell_size
+            if not np.any(large):
+                break
+            t = triangles[large]
+            m01, m12, m20 = 0.5 * (t[:, 0] + t[:, 1]), 0.5 * (t[:, 1] + t[:, 2]), 0.5 * (t[:, 2] + t[:, 0])
+            split = np.concatenate((
+                np.stack((t[:, 0], m01, m20), axis=1),
+                np.stack((m01, t[:, 1], m12), axis=1),
+                np.stack((m20, m12, t[:, 2]), axis=1),
+                np.stack((m01, m12, m20), axis=1),
+            ))
+            triangles = np.concatenate((triangles[~large], split))
+
+        # 삼각형 중심이 속한 셀별로 sphere 하나: 중심 = 셀 vertex 평균, 반지름 = 셀 삼각형 vertex까지 최대 거리
+        cells = np.floor(triangles.mean(axis=1) / cell_size).astype(np.int64)
+        _, cell = np.unique(cells, axis=0, return_inverse=True)
+        cell = cell.reshape(-1)
+        n_cells = cell.max() + 1
+        corner_cell = np.repeat(cell, 3)
+        corners = triangles.reshape(-1, 3)
+        counts = np.bincount(corner_cell, minlength=n_cells)
+        centers = np.stack(
+            [np.bincount(corner_cell, weights=corners[:, k], minlength=n_cells) / counts for k in range(3)], axis=1
+        )
+        radii = np.zeros(n_cells)
+        np.maximum.at(radii, corner_cell, np.linalg.norm(corners - centers[corner_cell], axis=1))
+        return cls(centers, radii)
+
+
+class BoxObstacle:
+    """world 기준 oriented box 장애물"""
+
+    def __init__(self, name: str, center, half_extents, rotation=None):
+        self.name = name
+        self.center = np.asarray(center, dtype=float)
+        self.half_extents = np.asarray(half_extents, dtype=float)
+        self.rotation = np.eye(3) if rotation is None else np.asarray(rotation, dtype=float)
+
+    def distance(self, points: np.ndarray) -> np.ndarray:
+        """점들(..., 3)에서 box 표면까지 거리 (내부는 0)"""
+        local = (points - self.center) @ self.rotation
+        outside = np.maximum(np.abs(local) - self.half_extents, 0.0)
+        return np.linalg.norm(outside, axis=-1)
+
+
+class CollisionReport:
+    """궤적 충돌 검사 결과"""
+
+    def __init__(self, colliding: np.ndarray, times: np.ndarray, first_index=None, first_pair=None):
+        self.colliding = colliding  # (N,) bool
+        self.times = times
+        self.first_index = first_index
+        self.first_pair = first_pair  # (link, link 또는 장애물 이름)
+
+    @property
+    def ok(self) -> bool:
+        return self.first_index is None
+
+    @property
+    def first_time(self):
+        return None if self.first_index is None else float(self.times[self.first_index])
+
+    def summary(self) -> str:
+        if self.ok:
+            return f"✅ 충돌 없음 ({len(self.colliding)} samples)"
+        return (f"⚠️ 충돌: t={self.first_time:.3f}s {self.first_pair[0]} <-> {self.first_pair[1]} "
+                f"({int(np.sum(self.colliding))}/{len(self.colliding)} samples)")
+
+
+def load_link_proxies(mesh_cache: MeshCache = None, link_names: list = None,
+                      cell_size: float = DEFAULT_PROXY_CELL_SIZE) -> dict:
+    """meshes 폴더의 STL로 link별 SphereProxy 생성 (파일 이름 = link 이름)"""
+    mesh_cache = MeshCache() if mesh_cache is None else mesh_cache
+    meshes = mesh_cache.load_directory()
+    return {
+        name: SphereProxy.from_mesh(mesh, cell_size)
+        for name, mesh in meshes.items()
+        if link_names is None or name in link_names
+    }
+
+
+class CollisionChecker:
+    """
+    URDF FK로 link sphere proxy를 배치해 궤적 전체를 배치 검사.
+    broad phase: 모든 샘플 x link 쌍의 bounding sphere를 한 번에, narrow phase: 후보 (샘플, 쌍)만 sphere 집합끼리.
+    """
+
+    # 한 번에 처리하는 샘플 수
+    BATCH_SIZE = 4096
+    # narrow phase에서 한 번에 만드는 거리 행렬 원소 수 상한
+    NARROW_ELEMENTS = 4000000
+
+    def __init__(self, fk: LIMSExForwardKinematics = None, proxies: dict = None, obstacles: list = None,
+                 ignore_pairs: list = None, margin: float = 0.0, urdf_path: str = LIMS_EX_URDF_PATH):
+        """
+        Args:
+            fk: forward kinematics (기본: LIMS_EX.urdf)
+            proxies: {link 이름: SphereProxy} (기본: meshes 폴더 STL)
+            obstacles: [BoxObstacle, ...]
+            ignore_pairs: 검사하지 않을 (link, link) 쌍 (인접 link와 zero 자세에서 닿는 쌍은 자동 제외)
+            margin: 이 거리 이내면 충돌로 판정 [m]
+        """
+        self.fk = LIMSExForwardKinematics(urdf_path) if fk is None else fk
+        self.proxies = load_link_proxies(link_names=self.fk.link_names) if proxies is None else proxies
+        self.obstacles = [] if obstacles is None else list(obstacles)
+        self.margin = margin
+
+        self._links = [name for name in self.fk.link_names if name in self.proxies]
+        self._link_fk_index = np.array([self.fk.link_index(name) for name in self._links])
+        self._bound_centers = np.array([self.proxies[name].bound_center for name in self._links])
+        self._bound_radii = np.array([self.proxies[name].bound_radius for name in self._links])
+
+        # 인접(parent-child) 쌍 제외
+        _, joints = parse_urdf(urdf_path)
+        ignored = {frozenset((joint.parent, joint.child)) for joint in joints}
+        ignored |= {frozenset(pair) for pair in (ignore_pairs or [])}
+        pairs = [
+            (i, j) for i in range(len(self._links)) for j in range(i + 1, len(self._links))
+            if frozenset((self._links[i], self._links[j])) not in ignored
+        ]
+        self._pairs = np.array(pairs, dtype=int).reshape(-1, 2)
+
+        # zero 자세에서 이미 겹치는 쌍은 메쉬 접촉으로 보고 제외 (allowed collision)
+        zero_hits = self._self_collisions(np.zeros((1, len(self.fk.joint_names))))
+        if zero_hits.size:
+            self._pairs = np.delete(self._pairs, np.unique(zero_hits[:, 1]), axis=0)
+
+    @property
+    def checked_pairs(self) -> list:
+        return [(self._links[i], self._links[j]) for i, j in self._pairs]
+
+    def check(self, q: np.ndarray, times: np.ndarray = None) -> CollisionReport:
+        """
+        Args:
+            q: (N, dof) 관절값 (fk.joint_names 순서)
+            times: (N,) 샘플 시간 (기본: 샘플 인덱스)
+        """
+        q = np.atleast_2d(np.asarray(q, dtype=float))
+        times = np.arange(q.shape[0], dtype=float) if times is None else np.asarray(times, dtype=float)
+        colliding = np.zeros(q.shape[0], dtype=bool)
+        first_index, first_pair = None, None
+
+        for start in range(0, q.shape[0], self.BATCH_SIZE):
+            batch = q[start:start + self.BATCH_SIZE]
+            rotations, translations = self._link_poses(batch)
+            hits = [(self._self_collisions_from_poses(rotations, translations), False)]
+            hits.append((self._obstacle_collisions(rotations, translations), True))
+
+            for hit, is_obstacle in hits:
+                if hit.size == 0:
+                    continue
+                colliding[start + hit[:, 0]] = True
+                order = np.argmin(hit[:, 0])
+                sample = start + hit[order, 0]
+                if first_index is None or sample < first_index:
+                    first_index = int(sample)
+                    if is_obstacle:
+                        link, obstacle = hit[order, 1], hit[order, 2]
+                        first_pair = (self._links[link], self.obstacles[obstacle].name)
+                    else:
+                        i, j = self._pairs[hit[order, 1]]
+                        first_pair = (self._links[i], self._links[j])
+
+        return CollisionReport(colliding, times, first_index, first_pair)
+
+    def check_trajectory(self, trajectory, sample_dt: float = 0.01) -> CollisionReport:
+        """PiecewiseHermiteSpline을 sample_dt 간격으로 샘플링해 검사"""
+        times = np.append(np.arange(0.0, trajectory.duration, sample_dt), trajectory.duration)
+        positions, _ = trajectory.evaluate_batch(times)
+        q = np.zeros((len(times), len(self.fk.joint_names)))
+        q[:, :positions.shape[1]] = positions
+        return self.check(q, times)
+
+    # ========================================
+    # 내부 계산
+    # ========================================
+    def _link_poses(self, q: np.ndarray) -> tuple:
+        rotations, translations = self.fk.compute_link_poses(q)
+        return rotations[:, self._link_fk_index], translations[:, self._link_fk_index]
+
+    def _self_collisions(self, q: np.ndarray) -> np.ndarray:
+        return self._self_collisions_from_poses(*self._link_poses(q))
+
+    def _self_collisions_from_poses(self, rotations: np.ndarray, translations: np.ndarray) -> np.ndarray:
+        """Returns: (H, 2) [샘플, pair 인덱스]"""
+        if self._pairs.size == 0:
+            return np.zeros((0, 2), dtype=int)
+
+        # broad phase: (B, P) bounding sphere 검사
+        centers = np.matmul(rotations, self._bound_centers[..., None])[..., 0] + translations
+        a, b = self._pairs[:, 0], self._pairs[:, 1]
+        gap = np.linalg.norm(centers[:, a] - centers[:, b], axis=2) - self._bound_radii[a] - self._bound_radii[b]
+        samples, pairs = np.nonzero(gap <= self.margin)
+
+        # narrow phase: 쌍별로 후보 샘플만 sphere 집합끼리
+        result = []
+        for pair in np.unique(pairs):
+            candidate = samples[pairs == pair]
+            i, j = self._pairs[pair]
+            hit = self._sphere_sets_overlap(
+                self.proxies[self._links[i]], rotations[candidate, i], translations[candidate, i],
+                self.proxies[self._links[j]], rotations[candidate, j], translations[candidate, j],
+            )
+            result.append(np.stack((candidate[hit], np.full(np.count_nonzero(hit), pair)), axis=1))
+        return np.concatenate(result) if result else np.zeros((0, 2), dtype=int)
+
+    def _obstacle_collisions(self, rotations: np.ndarray, translations: np.ndarray) -> np.ndarray:
+        """Returns: (H, 3) [샘플, link 인덱스, 장애물 인덱스]"""
+        result = []
+        centers = np.matmul(rotations, self._bound_centers[..., None])[..., 0] + translations
+        for k, obstacle in enumerate(self.obstacles):
+            samples, links = np.nonzero(obstacle.distance(centers) - self._bound_radii <= self.margin)
+            for link in np.unique(links):
+                candidate = samples[links == link]
+                proxy = self.proxies[self._links[link]]
+                world = np.matmul(proxy.centers, rotations[candidate, link].transpose(0, 2, 1)) + translations[candidate, link, None]
+                hit = np.any(obstacle.distance(world) - proxy.radii <= self.margin, axis=1)
+                result.append(np.stack((candidate[hit], np.full(np.count_nonzero(hit), link),
+                                        np.full(np.count_nonzero(hit), k)), axis=1))
+        return np.concatenate(result) if result else np.zeros((0, 3), dtype=int)
+
+    def _sphere_sets_overlap(self, proxy_a, R_a, p_a, proxy_b, R_b, p_b) -> np.ndarray:
+        """후보 샘플별로 두 sphere 집합이 margin 이내로 겹치는지 (M,) bool"""
+        hit = np.zeros(R_a.shape[0], dtype=bool)
+        if len(proxy_a.radii) > len(proxy_b.radii):
+            proxy_a, R_a, p_a, proxy_b, R_b, p_b = proxy_b, R_b, p_b, proxy_a, R_a, p_a
+        # sphere가 적은 쪽(A)을 B link 좌표계로 옮기면 B sphere 중심은 고정 -> (행, Kb) 거리만 계산
+        R_rel = np.matmul(R_b.transpose(0, 2, 1), R_a)
+        p_rel = np.matmul((p_a - p_b)[:, None], R_b)
+        local_a = np.matmul(proxy_a.centers, R_rel.transpose(0, 2, 1)) + p_rel
+
+        # 2단 BVH: B bounding sphere에 닿는 A sphere만 남김
+        reach = proxy_a.radii + proxy_b.bound_radius + self.margin
+        near = np.sum((local_a - proxy_b.bound_center) ** 2, axis=2) <= reach ** 2
+        rows, spheres = np.nonzero(near)
+        if rows.size == 0:
+            return hit
+
+        centers_b = proxy_b.centers
+        norms_b = np.sum(centers_b ** 2, axis=1)
+        radii_b = proxy_b.radii + self.margin
+        chunk = max(1, self.NARROW_ELEMENTS // len(radii_b))
+        for start in range(0, rows.size, chunk):
+            s = slice(start, start + chunk)
+            points = local_a[rows[s], spheres[s]]
+            d2 = np.sum(points ** 2, axis=1)[:, None] + norms_b - 2.0 * points @ centers_b.T
+            overlap = np.any(d2 <= (proxy_a.radii[spheres[s], None] + radii_b) ** 2, axis=1)
+            hit[rows[s][overlap]] = True
+        return hit
@@ -0,0 +1,147 @@
+import numpy as np
+from .collision_checker import load_link_proxies
+from ..ik_solver.urdf_kinematics import LIMSExForwardKinematics
+from ..global_variables import LIMS_EX_URDF_PATH, LIMS_EX_GRIPPER_LINK_NAMES
+
+
+# clearance용 sphere proxy 셀 크기 [m] (충돌 검사보다 촘촘하게)
+DEFAULT_CLEARANCE_CELL_SIZE = 0.01
+# 이보다 먼 샘플은 정확한 거리 대신 보수적 하한만 계산 [m]
+DEFAULT_MAX_DISTANCE = 0.1
+
+
+class ClearanceReport:
+    """
+    샘플별 최소 거리 결과 (sphere proxy 기준이므로 실제 메쉬 거리의 하한).
+    max_distance보다 먼 샘플의 값은 keyframe에서 이동량만큼 뺀 하한 (>= max_distance).
+    """
+
+    def __init__(self, clearance: np.ndarray, times: np.ndarray, closest_link: np.ndarray,
+                 closest_obstacle: np.ndarray, link_names: list, obstacle_names: list):
+        self.clearance = clearance  # (N,) [m], 겹치면 음수
+        self.times = times
+        self.closest_link = closest_link  # (N,) link_names 인덱스
+        self.closest_obstacle = closest_obstacle  # (N,) obstacle_names 인덱스
+        self.link_names = link_names
+        self.obstacle_names = obstacle_names
+
+    @property
+    def min_index(self) -> int:
+        return int(np.argmin(self.clearance))
+
+    @property
+    def min_clearance(self) -> float:
+        return float(self.clearance[self.min_index])
+
+    @property
+    def min_time(self) -> float:
+        return float(self.times[self.min_index])
+
+    def violations(self, budget: float) -> np.ndarray:
+        """clearance가 budget보다 작은 샘플 인덱스"""
+        return np.flatnonzero(self.clearance < budget)
+
+    def summary(self, budget: float = None) -> str:
+        if len(self.clearance) == 0 or not np.isfinite(self.min_clearance):
+            return "✅ clearance 검사 대상 없음"
+        i = self.min_index
+        text = (f"최소 clearance {self.min_clearance * 1000:.1f} mm (t={self.min_time:.3f}s "
+                f"{self.link_names[self.closest_link[i]]} <-> {self.obstacle_names[self.closest_obstacle[i]]})")
+        if budget is None:
+            return "📏 " + text
+        n_violations = len(self.violations(budget))
+        if n_violations == 0:
+            return f"✅ {text}, budget {budget * 1000:.1f} mm 만족"
+        return f"⚠️ {text}, budget {budget * 1000:.1f} mm 미만 {n_violations}/{len(self.clearance)} samples"
+
+
+class DistanceQuery:
+    """
+    그리퍼 link sphere proxy와 장애물 사이 최소 거리를 배치 계산.
+    시간 일관성: WINDOW 샘플마다 keyframe에서만 전체 sphere 거리를 구하고, keyframe 대비 이동량 상한으로
+    윈도우 전체의 하한을 얻음. 하한이 max_distance보다 먼 윈도우는 sphere 거리 계산을 생략.
+    """
+
+    # keyframe 간격 (샘플 수)
+    WINDOW = 8
+    # 한 번에 처리하는 샘플 수 (WINDOW의 배수)
+    BATCH_SIZE = 4096
+
+    def __init__(self, fk: LIMSExForwardKinematics = None, proxies: dict = None, obstacles: list = None,
+                 link_names: list = LIMS_EX_GRIPPER_LINK_NAMES, max_distance: float = DEFAULT_MAX_DISTANCE,
+                 cell_size: float = DEFAULT_CLEARANCE_CELL_SIZE, urdf_path: str = LIMS_EX_URDF_PATH):
+        """
+        Args:
+            fk: forward kinematics (기본: LIMS_EX.urdf)
+            proxies: {link 이름: SphereProxy} (기본: meshes 폴더 STL을 cell_size로, CollisionChecker.proxies 재사용 가능)
+            obstacles: [BoxObstacle, ...]
+            link_names: 거리를 계산할 link
+            max_distance: 정확한 거리가 필요한 범위 [m] (np.inf면 모든 샘플 정확히 계산)
+        """
+        self.fk = LIMSExForwardKinematics(urdf_path) if fk is None else fk
+        self.proxies = load_link_proxies(link_names=link_names, cell_size=cell_size) if proxies is None else proxies
+        self.obstacles = [] if obstacles is None else list(obstacles)
+        self.max_distance = max_distance
+        self.link_names = [name for name in link_names if name in self.proxies]
+        self._link_fk_index = [self.fk.link_index(name) for name in self.link_names]
+        # link 원점에서 sphere 중심까지 최대 거리 (회전에 의한 이동량 상한)
+        self._reach = [float(np.max(np.linalg.norm(self.proxies[name].centers, axis=1))) for name in self.link_names]
+
+    def clearance(self, q: np.ndarray, times: np.ndarray = None) -> ClearanceReport:
+        """
+        Args:
+            q: (N, dof) 관절값 (fk.joint_names 순서), 시간 순서대로
+            times: (N,) 샘플 시간 (기본: 샘플 인덱스)
+        """
+        q = np.atleast_2d(np.asarray(q, dtype=float))
+        n = q.shape[0]
+        times = np.arange(n, dtype=float) if times is None else np.asarray(times, dtype=float)
+        clearance = np.full(n, np.inf)
+        closest_link = np.zeros(n, dtype=int)
+        closest_obstacle = np.zeros(n, dtype=int)
+
+        for start in range(0, n, self.BATCH_SIZE):
+            s = slice(start, start + self.BATCH_SIZE)
+            rotations, translations = self.fk.compute_link_poses(q[s])
+            for link, fk_index in enumerate(self._link_fk_index):
+                R, p = rotations[:, fk_index], translations[:, fk_index]
+                for k, obstacle in enumerate(self.obstacles):
+                    distance = self._link_clearance(self.proxies[self.link_names[link]], self._reach[link], R, p, obstacle)
+                    closer = distance < clearance[s]
+                    clearance[s][closer] = distance[closer]
+                    closest_link[s][closer] = link
+                    closest_obstacle[s][closer] = k
+
+        return ClearanceReport(clearance, times, closest_link, closest_obstacle,
+                               self.link_names, [obstacle.name for obstacle in self.obstacles])
+
+    def clearance_trajectory(self, trajectory, sample_dt: float = 0.01) -> ClearanceReport:
+        """PiecewiseHermiteSpline을 sample_dt 간격으로 샘플링해 계산"""
+        times = np.append(np.arange(0.0, trajectory.duration, sample_dt), trajectory.duration)
+        positions, _ = trajectory.evaluate_batch(times)
+        q = np.zeros((len(times), len(self.fk.joint_names)))
+        q[:, :positions.shape[1]] = positions
+        return self.clearance(q, times)
+
+    def _link_clearance(self, proxy, reach: float, R: np.ndarray, p: np.ndarray, obstacle) -> np.ndarray:
+        """한 link의 sphere 집합과 장애물 사이 샘플별 최소 거리 (N,)"""
+        n = R.shape[0]
+        keys = np.arange(0, n, self.WINDOW)
+        window = np.arange(n) // self.WINDOW
+
+        # keyframe 대비 sphere 중심 이동량 상한: |Δp| + |R_key^T R - I| * reach (= sqrt(3 - trace) * reach)
+        trace = np.sum(R[keys][window] * R, axis=(1, 2))
+        move = np.linalg.norm(p - p[keys][window], axis=1) + np.sqrt(np.maximum(3.0 - trace, 0.0)) * reach
+
+        # keyframe에서만 전체 sphere 거리 -> 샘플별 하한 (keyframe 샘플은 정확한 값)
+        key_world = np.matmul(proxy.centers, R[keys].transpose(0, 2, 1)) + p[keys, None]
+        key_min = np.min(obstacle.distance(key_world) - proxy.radii, axis=1)
+        result = key_min[window] - move
+
+        # 하한이 max_distance 이내인 윈도우만 정확히 계산
+        near = key_min - np.maximum.reduceat(move, keys) <= self.max_distance
+        samples = np.flatnonzero(near[window])
+        if samples.size:
+            world = np.matmul(proxy.centers, R[samples].transpose(0, 2, 1)) + p[samples, None]
+            result[samples] = np.min(obstacle.distance(world) - proxy.radii, axis=1)
+        return result
@@ -0,0 +1,150 @@
+import os
+import hashlib
+import numpy as np
+from ..ik_solver.urdf_kinematics import resolve_asset_path
+from ..global_variables import LIMS_EX_MESH_DIR
+
+# binary STL: 80 byte header + uint32 삼각형 개수 + 50 byte 레코드
+STL_HEADER_SIZE = 84
+STL_RECORD_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attribute", "<u2"),
+])
+
+# LOD별 vertex clustering 셀 크기 (bounding box 대각선 대비 비율)
+LOD_CELL_FRACTIONS = (0.01, 0.03, 0.08)
+
+MESH_CACHE_DIR_NAME = ".mesh_cache"
+MESH_CACHE_VERSION = 1
+
+
+def map_stl_triangles(path: str) -> np.memmap:
+    """binary STL 삼각형 레코드를 복사 없이 structured array로 memory-map"""
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.seek(80)
+        n_triangles = int(np.frombuffer(f.read(4), dtype="<u4")[0])
+    if file_size != STL_HEADER_SIZE + n_triangles * STL_RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path} is not a binary STL (size {file_size}, {n_triangles} triangles in header)")
+    return np.memmap(path, dtype=STL_RECORD_DTYPE, mode="r", offset=STL_HEADER_SIZE, shape=(n_triangles,))
+
+
+class IndexedMesh:
+    """중복 제거된 vertex + 삼각형 인덱스 메쉬 (+ LOD 목록)"""
+
+    def __init__(self, vertices: np.ndarray, faces: np.ndarray, lods: list = None):
+        """
+        Args:
+            vertices: (V, 3) float32 [m]
+            faces: (F, 3) int32 vertex 인덱스
+            lods: [IndexedMesh, ...] 점점 거칠어지는 단순화 메쉬
+        """
+        self.vertices = vertices
+        self.faces = faces
+        self.lods = [] if lods is None else lods
+
+    @classmethod
+    def from_triangles(cls, triangles: np.ndarray) -> "IndexedMesh":
+        """(F, 3, 3) 삼각형 좌표에서 동일 vertex를 하나로 합침"""
+        corners = np.ascontiguousarray(triangles, dtype=np.float32).reshape(-1, 3)
+        # 12 byte 좌표를 하나의 void 값으로 보고 unique (행 단위 unique보다 빠름)
+        keys = corners.view(np.dtype((np.void, corners.dtype.itemsize * 3))).reshape(-1)
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        return cls(corners[first], inverse.reshape(-1, 3).astype(np.int32))
+
+    def triangles(self) -> np.ndarray:
+        """(F, 3, 3) 삼각형 좌표"""
+        return self.vertices[self.faces]
+
+    def decimate(self, cell_size: float) -> "IndexedMesh":
+        """vertex clustering으로 단순화 (셀 안의 vertex를 평균점 하나로)"""
+        cells = np.floor(self.vertices / cell_size).astype(np.int64)
+        _, cluster = np.unique(cells, axis=0, return_inverse=True)
+        cluster = cluster.reshape(-1)
+        n_clusters = cluster.max() + 1
+        counts = np.bincount(cluster, minlength=n_clusters).astype(np.float64)
+        vertices = np.stack(
+            [np.bincount(cluster, weights=self.vertices[:, k], minlength=n_clusters) / counts for k in range(3)],
+            axis=1,
+        ).astype(np.float32)
+
+        faces = cluster[self.faces]
+        keep = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])
+        faces = faces[keep]
+        # 같은 vertex 집합의 중복 삼각형 제거
+        _, unique_idx = np.unique(np.sort(faces, axis=1), axis=0, return_index=True)
+        return IndexedMesh(vertices, faces[np.sort(unique_idx)].astype(np.int32))
+
+    def build_lods(self, cell_fractions=LOD_CELL_FRACTIONS):
+        extent = np.linalg.norm(self.vertices.max(axis=0) - self.vertices.min(axis=0))
+        self.lods = [self.decimate(max(extent * fraction, 1e-9)) for fraction in cell_fractions]
+        return self.lods
+
+
+class MeshCache:
+    """
+    STL -> IndexedMesh(+LOD) 변환 결과를 파일 해시 기준으로 디스크(.npz)에 캐시.
+    같은 세션에서는 (path, mtime, size)로 해시 계산도 생략.
+    """
+
+    def __init__(self, cache_dir: str = None):
+        if cache_dir is None:
+            cache_dir = os.path.join(resolve_asset_path(LIMS_EX_MESH_DIR), MESH_CACHE_DIR_NAME)
+        self._cache_dir = cache_dir
+        self._memory = {}  # abs path -> (mtime_ns, size, IndexedMesh)
+
+    def load(self, stl_path: str) -> IndexedMesh:
+        stat = os.stat(stl_path)
+        key = os.path.abspath(stl_path)
+        cached = self._memory.get(key)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        triangles = map_stl_triangles(stl_path)
+        digest = hashlib.sha1(triangles.view(np.uint8)).hexdigest()
+        cache_path = os.path.join(
+            self._cache_dir,
+            f"{os.path.splitext(os.path.basename(stl_path))[0]}-v{MESH_CACHE_VERSION}-{digest[:16]}.npz",
+        )
+
+        if os.path.exists(cache_path):
+            mesh = self._read(cache_path)
+        else:
+            mesh = IndexedMesh.from_triangles(triangles["vertices"])
+            mesh.build_lods()
+            self._write(cache_path, mesh)
+
+        self._memory[key] = (stat.st_mtime_ns, stat.st_size, mesh)
+        return mesh
+
+    def load_directory(self, mesh_dir: str = None) -> dict:
+        """mesh_dir의 모든 STL 로드. Returns: {파일 이름(확장자 제외): IndexedMesh}"""
+        if mesh_dir is None:
+            mesh_dir = resolve_asset_path(LIMS_EX_MESH_DIR)
+        meshes = {}
+        for name in sorted(os.listdir(mesh_dir)):
+            if name.lower().endswith(".stl"):
+                meshes[os.path.splitext(name)[0]] = self.load(os.path.join(mesh_dir, name))
+        return meshes
+
+    @staticmethod
+    def _read(cache_path: str) -> IndexedMesh:
+        with np.load(cache_path) as data:
+            n_lods = int(data["n_lods"])
+            lods = [IndexedMesh(data[f"lod{i}_vertices"], data[f"lod{i}_faces"]) for i in range(n_lods)]
+            return IndexedMesh(data["vertices"], data["faces"], lods)
+
+    def _write(self, cache_path: str, mesh: IndexedMesh):
+        arrays = {"vertices": mesh.vertices, "faces": mesh.faces, "n_lods": np.array(len(mesh.lods))}
+        for i, lod in enumerate(mesh.lods):
+            arrays[f"lod{i}_vertices"] = lod.vertices
+            arrays[f"lod{i}_faces"] = lod.faces
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️ 메쉬 캐시 저장 실패: {e}")
@@ -23,6 +23,7 @@ from omni.usd import StageEventType
 
 from .global_variables import EXTENSION_TITLE
 from .ui_builder import UIBuilder
+from .profiling.callback_timer import CallbackTimer
 
 """
 This file serves as a basic template for the standard boilerplate operations
@@ -138,7 +139,9 @@ class Extension(omni.ext.IExt):
     def _on_timeline_event(self, event):
         if event.type == int(omni.timeline.TimelineEventType.PLAY):
             if not self._physx_subscription:
-                self._physx_subscription = self._physxIFace.subscribe_physics_step_events(self._on_physics_step)
+                self._physx_subscription = self._physxIFace.subscribe_physics_step_events(
+                    CallbackTimer.instance().wrap("Extension._on_physics_step", self._on_physics_step)
+                )
         elif event.type == int(omni.timeline.TimelineEventType.STOP):
             self._physx_subscription = None
 
@@ -11,12 +11,37 @@ EXTENSION_TITLE = "LIMS_EX_studio"
 
 LIMS_EX_IK_DESCRIPTOR_PATH = "LIMS_EX/LIMS_EX_studio_python/ik_solver/lims_ex_descriptor.yaml"
 LIMS_EX_URDF_PATH = "LIMS_EX/asset/LIMS_EX_urdf/urdf/LIMS_EX.urdf"
+LIMS_EX_MESH_DIR = "LIMS_EX/asset/LIMS_EX_urdf/meshes"
 
 LIMS_EX_PRIM_PATH = "/LIMS_EX"
 LIMS_EX_PRIM_NAME = "LIMS_EX"
 
 CUBOID_PRIM_PATH = "/Scenario/cuboid"
 
+# Fleet 재생용 복제 로봇 (/Fleet/LIMS_EX_0, /Fleet/LIMS_EX_1, ...)
+FLEET_PRIM_ROOT = "/Fleet"
+FLEET_VIEW_NAME = "lims_ex_fleet"
+# 복제 로봇 격자 간격 [m]
+FLEET_SPACING = 1.5
+
 TRAJECTORY_DIR = "LIMS_EX/LIMS_EX_studio_python/trajectory"
+# joint state 기록 파일 폴더 (TRAJECTORY_DIR 아래)
+RECORDING_DIR_NAME = "recordings"
+# 기록을 via point 그룹으로 압축할 때 조인트별 기본 허용 오차 [deg]
+VIA_POINT_COMPRESSION_TOLERANCE_DEG = 0.1
+
+LIMS_EX_JOINT_NAMES = ['SY', 'SP', 'EB1', 'EB2', 'WP', 'WR', 'WY', 'LF', 'RF']
+
+# 장애물과의 clearance를 계산하는 link
+LIMS_EX_GRIPPER_LINK_NAMES = ['gripper', 'left_finger', 'right_finger']
+
+# URDF에는 가속도 limit이 없으므로 궤적 검증/리타이밍에 사용할 조인트 가속도 limit [rad/s^2]
+LIMS_EX_MAX_JOINT_ACCELERATION = 2.0
+
+# 외부 프로세스 via point 스트리밍 (localhost TCP)
+VIA_POINT_STREAM_PORT = 47800
+# 재생 대기 via point 최대 개수 (넘치면 publisher가 막힘)
+VIA_POINT_STREAM_QUEUE_SIZE = 8
 
-LIMS_EX_JOINT_NAMES = ['SY', 'SP', 'EB1', 'EB2', 'WP', 'WR', 'WY', 'LF', 'RF']
\ No newline at end of file
+# Step Timing 통계 UI 갱신 주기 [s]
+STEP_TIMING_REFRESH_PERIOD = 0.5
@@ -0,0 +1,457 @@
+"""
+Isaac Sim 없이 P2PStudio 재생 코드를 고정 dt로 돌려 step별 latency / 메모리 할당을 측정.
+
+    python LIMS_EX_studio_python/headless/playback_benchmark.py --group test --mode all
+    python LIMS_EX_studio_python/headless/playback_benchmark.py --synthetic 1000 --dt 0.005
+    python LIMS_EX_studio_python/headless/playback_benchmark.py --fleet 1,10,100 --synthetic 100
+    python LIMS_EX_studio_python/headless/playback_benchmark.py --playlist --synthetic 100
+    python LIMS_EX_studio_python/headless/playback_benchmark.py --stream 200 --stream-gap 1.0
+    python LIMS_EX_studio_python/headless/playback_benchmark.py --record --synthetic 1000 --dt 0.001 --mode inplace
+"""
+import os
+import sys
+import time
+import json
+import asyncio
+import types
+import argparse
+import threading
+import tempfile
+import tracemalloc
+import numpy as np
+
+PACKAGE_NAME = "LIMS_EX_studio_python"
+
+
+def bootstrap_package():
+    """extension __init__ (omni.ext import)을 실행하지 않고 패키지를 namespace로 등록"""
+    if PACKAGE_NAME in sys.modules:
+        return
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    package = types.ModuleType(PACKAGE_NAME)
+    package.__path__ = [package_dir]
+    sys.modules[PACKAGE_NAME] = package
+
+
+bootstrap_package()
+
+from LIMS_EX_studio_python.headless import stand_ins  # noqa: E402
+from LIMS_EX_studio_python.headless.stand_ins import (  # noqa: E402
+    HeadlessSimulationContext, HeadlessStringField, HeadlessUIBuilder, KinematicArticulation,
+    KinematicArticulationView, install_stand_ins,
+)
+from LIMS_EX_studio_python.profiling.callback_timer import CallbackTimer  # noqa: E402
+from LIMS_EX_studio_python.p2p_studio.retiming import DEFAULT_APPROACH_DURATION, minimum_segment_durations  # noqa: E402
+from LIMS_EX_studio_python.p2p_studio.trajectory_io import write_via_point_csv  # noqa: E402
+from LIMS_EX_studio_python.p2p_studio.via_point_stream import ViaPointStreamPublisher  # noqa: E402
+from LIMS_EX_studio_python.p2p_studio.trajectory_validator import JointLimits  # noqa: E402
+from LIMS_EX_studio_python.recording.joint_state_log import JointStateLog  # noqa: E402
+from LIMS_EX_studio_python.ik_solver.urdf_kinematics import resolve_asset_path  # noqa: E402
+from LIMS_EX_studio_python.global_variables import LIMS_EX_JOINT_NAMES, TRAJECTORY_DIR  # noqa: E402
+
+PERCENTILES = (50, 90, 99, 99.9)
+# --fleet / --playlist + --synthetic: 로봇에 나눠 주거나 이어서 재생할 서로 다른 랜덤 그룹 수
+FLEET_SYNTHETIC_GROUPS = 4
+
+
+def load_p2p_studio():
+    """
+    isaacsim을 import할 수 없으면 stand-in을 등록한 뒤 P2PStudio를 import.
+    import만으로 sys.modules를 바꾸지 않도록 실행 시점에 호출 (run_benchmarks 등에서 import해도 안전).
+    """
+    install_stand_ins()
+    from LIMS_EX_studio_python.p2p_studio.p2p_studio import P2PStudio
+    return P2PStudio
+
+
+def write_synthetic_group(traj_dir: str, name: str, n_points: int, seed: int = 0) -> str:
+    """URDF limit 안의 랜덤 via point 그룹 생성 (duration은 limit 기반 최소값)"""
+    limits = JointLimits.from_urdf()
+    rng = np.random.default_rng(seed)
+    center = 0.5 * (limits.lower + limits.upper)
+    half_range = 0.5 * (limits.upper - limits.lower)
+    positions = center + 0.5 * half_range * rng.uniform(-1.0, 1.0, size=(n_points, len(LIMS_EX_JOINT_NAMES)))
+    durations = np.full(n_points, DEFAULT_APPROACH_DURATION)
+    if n_points > 1:
+        durations[1:] = minimum_segment_durations(positions, limits)
+
+    group_dir = os.path.join(traj_dir, name + "_group")
+    os.makedirs(group_dir, exist_ok=True)
+    write_via_point_csv(os.path.join(group_dir, "lims_ex_viapoints.csv"), durations, np.degrees(positions),
+                        LIMS_EX_JOINT_NAMES)
+    return group_dir
+
+
+def run_playback(traj_dir: str, group: str, mode: str, dt: float, trace_allocations: bool = False,
+                 max_steps: int = 10_000_000, record: bool = False) -> dict:
+    """
+    P2PStudio.on_p2p_play_clicked()부터 재생 완료까지 stand-in으로 구동.
+    record면 재생 전에 joint state 기록을 켜고, 끝난 뒤 기록 파일을 다시 읽어 검증.
+    Returns:
+        {"mode", "steps", "latency_us": {p50, ...}, "alloc_bytes": {...}, ...}
+    """
+    P2PStudio = load_p2p_studio()
+    if trace_allocations:
+        tracemalloc.start()
+        overhead = _measurement_overhead()
+
+    HeadlessSimulationContext.clear_instance()
+    # 할당 측정 시에는 timing 기록(ns int)을 끄고 callback 구간만 측정
+    sim_ctx = HeadlessSimulationContext(physics_dt=dt, trace_allocations=trace_allocations)
+    articulation = KinematicArticulation()
+    sim_ctx.articulations.append(articulation)
+    timer = CallbackTimer.instance()
+    timer_enabled = timer.enabled
+    timer.enabled = not trace_allocations
+
+    studio = P2PStudio(HeadlessUIBuilder(articulation), traj_dir, HeadlessStringField(group))
+    studio.set_playback_mode(mode)
+    click_ms = _click(studio, studio.on_p2p_play_clicked)
+    if record:
+        # _click의 cleanup이 기록도 멈추므로 재생 시작 후에 켬
+        studio.on_record_clicked()
+        recorder = studio._recorder
+    if not sim_ctx.physics_callback_exists("p2p_playback"):
+        timer.enabled = timer_enabled
+        if trace_allocations:
+            tracemalloc.stop()
+        raise RuntimeError(f"playback did not start (mode={mode}, group={group})")
+
+    if trace_allocations:
+        start_snapshot = tracemalloc.take_snapshot()
+    steps = 0
+    while sim_ctx.physics_callback_exists("p2p_playback") and steps < max_steps:
+        sim_ctx.step()
+        steps += 1
+    timer.enabled = timer_enabled
+
+    result = {"mode": mode, "group": group, "dt": dt, "steps": steps, "sim_time": sim_ctx.current_time,
+              "click_ms": click_ms}
+    if record:
+        stop_start = time.perf_counter()
+        studio.on_record_clicked()
+        result["record"] = _check_recording(recorder, sim_ctx, time.perf_counter() - stop_start)
+    latencies = np.asarray(sim_ctx.callback_times_ns.get("p2p_playback", []), dtype=float) / 1000.0
+    if latencies.size:
+        result["latency_us"] = {f"p{p}": float(np.percentile(latencies, p)) for p in PERCENTILES}
+        result["latency_us"]["max"] = float(latencies.max())
+        result["latency_us"]["mean"] = float(latencies.mean())
+    if trace_allocations:
+        # 측정용 리스트 등 harness / stand-in에서 생긴 할당은 제외
+        own_files = [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, stand_ins.__file__),
+                     tracemalloc.Filter(False, tracemalloc.__file__)]
+        diff = tracemalloc.take_snapshot().filter_traces(own_files).compare_to(
+            start_snapshot.filter_traces(own_files), "filename"
+        )
+        tracemalloc.stop()
+        peaks = np.maximum(np.asarray(sim_ctx.callback_alloc_bytes["p2p_playback"], dtype=float) - overhead, 0.0)
+        # 마지막 step(완료 처리, callback 제거)은 제외한 steady state
+        steady = peaks[:-1] if peaks.size > 1 else peaks
+        result["alloc_bytes"] = {
+            "per_step_peak_p50": float(np.percentile(steady, 50)),
+            "per_step_peak_max": float(steady.max()),
+            "allocating_steps": int(np.count_nonzero(steady)),
+            "net": int(sum(stat.size_diff for stat in diff)),
+        }
+    return result
+
+
+def run_fleet_playback(traj_dir: str, groups: list, n_robots: int, mode: str, dt: float,
+                       max_steps: int = 10_000_000) -> dict:
+    """
+    P2PStudio.on_fleet_play_clicked()부터 재생 완료까지 KinematicArticulationView(n_robots)로 구동.
+    Returns:
+        {"mode": "fleet", "robots", "steps", "latency_us": {...}, ...}
+    """
+    P2PStudio = load_p2p_studio()
+    HeadlessSimulationContext.clear_instance()
+    sim_ctx = HeadlessSimulationContext(physics_dt=dt)
+    view = KinematicArticulationView(n_robots)
+    sim_ctx.articulations.append(view)
+
+    studio = P2PStudio(HeadlessUIBuilder(fleet_view=view), traj_dir, HeadlessStringField(",".join(groups)))
+    studio.set_playback_mode(mode)
+    click_ms = _click(studio, studio.on_fleet_play_clicked)
+    if not sim_ctx.physics_callback_exists("fleet_playback"):
+        raise RuntimeError(f"fleet playback did not start (robots={n_robots}, groups={groups})")
+
+    steps = 0
+    while sim_ctx.physics_callback_exists("fleet_playback") and steps < max_steps:
+        sim_ctx.step()
+        steps += 1
+
+    result = {"mode": f"fleet x{n_robots}", "robots": n_robots, "dt": dt, "steps": steps,
+              "sim_time": sim_ctx.current_time, "click_ms": click_ms}
+    # 마지막 step(완료 처리)은 제외
+    latencies = np.asarray(sim_ctx.callback_times_ns["fleet_playback"][:-1], dtype=float) / 1000.0
+    if latencies.size:
+        result["latency_us"] = {f"p{p}": float(np.percentile(latencies, p)) for p in PERCENTILES}
+        result["latency_us"]["max"] = float(latencies.max())
+        result["latency_us"]["mean"] = float(latencies.mean())
+        result["latency_us"]["per_robot_p50"] = result["latency_us"]["p50"] / n_robots
+    return result
+
+
+def run_playlist_playback(traj_dir: str, groups: list, mode: str, dt: float, max_steps: int = 10_000_000) -> dict:
+    """P2PStudio.on_playlist_play_clicked()부터 마지막 그룹 완료까지 구동. 그룹 경계 step의 latency는 따로 집계"""
+    P2PStudio = load_p2p_studio()
+    HeadlessSimulationContext.clear_instance()
+    sim_ctx = HeadlessSimulationContext(physics_dt=dt)
+    articulation = KinematicArticulation()
+    sim_ctx.articulations.append(articulation)
+
+    studio = P2PStudio(HeadlessUIBuilder(articulation), traj_dir, HeadlessStringField(",".join(groups)))
+    studio.set_playback_mode(mode)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        start = time.perf_counter()
+        studio.on_playlist_play_clicked()
+        click_ms = (time.perf_counter() - start) * 1000.0
+        if studio.pending_load is not None:
+            loop.run_until_complete(studio.pending_load)
+        if not sim_ctx.physics_callback_exists("p2p_playback"):
+            raise RuntimeError(f"playlist did not start (groups={groups})")
+
+        # 다음 item 스플라인은 재생 중 worker에서 만들어지므로 loader는 재생이 끝날 때까지 유지
+        steps = 0
+        while sim_ctx.physics_callback_exists("p2p_playback") and steps < max_steps:
+            sim_ctx.step()
+            steps += 1
+    finally:
+        studio.cleanup(wait=True)
+        asyncio.set_event_loop(None)
+        loop.close()
+
+    result = {"mode": f"playlist x{len(groups)}", "dt": dt, "steps": steps, "sim_time": sim_ctx.current_time,
+              "click_ms": click_ms}
+    latencies = np.asarray(sim_ctx.callback_times_ns["p2p_playback"][:-1], dtype=float) / 1000.0
+    if latencies.size:
+        result["latency_us"] = {f"p{p}": float(np.percentile(latencies, p)) for p in PERCENTILES}
+        result["latency_us"]["max"] = float(latencies.max())
+        result["latency_us"]["mean"] = float(latencies.mean())
+    return result
+
+
+def run_stream_playback(n_points: int, dt: float, point_duration: float = 0.05, gap: float = 0.0,
+                        seed: int = 0) -> dict:
+    """
+    stand-in publisher thread가 localhost로 n_points개 via point를 최대한 빨리 보내고 (back-pressure로 조절),
+    physics step은 실제 시간에 맞춰 dt마다 실행. gap > 0이면 중간에 gap [s] 동안 전송을 멈춰 underrun을 만듦.
+    Returns:
+        {"mode": "stream", "latency_ms": 수신 -> 현재 구간 목표, "underruns", "latency_us": callback 실행 시간, ...}
+    """
+    P2PStudio = load_p2p_studio()
+    HeadlessSimulationContext.clear_instance()
+    sim_ctx = HeadlessSimulationContext(physics_dt=dt)
+    articulation = KinematicArticulation()
+    sim_ctx.articulations.append(articulation)
+    studio = P2PStudio(HeadlessUIBuilder(articulation), tempfile.gettempdir(), HeadlessStringField(""))
+    studio.stream_port = 0
+    studio.on_stream_clicked()
+    server = studio._stream_server
+    if server is None:
+        raise RuntimeError("stream did not start")
+
+    rng = np.random.default_rng(seed)
+    # 작은 random walk (limit 안에서 부드럽게 움직이는 점들)
+    points = np.cumsum(rng.normal(scale=0.02, size=(n_points, len(LIMS_EX_JOINT_NAMES))), axis=0)
+    blocked_s = [0.0]
+
+    def publish():
+        with ViaPointStreamPublisher(*server.address) as publisher:
+            for i, positions in enumerate(points):
+                if gap > 0.0 and i == n_points // 2:
+                    time.sleep(gap)
+                start = time.perf_counter()
+                publisher.send(point_duration, positions)
+                blocked_s[0] += time.perf_counter() - start
+            publisher.end()
+
+    publisher_thread = threading.Thread(target=publish, daemon=True)
+    publisher_thread.start()
+    steps = 0
+    next_tick = time.perf_counter()
+    while sim_ctx.physics_callback_exists("p2p_playback"):
+        next_tick += dt
+        sim_ctx.step()
+        steps += 1
+        delay = next_tick - time.perf_counter()
+        if delay > 0.0:
+            time.sleep(delay)
+    publisher_thread.join()
+    # physics step은 종료만 알리므로 reader thread join은 UI / cleanup 경로에서
+    studio._stop_stream()
+
+    result = {"mode": "stream", "dt": dt, "steps": steps, "sim_time": sim_ctx.current_time, "click_ms": 0.0,
+              "points": n_points, "received": server.received, "underruns": studio.stream_underruns,
+              "publisher_blocked_s": blocked_s[0]}
+    latency = studio.stream_latency.stats()
+    result["latency_ms"] = {key: latency[key] / 1000.0 for key in ("p50", "p99", "max")}
+    latencies = np.asarray(sim_ctx.callback_times_ns["p2p_playback"], dtype=float) / 1000.0
+    result["latency_us"] = {f"p{p}": float(np.percentile(latencies, p)) for p in PERCENTILES}
+    result["latency_us"]["max"] = float(latencies.max())
+    return result
+
+
+def _check_recording(recorder, sim_ctx: HeadlessSimulationContext, stop_s: float) -> dict:
+    """기록 파일을 memmap으로 다시 읽어 record 수 / 시간 연속성 / 재생 구간 확인"""
+    log = JointStateLog(recorder.path)
+    latencies = np.asarray(sim_ctx.callback_times_ns.get("joint_state_recorder", []), dtype=float) / 1000.0
+    times = np.concatenate([chunk["time"] for chunk in log.chunks(4096)]) if len(log) else np.zeros(0)
+    result = {
+        "records": len(log),
+        "steps": int(latencies.size),
+        "dropped": recorder.dropped,
+        "monotonic": bool(np.all(np.diff(times) > 0.0)),
+        "playback_records": int(np.count_nonzero(~np.isnan(log.records["playback_time"]))) if len(log) else 0,
+        "file_mb": os.path.getsize(recorder.path) / 1e6,
+        "stop_ms": stop_s * 1000.0,
+    }
+    if latencies.size:
+        result["latency_us"] = {f"p{p}": float(np.percentile(latencies, p)) for p in PERCENTILES}
+        result["latency_us"]["max"] = float(latencies.max())
+    del log
+    os.remove(recorder.path)
+    return result
+
+
+def _click(studio, click_fn) -> float:
+    """
+    버튼 callback을 실행하고, 로드를 기다리는 task가 있으면 끝날 때까지 event loop 구동 (Kit에서는 app update loop 역할).
+    Returns:
+        callback이 UI thread를 막은 시간 [ms]
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        start = time.perf_counter()
+        click_fn()
+        click_ms = (time.perf_counter() - start) * 1000.0
+        if studio.pending_load is not None:
+            loop.run_until_complete(studio.pending_load)
+    finally:
+        # 백그라운드 검증이 측정 중인 step과 GIL을 다투지 않도록 끝날 때까지 대기
+        studio.cleanup(wait=True)
+        asyncio.set_event_loop(None)
+        loop.close()
+    return click_ms
+
+
+def _measurement_overhead(repeat: int = 100) -> int:
+    """측정 자체(reset_peak/get_traced_memory, callback 호출)가 만드는 peak. 빈 callback으로 같은 경로를 측정"""
+    sim_ctx = HeadlessSimulationContext(trace_allocations=True)
+    sim_ctx.add_physics_callback("noop", lambda step_dt: None)
+    for _ in range(repeat):
+        sim_ctx.step()
+    return int(np.max(sim_ctx.callback_alloc_bytes["noop"][repeat // 2:]))
+
+
+def print_result(result: dict):
+    print(f"▶️ {result['mode']:<10} {result['steps']} steps ({result['sim_time']:.2f} s sim, dt={result['dt']}), "
+          f"click {result['click_ms']:.2f} ms")
+    if "latency_us" in result:
+        print("   latency [us]: " + ", ".join(f"{k} {v:.1f}" for k, v in result["latency_us"].items()))
+    if "latency_ms" in result:
+        print(f"   stream: {result['received']}/{result['points']} points, underruns {result['underruns']}, "
+              f"publisher blocked {result['publisher_blocked_s']:.2f} s, "
+              "via point latency [ms]: " + ", ".join(f"{k} {v:.1f}" for k, v in result["latency_ms"].items()))
+    if "record" in result:
+        record = result["record"]
+        print(f"   record: {record['records']}/{record['steps']} steps in file (dropped {record['dropped']}, "
+              f"playback {record['playback_records']}, monotonic {record['monotonic']}), "
+              f"{record['file_mb']:.2f} MB, stop {record['stop_ms']:.1f} ms")
+        if "latency_us" in record:
+            print("   record latency [us]: " + ", ".join(f"{k} {v:.1f}" for k, v in record["latency_us"].items()))
+    if "alloc_bytes" in result:
+        print("   alloc [B]: " + ", ".join(f"{k} {v:.0f}" for k, v in result["alloc_bytes"].items()))
+
+
+def main(argv=None) -> int:
+    P2PStudio = load_p2p_studio()
+    parser = argparse.ArgumentParser(description="Headless P2PStudio playback benchmark")
+    parser.add_argument("--traj-dir", default=None, help="trajectory 폴더 (기본: 패키지 trajectory/)")
+    parser.add_argument("--group", default=None, help="재생할 그룹 이름 (<name>_group)")
+    parser.add_argument("--synthetic", type=int, default=0, help="N개 랜덤 via point 그룹을 임시 폴더에 만들어 재생")
+    parser.add_argument("--mode", default="all", choices=P2PStudio.PLAYBACK_MODES + ["all"])
+    parser.add_argument("--dt", type=float, default=1.0 / 60.0, help="physics dt [s]")
+    parser.add_argument("--no-alloc", action="store_true", help="tracemalloc 할당 측정 생략")
+    parser.add_argument("--fleet", default=None,
+                        help="쉼표로 구분한 로봇 수 목록 (예: 1,10,100) - batched fleet 재생 latency 측정")
+    parser.add_argument("--playlist", action="store_true",
+                        help="--group에 쉼표로 나열한 그룹 (또는 --synthetic 그룹들)을 playlist로 이어서 재생")
+    parser.add_argument("--stream", type=int, default=0,
+                        help="stand-in publisher로 N개 via point를 localhost 스트림으로 보내며 실시간 재생")
+    parser.add_argument("--stream-duration", type=float, default=0.05, help="스트림 via point duration [s]")
+    parser.add_argument("--stream-gap", type=float, default=0.0, help="스트림 중간 전송 중단 시간 [s] (underrun 시험)")
+    parser.add_argument("--record", action="store_true", help="재생하는 동안 joint state 기록 (기록 callback latency / 파일 검증)")
+    parser.add_argument("--json", default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args(argv)
+
+    if args.stream:
+        result = run_stream_playback(args.stream, args.dt, args.stream_duration, args.stream_gap)
+        print_result(result)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump([result], f, indent=2)
+        return 0
+
+    if args.fleet or args.playlist:
+        return fleet_main(args)
+
+    modes = P2PStudio.PLAYBACK_MODES if args.mode == "all" else [args.mode]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.synthetic:
+            traj_dir, group = tmp_dir, "synthetic"
+            write_synthetic_group(traj_dir, group, args.synthetic)
+        else:
+            traj_dir = args.traj_dir or resolve_asset_path(TRAJECTORY_DIR)
+            group = args.group or "test"
+
+        results = []
+        for mode in modes:
+            # latency는 tracemalloc 없이, 할당은 별도 실행으로 측정
+            result = run_playback(traj_dir, group, mode, args.dt, record=args.record)
+            if not args.no_alloc:
+                result["alloc_bytes"] = run_playback(traj_dir, group, mode, args.dt, trace_allocations=True)["alloc_bytes"]
+            print_result(result)
+            results.append(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ 저장 완료: {args.json}")
+    return 0
+
+
+def fleet_main(args) -> int:
+    """로봇 수별 fleet 재생 / playlist 재생 latency (--mode all이면 continuous)"""
+    mode = "continuous" if args.mode == "all" else args.mode
+    fleet_sizes = [int(n) for n in args.fleet.split(",") if n.strip()] if args.fleet else []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.synthetic:
+            traj_dir = tmp_dir
+            groups = [f"synthetic{i}" for i in range(FLEET_SYNTHETIC_GROUPS)]
+            for seed, group in enumerate(groups):
+                write_synthetic_group(traj_dir, group, args.synthetic, seed=seed)
+        else:
+            traj_dir = args.traj_dir or resolve_asset_path(TRAJECTORY_DIR)
+            groups = (args.group or "test").split(",")
+
+        results = []
+        if args.playlist:
+            results.append(run_playlist_playback(traj_dir, groups, mode, args.dt))
+        for n_robots in fleet_sizes:
+            results.append(run_fleet_playback(traj_dir, groups, n_robots, mode, args.dt))
+        for result in results:
+            print_result(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ 저장 완료: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
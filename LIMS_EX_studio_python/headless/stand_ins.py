@@ -0,0 +1,266 @@
+import sys
+import math
+import time
+import types
+import tracemalloc
+import importlib.util
+import numpy as np
+from ..global_variables import LIMS_EX_JOINT_NAMES
+
+
+class ArticulationAction:
+    """isaacsim.core.utils.types.ArticulationAction 대체 (필드만 보관)"""
+
+    def __init__(self, joint_positions=None, joint_velocities=None, joint_efforts=None, joint_indices=None):
+        self.joint_positions = joint_positions
+        self.joint_velocities = joint_velocities
+        self.joint_efforts = joint_efforts
+        self.joint_indices = joint_indices
+
+
+class ArticulationActions(ArticulationAction):
+    """isaacsim.core.utils.types.ArticulationActions 대체 (batched view용, 필드는 (N, dof))"""
+
+    def __init__(self, joint_positions=None, joint_velocities=None, joint_efforts=None, joint_indices=None,
+                 joint_names=None):
+        super().__init__(joint_positions, joint_velocities, joint_efforts, joint_indices)
+        self.joint_names = joint_names
+
+
+class KinematicArticulation:
+    """
+    SingleArticulation 대체. apply_action으로 받은 목표를 physics step마다 kinematic하게 적분.
+    tracking_time_constant = 0 이면 목표 위치로 즉시 이동, > 0 이면 1차 지연으로 추종 (PD drive 근사).
+    """
+
+    def __init__(self, dof_names: list = None, initial_positions: np.ndarray = None,
+                 tracking_time_constant: float = 0.0):
+        self._dof_names = list(LIMS_EX_JOINT_NAMES if dof_names is None else dof_names)
+        n_dof = len(self._dof_names)
+        self._positions = np.zeros(n_dof) if initial_positions is None else np.array(initial_positions, dtype=float)
+        self._velocities = np.zeros_like(self._positions)
+        self._target_positions = self._positions.copy()
+        self._target_velocities = np.zeros_like(self._positions)
+        self._previous = np.zeros_like(self._positions)
+        self._rate = np.zeros(())  # 1/dt 또는 추종 비율 (0-d 배열이면 ufunc가 임시 scalar를 만들지 않음)
+        self.tracking_time_constant = tracking_time_constant
+
+    @property
+    def dof_names(self) -> list:
+        return self._dof_names
+
+    @property
+    def num_dof(self) -> int:
+        return len(self._dof_names)
+
+    def get_joint_positions(self) -> np.ndarray:
+        # Isaac Sim과 같이 매 호출마다 새 배열 반환
+        return self._positions.copy()
+
+    def get_joint_velocities(self) -> np.ndarray:
+        return self._velocities.copy()
+
+    def get_applied_action(self) -> ArticulationAction:
+        return ArticulationAction(joint_positions=self._target_positions.copy(),
+                                  joint_velocities=self._target_velocities.copy())
+
+    def set_joint_positions(self, positions):
+        self._positions[:] = positions
+        self._target_positions[:] = positions
+        self._velocities[:] = 0.0
+
+    def apply_action(self, action: ArticulationAction):
+        if action.joint_indices is None:
+            # 전체 DOF는 copyto (slice 대입은 임시 view를 만듦)
+            if action.joint_positions is not None:
+                np.copyto(self._target_positions, action.joint_positions)
+            if action.joint_velocities is not None:
+                if np.shape(action.joint_velocities) == self._target_velocities.shape:
+                    np.copyto(self._target_velocities, action.joint_velocities)
+                else:
+                    self._target_velocities[..., :np.shape(action.joint_velocities)[-1]] = action.joint_velocities
+        else:
+            if action.joint_positions is not None:
+                self._target_positions[..., action.joint_indices] = action.joint_positions
+            if action.joint_velocities is not None:
+                self._target_velocities[..., action.joint_indices] = action.joint_velocities
+
+    def integrate(self, dt: float):
+        # 할당 측정에 섞이지 않도록 미리 만든 버퍼만 사용
+        np.copyto(self._previous, self._positions)
+        if self.tracking_time_constant <= 0.0:
+            np.copyto(self._positions, self._target_positions)
+        else:
+            self._rate[()] = 1.0 - math.exp(-dt / self.tracking_time_constant)
+            np.subtract(self._target_positions, self._positions, out=self._velocities)
+            np.multiply(self._velocities, self._rate, out=self._velocities)
+            np.add(self._positions, self._velocities, out=self._positions)
+        np.subtract(self._positions, self._previous, out=self._velocities)
+        self._rate[()] = 1.0 / dt
+        np.multiply(self._velocities, self._rate, out=self._velocities)
+
+
+class KinematicArticulationView(KinematicArticulation):
+    """
+    isaacsim.core.prims.Articulation (N개 로봇 batched view) 대체.
+    상태 버퍼가 (N, dof)일 뿐 적분 방식은 KinematicArticulation과 같음.
+    """
+
+    def __init__(self, n_robots: int, dof_names: list = None, initial_positions: np.ndarray = None,
+                 tracking_time_constant: float = 0.0):
+        n_dof = len(LIMS_EX_JOINT_NAMES if dof_names is None else dof_names)
+        if initial_positions is None:
+            initial_positions = np.zeros((n_robots, n_dof))
+        super().__init__(dof_names, np.broadcast_to(initial_positions, (n_robots, n_dof)), tracking_time_constant)
+
+    @property
+    def count(self) -> int:
+        return self._positions.shape[0]
+
+
+class HeadlessSimulationContext:
+    """
+    isaacsim.core.api.SimulationContext 대체 (physics callback 등록 + 고정 dt step).
+    step()마다 등록된 callback을 호출하고 articulation을 적분하며, callback별 실행 시간을 기록.
+    trace_allocations면 실행 시간 대신 callback별 tracemalloc peak 증가량 [bytes]을 기록 (tracemalloc.start() 필요).
+    """
+
+    _instance = None
+
+    def __init__(self, physics_dt: float = 1.0 / 60.0, trace_allocations: bool = False):
+        self._physics_dt = physics_dt
+        self._callbacks = {}
+        self._callback_items = ()
+        self.trace_allocations = trace_allocations
+        self.callback_alloc_bytes = {}  # 이름 -> [bytes, ...]
+        self.articulations = []
+        self.current_time = 0.0
+        self.callback_times_ns = {}  # 이름 -> [ns, ...]
+        HeadlessSimulationContext._instance = self
+
+    @classmethod
+    def instance(cls) -> "HeadlessSimulationContext":
+        if cls._instance is None:
+            cls()
+        return cls._instance
+
+    @classmethod
+    def clear_instance(cls):
+        cls._instance = None
+
+    def get_physics_dt(self) -> float:
+        return self._physics_dt
+
+    def add_physics_callback(self, callback_name: str, callback_fn):
+        self._callbacks[callback_name] = callback_fn
+        self._callback_items = tuple(self._callbacks.items())
+
+    def remove_physics_callback(self, callback_name: str):
+        self._callbacks.pop(callback_name, None)
+        self._callback_items = tuple(self._callbacks.items())
+
+    def physics_callback_exists(self, callback_name: str) -> bool:
+        return callback_name in self._callbacks
+
+    def step(self):
+        dt = self._physics_dt
+        # callback 안에서 자기 자신을 제거할 수 있으므로 등록 시점의 tuple을 순회
+        for name, callback in self._callback_items:
+            if self.trace_allocations:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                callback(dt)
+                peak = tracemalloc.get_traced_memory()[1] - before
+                self.callback_alloc_bytes.setdefault(name, []).append(peak)
+                continue
+            start = time.perf_counter_ns()
+            callback(dt)
+            self.callback_times_ns.setdefault(name, []).append(time.perf_counter_ns() - start)
+        for articulation in self.articulations:
+            articulation.integrate(dt)
+        self.current_time += dt
+
+
+class _ValueModel:
+    def __init__(self, value: str):
+        self._value = value
+
+    def get_value_as_string(self) -> str:
+        return self._value
+
+    def set_value(self, value):
+        self._value = str(value)
+
+
+class HeadlessStringField:
+    """ui.StringField 대체 (model.get_value_as_string만 지원)"""
+
+    def __init__(self, value: str = ""):
+        self.model = _ValueModel(value)
+
+
+class HeadlessScenario:
+    def __init__(self, articulation=None):
+        self._articulation = articulation
+
+
+class HeadlessUIBuilder:
+    """P2PStudio가 참조하는 UIBuilder 속성(_scenario._articulation, _cuboid, _fleet_view)만 제공"""
+
+    def __init__(self, articulation=None, fleet_view=None):
+        self._scenario = HeadlessScenario(articulation)
+        self._cuboid = None
+        self._fleet_view = fleet_view
+
+
+def install_stand_ins() -> bool:
+    """
+    import할 수 없는 isaacsim 모듈만 (SimulationContext / ArticulationAction(s)) 대체 모듈로 sys.modules에 등록.
+    이미 로드되었거나 import 가능한 모듈은 건드리지 않으므로 Kit 안에서 호출해도 실제 모듈을 덮어쓰지 않음.
+    p2p_studio를 import하기 전에 호출해야 함.
+    Returns:
+        대체 모듈을 하나라도 등록했으면 True
+    """
+    stand_ins = {
+        "isaacsim.core.api": {"SimulationContext": HeadlessSimulationContext},
+        "isaacsim.core.utils.types": {"ArticulationAction": ArticulationAction,
+                                      "ArticulationActions": ArticulationActions},
+    }
+    installed = False
+    for name, attributes in stand_ins.items():
+        if _module_available(name):
+            continue
+        parent = _ensure_package(name.rpartition(".")[0])
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        sys.modules[name] = module
+        setattr(parent, name.rpartition(".")[2], module)
+        installed = True
+    return installed
+
+
+def _module_available(name: str) -> bool:
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _ensure_package(name: str) -> types.ModuleType:
+    """name과 상위 패키지를 import (없는 패키지만 빈 namespace 모듈로 생성)"""
+    parent = None
+    parts = name.split(".")
+    for depth in range(1, len(parts) + 1):
+        prefix = ".".join(parts[:depth])
+        if _module_available(prefix):
+            module = sys.modules.get(prefix) or importlib.import_module(prefix)
+        else:
+            module = types.ModuleType(prefix)
+            module.__path__ = []
+            sys.modules[prefix] = module
+            if parent is not None:
+                setattr(parent, parts[depth - 1], module)
+        parent = module
+    return parent
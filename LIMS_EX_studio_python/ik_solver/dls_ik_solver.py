@@ -0,0 +1,249 @@
+import numpy as np
+from .urdf_kinematics import LIMSExForwardKinematics
+from ..global_variables import LIMS_EX_URDF_PATH, LIMS_EX_JOINT_NAMES
+
+# lims_ex_descriptor.yaml의 cspace와 동일 (손가락 제외)
+LIMS_EX_ARM_JOINT_NAMES = ['SY', 'SP', 'EB1', 'EB2', 'WP', 'WR', 'WY']
+
+
+def quaternion_to_matrix(quaternions: np.ndarray) -> np.ndarray:
+    """[w, x, y, z] quaternion (N, 4) -> (N, 3, 3) 회전 행렬"""
+    q = np.atleast_2d(np.asarray(quaternions, dtype=float))
+    q = q / np.linalg.norm(q, axis=1, keepdims=True)
+    w, x, y, z = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    R = np.empty((q.shape[0], 3, 3))
+    R[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    R[:, 0, 1] = 2 * (x * y - z * w)
+    R[:, 0, 2] = 2 * (x * z + y * w)
+    R[:, 1, 0] = 2 * (x * y + z * w)
+    R[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    R[:, 1, 2] = 2 * (y * z - x * w)
+    R[:, 2, 0] = 2 * (x * z - y * w)
+    R[:, 2, 1] = 2 * (y * z + x * w)
+    R[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return R
+
+
+class LIMSExDLSKinematicsSolver:
+    """
+    URDF 체인의 해석적 Jacobian을 사용하는 NumPy damped-least-squares IK.
+    여러 target을 한 번에 풀고(batch), 경로(path)는 앞 구간의 해로 warm start.
+    Lula KinematicsSolver와 같은 메소드를 제공하므로 ArticulationKinematicsSolver의 backend로도 사용 가능.
+    """
+
+    def __init__(self, urdf_path: str = LIMS_EX_URDF_PATH, joint_names: list = None,
+                 damping: float = 0.05, max_iterations: int = 100, max_step: float = 0.2,
+                 position_tolerance: float = 1e-3, orientation_tolerance: float = 1e-2):
+        """
+        Args:
+            joint_names: IK로 푸는 조인트 (기본: 팔 7축)
+            damping: DLS damping 계수 λ
+            max_iterations: target별 최대 반복 횟수
+            max_step: 한 번의 반복에서 허용하는 최대 관절 변화량 [rad]
+            position_tolerance: 수렴 판정 위치 오차 [m]
+            orientation_tolerance: 수렴 판정 자세 오차 [rad]
+        """
+        if joint_names is None:
+            joint_names = LIMS_EX_ARM_JOINT_NAMES
+        self._fk = LIMSExForwardKinematics(urdf_path, LIMS_EX_JOINT_NAMES)
+        self._joint_names = list(joint_names)
+        self._q_columns = [LIMS_EX_JOINT_NAMES.index(name) for name in self._joint_names]
+        self._joints = [self._fk.joints[name] for name in self._joint_names]
+        self._joint_child_index = [self._fk.link_index(joint.child) for joint in self._joints]
+
+        self.lower_limits = np.array([-np.inf if j.lower is None else j.lower for j in self._joints])
+        self.upper_limits = np.array([np.inf if j.upper is None else j.upper for j in self._joints])
+
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.max_step = max_step
+        self.position_tolerance = position_tolerance
+        self.orientation_tolerance = orientation_tolerance
+
+        # 로봇 base 자세 (world -> base)
+        self._base_rotation = np.eye(3)
+        self._base_translation = np.zeros(3)
+
+    # ========================================
+    # KinematicsSolver 호환 인터페이스
+    # ========================================
+    def get_joint_names(self) -> list:
+        return list(self._joint_names)
+
+    def get_all_frame_names(self) -> list:
+        return list(self._fk.link_names)
+
+    def supports_collision_avoidance(self) -> bool:
+        return False
+
+    def set_robot_base_pose(self, robot_position: np.ndarray, robot_orientation: np.ndarray):
+        """robot_orientation: [w, x, y, z]"""
+        self._base_rotation = quaternion_to_matrix(robot_orientation)[0]
+        self._base_translation = np.asarray(robot_position, dtype=float)
+
+    def compute_forward_kinematics(self, frame_name: str, joint_positions: np.ndarray, position_only: bool = False) -> tuple:
+        """Returns: (position (3,), rotation (3, 3)) - world 기준"""
+        rotations, translations = self.compute_frame_poses(np.atleast_2d(joint_positions), frame_name)
+        return translations[0], rotations[0]
+
+    def compute_inverse_kinematics(self, frame_name: str, target_position: np.ndarray, target_orientation: np.ndarray = None,
+                                   warm_start: np.ndarray = None, position_tolerance: float = None,
+                                   orientation_tolerance: float = None) -> tuple:
+        """Returns: (joint_positions (dof,), success)"""
+        q, converged = self.solve_batch(
+            np.atleast_2d(target_position),
+            None if target_orientation is None else np.atleast_2d(target_orientation),
+            warm_start=warm_start,
+            frame_name=frame_name,
+            position_tolerance=position_tolerance,
+            orientation_tolerance=orientation_tolerance,
+        )
+        return q[0], bool(converged[0])
+
+    # ========================================
+    # Batch API
+    # ========================================
+    def compute_frame_poses(self, joint_positions: np.ndarray, frame_name: str = "gripper") -> tuple:
+        """
+        (N, dof) 관절값 -> world 기준 frame 자세
+        Returns:
+            (rotations (N, 3, 3), translations (N, 3))
+        """
+        rotations, translations, _ = self._forward(np.atleast_2d(joint_positions), self._fk.link_index(frame_name))
+        return rotations, translations
+
+    def solve_batch(self, target_positions: np.ndarray, target_orientations: np.ndarray = None,
+                    warm_start: np.ndarray = None, frame_name: str = "gripper",
+                    position_tolerance: float = None, orientation_tolerance: float = None) -> tuple:
+        """
+        N개 target을 동시에 풀기
+        Args:
+            target_positions: (N, 3) world 기준 위치
+            target_orientations: (N, 4) [w, x, y, z], None이면 위치만 맞춤
+            warm_start: (dof,) 또는 (N, dof) 초기값 (기본: 관절 중앙값)
+        Returns:
+            (joint_positions (N, dof), converged (N,) bool)
+        """
+        position_tolerance = self.position_tolerance if position_tolerance is None else position_tolerance
+        orientation_tolerance = self.orientation_tolerance if orientation_tolerance is None else orientation_tolerance
+        target_positions = np.atleast_2d(np.asarray(target_positions, dtype=float))
+        n = target_positions.shape[0]
+        target_rotations = None if target_orientations is None else quaternion_to_matrix(target_orientations)
+        frame_index = self._fk.link_index(frame_name)
+
+        if warm_start is None:
+            warm_start = np.where(np.isfinite(self.lower_limits + self.upper_limits),
+                                  0.5 * (self.lower_limits + self.upper_limits), 0.0)
+        q = np.array(np.broadcast_to(warm_start, (n, len(self._joint_names))), dtype=float)
+        q = np.clip(q, self.lower_limits, self.upper_limits)
+        converged = np.zeros(n, dtype=bool)
+        active = np.arange(n)
+
+        for _ in range(self.max_iterations + 1):
+            rotations, translations, jacobian = self._forward(q[active], frame_index, with_jacobian=True)
+            error = target_positions[active] - translations
+            done = np.linalg.norm(error, axis=1) < position_tolerance
+            if target_rotations is not None:
+                rot_error = self._orientation_error(rotations, target_rotations[active])
+                done &= np.linalg.norm(rot_error, axis=1) < orientation_tolerance
+                error = np.concatenate((error, rot_error), axis=1)
+            else:
+                jacobian = jacobian[:, :3]
+
+            converged[active[done]] = True
+            keep = ~done
+            active, error, jacobian = active[keep], error[keep], jacobian[keep]
+            if active.size == 0:
+                break
+
+            # dq = J^T (J J^T + λ² I)^-1 e
+            JJt = jacobian @ jacobian.transpose(0, 2, 1)
+            JJt[:, np.arange(JJt.shape[1]), np.arange(JJt.shape[1])] += self.damping ** 2
+            dq = np.einsum("nji,nj->ni", jacobian, np.linalg.solve(JJt, error[:, :, None])[:, :, 0])
+
+            # 스텝 크기 제한 + 조인트 limit clamp
+            step_norm = np.max(np.abs(dq), axis=1, keepdims=True)
+            dq *= np.minimum(1.0, self.max_step / np.maximum(step_norm, 1e-12))
+            q[active] = np.clip(q[active] + dq, self.lower_limits, self.upper_limits)
+
+        return q, converged
+
+    def solve_path(self, target_positions: np.ndarray, target_orientations: np.ndarray = None,
+                   warm_start: np.ndarray = None, frame_name: str = "gripper", chunk_size: int = 64) -> tuple:
+        """
+        Cartesian 경로를 관절 공간으로 변환. chunk 단위로 배치로 풀고, 각 chunk는 직전 해로 warm start.
+        수렴하지 못한 target은 바로 앞 target의 해로 다시 시도.
+        Returns:
+            (joint_positions (N, dof), converged (N,) bool)
+        """
+        target_positions = np.atleast_2d(np.asarray(target_positions, dtype=float))
+        n = target_positions.shape[0]
+        q = np.zeros((n, len(self._joint_names)))
+        converged = np.zeros(n, dtype=bool)
+        seed = warm_start
+
+        for start in range(0, n, chunk_size):
+            chunk = slice(start, min(start + chunk_size, n))
+            orientations = None if target_orientations is None else target_orientations[chunk]
+            q[chunk], converged[chunk] = self.solve_batch(target_positions[chunk], orientations, seed, frame_name)
+
+            # 실패한 target은 이웃(앞 target) 해로 warm start해서 재시도
+            for idx in np.flatnonzero(~converged[chunk]) + start:
+                if idx == 0:
+                    continue
+                orientation = None if target_orientations is None else target_orientations[idx:idx + 1]
+                q_retry, ok = self.solve_batch(target_positions[idx:idx + 1], orientation, q[idx - 1], frame_name)
+                if ok[0]:
+                    q[idx], converged[idx] = q_retry[0], True
+            seed = q[chunk.stop - 1]
+        return q, converged
+
+    # ========================================
+    # 내부 계산
+    # ========================================
+    def _forward(self, q_arm: np.ndarray, frame_index: int, with_jacobian: bool = False) -> tuple:
+        """팔 관절값 -> world 기준 frame 자세 (+ geometric Jacobian (N, 6, dof))"""
+        q_full = np.zeros((q_arm.shape[0], len(LIMS_EX_JOINT_NAMES)))
+        q_full[:, self._q_columns] = q_arm
+        link_rotations, link_translations = self._fk.compute_link_poses(q_full)
+
+        # base 자세 적용
+        link_rotations = self._base_rotation @ link_rotations
+        link_translations = link_translations @ self._base_rotation.T + self._base_translation
+        rotations = link_rotations[:, frame_index]
+        translations = link_translations[:, frame_index]
+        if not with_jacobian:
+            return rotations, translations, None
+
+        jacobian = np.zeros((q_arm.shape[0], 6, len(self._joints)))
+        for i, (joint, child) in enumerate(zip(self._joints, self._joint_child_index)):
+            axis = link_rotations[:, child] @ joint.axis
+            jacobian[:, :3, i] = np.cross(axis, translations - link_translations[:, child])
+            jacobian[:, 3:, i] = axis
+        return rotations, translations, jacobian
+
+    @staticmethod
+    def _orientation_error(current: np.ndarray, target: np.ndarray) -> np.ndarray:
+        """R_target R_current^T의 axis-angle 벡터 (N, 3)"""
+        R = target @ current.transpose(0, 2, 1)
+        skew = 0.5 * np.stack((R[:, 2, 1] - R[:, 1, 2], R[:, 0, 2] - R[:, 2, 0], R[:, 1, 0] - R[:, 0, 1]), axis=1)
+        sin_angle = np.linalg.norm(skew, axis=1)
+        cos_angle = 0.5 * (np.trace(R, axis1=1, axis2=2) - 1.0)
+        angle = np.arctan2(sin_angle, cos_angle)
+        scale = np.where(sin_angle > 1e-9, angle / np.maximum(sin_angle, 1e-9), 1.0)
+        error = skew * scale[:, None]
+
+        # angle ≈ π: skew가 0에 가까우므로 대칭 부분 (R+R^T)/2 = cI + (1-c)aa^T 에서 축 복원.
+        # 가장 큰 대각 성분으로 a_k를 구하고 나머지 성분 (부호 포함)은 비대각 성분 a_k a_j에서 계산
+        flipped = (sin_angle < 1e-6) & (cos_angle < 0)
+        if np.any(flipped):
+            R_f, cos_f = R[flipped], cos_angle[flipped]
+            symmetric = 0.5 * (R_f + R_f.transpose(0, 2, 1))
+            outer = (symmetric - cos_f[:, None, None] * np.eye(3)) / (1.0 - cos_f)[:, None, None]
+            k = np.argmax(np.diagonal(outer, axis1=1, axis2=2), axis=1)
+            rows = outer[np.arange(k.shape[0]), k]
+            axis = rows / np.sqrt(np.maximum(rows[np.arange(k.shape[0]), k], 1e-12))[:, None]
+            # 남은 skew와 같은 방향 (정확히 π면 어느 쪽이든 같은 회전)
+            sign = np.where(np.einsum("ij,ij->i", axis, skew[flipped]) < 0.0, -1.0, 1.0)
+            error[flipped] = (sign * angle[flipped])[:, None] * axis / np.linalg.norm(axis, axis=1, keepdims=True)
+        return error
@@ -1,15 +1,26 @@
 from isaacsim.robot_motion.motion_generation import ArticulationKinematicsSolver, LulaKinematicsSolver
 from isaacsim.core.prims import Articulation
 from typing import Optional
+from .dls_ik_solver import LIMSExDLSKinematicsSolver
 from ..global_variables import LIMS_EX_IK_DESCRIPTOR_PATH, LIMS_EX_URDF_PATH
 
 class LIMSExKinematicsSolver(ArticulationKinematicsSolver):
-    def __init__(self, robot_articulation: Articulation, end_effector_frame_name: Optional[str] = None) -> None:
+    # lula: LulaKinematicsSolver, numpy: URDF 기반 batched DLS (LIMSExDLSKinematicsSolver)
+    BACKENDS = ["lula", "numpy"]
+
+    def __init__(self, robot_articulation: Articulation, end_effector_frame_name: Optional[str] = None,
+                 backend: str = "lula") -> None:
         # TODO: change the config path
         # print("초기화 성공 #########################################################")
-        self._kinematics = LulaKinematicsSolver(robot_description_path=LIMS_EX_IK_DESCRIPTOR_PATH,
-                                                urdf_path=LIMS_EX_URDF_PATH)
+        if backend == "lula":
+            self._kinematics = LulaKinematicsSolver(robot_description_path=LIMS_EX_IK_DESCRIPTOR_PATH,
+                                                    urdf_path=LIMS_EX_URDF_PATH)
+        elif backend == "numpy":
+            self._kinematics = LIMSExDLSKinematicsSolver(urdf_path=LIMS_EX_URDF_PATH)
+        else:
+            raise ValueError(f"Unknown kinematics backend '{backend}', expected one of {self.BACKENDS}")
+        self.backend = backend
         if end_effector_frame_name is None:
             end_effector_frame_name = "gripper"
         ArticulationKinematicsSolver.__init__(self, robot_articulation, self._kinematics, end_effector_frame_name)
-        return
\ No newline at end of file
+        return
@@ -0,0 +1,209 @@
+import os
+import xml.etree.ElementTree as ET
+import numpy as np
+from ..global_variables import LIMS_EX_URDF_PATH, LIMS_EX_JOINT_NAMES
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def resolve_asset_path(path: str) -> str:
+    """
+    "LIMS_EX/..." 형태의 경로를 찾기. Kit 실행 위치 기준으로 없으면 저장소 루트 기준으로 해석
+    (시뮬레이터 없이 오프라인 도구에서 사용할 때).
+    """
+    if os.path.exists(path):
+        return path
+    parts = os.path.normpath(path).split(os.sep)
+    candidate = os.path.join(_REPO_ROOT, *parts[1:])
+    return candidate if os.path.exists(candidate) else path
+
+
+def rpy_to_matrix(rpy) -> np.ndarray:
+    """URDF rpy (fixed axis X-Y-Z) -> 3x3 회전 행렬"""
+    roll, pitch, yaw = rpy
+    cr, sr = np.cos(roll), np.sin(roll)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cy, sy = np.cos(yaw), np.sin(yaw)
+    return np.array([
+        [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+        [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+        [-sp, cp * sr, cp * cr],
+    ])
+
+
+class URDFJoint:
+    """URDF joint 한 개의 정적 정보"""
+
+    def __init__(self, name, joint_type, parent, child, origin_xyz, origin_rpy, axis,
+                 lower=None, upper=None, velocity=None, effort=None):
+        self.name = name
+        self.type = joint_type
+        self.parent = parent
+        self.child = child
+        self.origin_translation = np.asarray(origin_xyz, dtype=float)
+        self.origin_rotation = rpy_to_matrix(origin_rpy)
+        self.axis = np.asarray(axis, dtype=float)
+        self.lower = lower
+        self.upper = upper
+        self.velocity = velocity
+        self.effort = effort
+
+
+def parse_urdf(urdf_path: str = LIMS_EX_URDF_PATH) -> tuple:
+    """
+    URDF 파싱
+    Returns:
+        (link_names, joints) - joints: URDFJoint 리스트 (파일 순서)
+    """
+    root = ET.parse(resolve_asset_path(urdf_path)).getroot()
+    link_names = [link.get("name") for link in root.findall("link")]
+
+    def _floats(element, attr, default):
+        if element is None or element.get(attr) is None:
+            return default
+        return [float(v) for v in element.get(attr).split()]
+
+    joints = []
+    for joint in root.findall("joint"):
+        origin = joint.find("origin")
+        limit = joint.find("limit")
+
+        def _limit(attr):
+            if limit is None or limit.get(attr) is None:
+                return None
+            return float(limit.get(attr))
+
+        joints.append(URDFJoint(
+            name=joint.get("name"),
+            joint_type=joint.get("type"),
+            parent=joint.find("parent").get("link"),
+            child=joint.find("child").get("link"),
+            origin_xyz=_floats(origin, "xyz", [0.0, 0.0, 0.0]),
+            origin_rpy=_floats(origin, "rpy", [0.0, 0.0, 0.0]),
+            axis=_floats(joint.find("axis"), "xyz", [1.0, 0.0, 0.0]),
+            lower=_limit("lower"),
+            upper=_limit("upper"),
+            velocity=_limit("velocity"),
+            effort=_limit("effort"),
+        ))
+    return link_names, joints
+
+
+class LIMSExForwardKinematics:
+    """
+    LIMS_EX.urdf에서 만든 순수 NumPy forward kinematics.
+    joint origin 변환은 생성 시 한 번만 계산하고, (N, dof) 관절값 배치를 한 번에 처리.
+    """
+
+    def __init__(self, urdf_path: str = LIMS_EX_URDF_PATH, joint_names: list = None):
+        """
+        Args:
+            urdf_path: URDF 경로
+            joint_names: 입력 배열 q의 열 순서 (기본: LIMS_EX_JOINT_NAMES)
+        """
+        if joint_names is None:
+            joint_names = LIMS_EX_JOINT_NAMES
+        self.joint_names = list(joint_names)
+        link_names, joints = parse_urdf(urdf_path)
+        self.joints = {joint.name: joint for joint in joints}
+
+        # root link 찾기 (어떤 joint의 child도 아닌 link)
+        children = {joint.child for joint in joints}
+        roots = [name for name in link_names if name not in children]
+        if len(roots) != 1:
+            raise ValueError(f"URDF must have exactly one root link, found {roots}")
+        self.root_link = roots[0]
+
+        # parent가 먼저 오도록 정렬 (BFS)
+        by_parent = {}
+        for joint in joints:
+            by_parent.setdefault(joint.parent, []).append(joint)
+        self._chain = []
+        queue = [self.root_link]
+        while queue:
+            link = queue.pop(0)
+            for joint in by_parent.get(link, []):
+                self._chain.append(joint)
+                queue.append(joint.child)
+
+        self.link_names = [self.root_link] + [joint.child for joint in self._chain]
+        self._link_index = {name: i for i, name in enumerate(self.link_names)}
+        # chain 순서별 (parent link index, q 열 index 또는 -1)
+        self._parent_index = [self._link_index[joint.parent] for joint in self._chain]
+        self._q_index = [
+            self.joint_names.index(joint.name) if joint.name in self.joint_names and joint.type != "fixed" else -1
+            for joint in self._chain
+        ]
+
+    def link_index(self, link_name: str) -> int:
+        return self._link_index[link_name]
+
+    def compute_link_poses(self, q: np.ndarray) -> tuple:
+        """
+        모든 link의 root 기준 자세
+        Args:
+            q: (N, dof) 또는 (dof,) 관절값 [rad]
+        Returns:
+            (rotations, translations) - (N, L, 3, 3), (N, L, 3), L = len(link_names)
+        """
+        q = np.atleast_2d(np.asarray(q, dtype=float))
+        n = q.shape[0]
+        rotations = np.empty((n, len(self.link_names), 3, 3))
+        translations = np.empty((n, len(self.link_names), 3))
+        rotations[:, 0] = np.eye(3)
+        translations[:, 0] = 0.0
+
+        for i, joint in enumerate(self._chain):
+            parent = self._parent_index[i]
+            R_parent = rotations[:, parent]
+            p_parent = translations[:, parent]
+            R_local = joint.origin_rotation
+            p_local = joint.origin_translation
+
+            q_col = self._q_index[i]
+            if q_col >= 0 and joint.type in ("revolute", "continuous"):
+                R_local = R_local @ self._axis_rotation(joint.axis, q[:, q_col])
+            elif q_col >= 0 and joint.type == "prismatic":
+                p_local = p_local + (q[:, q_col, None] * (joint.origin_rotation @ joint.axis))
+
+            rotations[:, i + 1] = R_parent @ R_local
+            translations[:, i + 1] = np.einsum("nij,nj->ni", R_parent, np.broadcast_to(p_local, (n, 3))) + p_parent
+        return rotations, translations
+
+    def compute_frame_poses(self, q: np.ndarray, frame_name: str = "gripper") -> np.ndarray:
+        """
+        특정 link의 4x4 homogeneous 자세
+        Returns:
+            (N, 4, 4)
+        """
+        rotations, translations = self.compute_link_poses(q)
+        idx = self._link_index[frame_name]
+        poses = np.zeros((rotations.shape[0], 4, 4))
+        poses[:, :3, :3] = rotations[:, idx]
+        poses[:, :3, 3] = translations[:, idx]
+        poses[:, 3, 3] = 1.0
+        return poses
+
+    def compute_end_effector_positions(self, q: np.ndarray, frame_name: str = "gripper") -> np.ndarray:
+        """(N, 3) end-effector 위치 (궤적 전체의 경로 평가용)"""
+        _, translations = self.compute_link_poses(q)
+        return translations[:, self._link_index[frame_name]]
+
+    @staticmethod
+    def _axis_rotation(axis: np.ndarray, angles: np.ndarray) -> np.ndarray:
+        """axis 기준 angles 회전 (N, 3, 3) - Rodrigues"""
+        c = np.cos(angles)
+        s = np.sin(angles)
+        R = np.empty((angles.shape[0], 3, 3))
+        if np.array_equal(axis, [0.0, 0.0, 1.0]):
+            R[:] = 0.0
+            R[:, 0, 0] = c
+            R[:, 0, 1] = -s
+            R[:, 1, 0] = s
+            R[:, 1, 1] = c
+            R[:, 2, 2] = 1.0
+            return R
+        x, y, z = axis / np.linalg.norm(axis)
+        K = np.array([[0.0, -z, y], [z, 0.0, -x], [-y, x, 0.0]])
+        R[:] = np.eye(3) + s[:, None, None] * K + (1.0 - c)[:, None, None] * (K @ K)
+        return R
@@ -0,0 +1,174 @@
+import numpy as np
+from .piecewise_spline import PiecewiseHermiteSpline
+
+# evaluate() 한 번에 knot cursor를 옮기는 최대 칸 수 (넘으면 searchsorted로 다시 찾음)
+_MAX_CURSOR_STEPS = 4
+
+
+class BatchedPiecewiseSpline:
+    """
+    로봇별 PiecewiseHermiteSpline (구간 수가 달라도 됨)을 하나로 묶어 (N, dim)을 한 번에 평가.
+    계수는 모든 로봇 구간을 이어붙인 (ΣS, 4, dim) 배열, knot 시간은 로봇마다 offset을 더해 하나의 정렬된 배열로 만들고
+    로봇별 knot cursor를 한꺼번에 옮겨 구간을 찾음. 중간 결과는 모두 미리 할당한 버퍼에 기록 (매 step 할당 없음).
+    """
+
+    def __init__(self, splines: list):
+        if not splines:
+            raise ValueError("at least one spline is required")
+        dims = {spline.dim for spline in splines}
+        if len(dims) != 1:
+            raise ValueError(f"all splines must have the same dim, got {sorted(dims)}")
+        self.splines = list(splines)
+        self.n_robots = len(splines)
+        self.dim = dims.pop()
+        self.EPS = splines[0].EPS
+
+        n_segments = np.array([spline.n_segments for spline in splines])
+        self.durations = np.array([spline.duration for spline in splines])  # 로봇별 전체 길이
+        self.seg_start = np.concatenate(([0], np.cumsum(n_segments)[:-1]))  # 로봇별 첫 구간 (flat 인덱스)
+        self.knot_start = self.seg_start + np.arange(self.n_robots)  # 로봇별 첫 knot (flat 인덱스)
+        self.last_seg = n_segments - 1
+
+        # 로봇 r의 knot 시간에 r * stride를 더하면 전체가 오름차순
+        self._stride = float(self.durations.max()) + 1.0
+        self.offsets = np.arange(self.n_robots) * self._stride
+        self.flat_knots = np.concatenate([spline.knot_times + offset for spline, offset in zip(splines, self.offsets)])
+        self.seg_durations = np.concatenate([spline.durations for spline in splines])
+        self.pos_coeffs = np.concatenate([spline.pos_coeffs for spline in splines])  # (ΣS, 4, dim)
+        self.vel_coeffs = np.concatenate([spline.vel_coeffs for spline in splines])  # (ΣS, 3, dim)
+        # 계수별 연속 (ΣS, dim) 표: gather 결과가 연속 (N, dim) 배열이 되어 Horner ufunc가 임시 buffer를 만들지 않음
+        self._pos_tables = tuple(np.ascontiguousarray(self.pos_coeffs[:, k]) for k in range(4))
+        self._vel_tables = tuple(np.ascontiguousarray(self.vel_coeffs[:, k]) for k in range(3))
+        # cursor 이동용: 마지막 knot 다음을 inf로 (마지막 로봇이 끝 knot을 넘어가지 않도록)
+        self._cursor_knots = np.append(self.flat_knots, np.inf)
+        # evaluate() 중간 결과 버퍼 (매 step 재사용)
+        self._allocate_buffers()
+
+    @classmethod
+    def from_via_points(cls, start_positions: np.ndarray, p2p_data_list: list, **kwargs) -> "BatchedPiecewiseSpline":
+        """
+        Args:
+            start_positions: (N, dim) 로봇별 시작 위치
+            p2p_data_list: 로봇별 [(duration, positions), ...]
+        """
+        return cls([
+            PiecewiseHermiteSpline.from_via_points(start, p2p_data, **kwargs)
+            for start, p2p_data in zip(start_positions, p2p_data_list)
+        ])
+
+    @property
+    def duration(self) -> float:
+        """가장 긴 로봇 궤적 길이"""
+        return float(self.durations.max())
+
+    def evaluate(self, t, pose_out: np.ndarray = None, vel_out: np.ndarray = None) -> tuple:
+        """
+        모든 로봇을 시간 t [s] (스칼라 또는 로봇별 (N,))에서 평가. 각 로봇 궤적 범위 밖은 끝점으로 clamp.
+        pose_out / vel_out (N, dim)을 주면 그 배열에 기록 (이 경우 매 step 메모리 할당 없음).
+        로봇별 knot cursor를 앞뒤로 옮겨 구간을 찾고, 한 번에 _MAX_CURSOR_STEPS칸 넘게 움직이면 (seek 등) searchsorted로 다시 찾음.
+        Returns:
+            (pose_out, vel_out) - (N, dim)
+        """
+        if pose_out is None:
+            pose_out = np.empty((self.n_robots, self.dim))
+        if vel_out is None:
+            vel_out = np.empty((self.n_robots, self.dim))
+        b = self._buffers
+        if isinstance(t, np.ndarray) and t.ndim:
+            np.minimum(t, self.durations, out=b["query"])
+        else:
+            # Python float을 ufunc에 직접 넘기면 임시 0-d 배열이 생기므로 미리 만든 0-d 배열에 넣어서 사용
+            b["time"][()] = t
+            np.minimum(b["time"], self.durations, out=b["query"])
+        np.maximum(b["query"], b["zero"], out=b["query"])
+        query = np.add(b["query"], self.offsets, out=b["query"])
+
+        knot = b["knot"]
+        if not self._move_cursor(query):
+            knot[...] = np.searchsorted(self.flat_knots, query, side="right") - 1
+
+        seg = np.subtract(knot, self.knot_start, out=b["seg"])
+        np.minimum(seg, self.last_seg, out=seg)
+        flat_seg = np.add(self.seg_start, seg, out=b["flat_seg"])
+        knot_index = np.add(self.knot_start, seg, out=b["knot_index"])
+
+        # u = (query - 구간 시작) / D, D <= EPS인 구간은 1
+        D = self.seg_durations.take(flat_seg, out=b["D"], mode="clip")
+        u = self.flat_knots.take(knot_index, out=b["u"], mode="clip")
+        np.subtract(query, u, out=u)
+        np.maximum(D, b["eps"], out=b["D_safe"])
+        np.divide(u, b["D_safe"], out=u)
+        np.greater(D, b["eps"], out=b["flag"])
+        moving = b["moving"]
+        np.copyto(moving, b["flag"])
+        u *= moving
+        np.subtract(b["one"], moving, out=moving)
+        u += moving
+        # (N, 1) broadcast 연산은 ufunc buffer를 할당하므로 (N, dim)으로 펼쳐 둠
+        np.copyto(b["u_full"], b["u_column"])
+        u = b["u_full"]
+
+        c3, c2, c1, c0, v2, v1, v0 = b["coeffs"]
+        # zip 등 iterator 객체도 만들지 않도록 풀어서 gather
+        p3, p2, p1, p0 = self._pos_tables
+        q2, q1, q0 = self._vel_tables
+        p3.take(flat_seg, axis=0, out=c3, mode="clip")
+        p2.take(flat_seg, axis=0, out=c2, mode="clip")
+        p1.take(flat_seg, axis=0, out=c1, mode="clip")
+        p0.take(flat_seg, axis=0, out=c0, mode="clip")
+        q2.take(flat_seg, axis=0, out=v2, mode="clip")
+        q1.take(flat_seg, axis=0, out=v1, mode="clip")
+        q0.take(flat_seg, axis=0, out=v0, mode="clip")
+        np.multiply(c3, u, out=pose_out)
+        pose_out += c2
+        pose_out *= u
+        pose_out += c1
+        pose_out *= u
+        pose_out += c0
+        np.multiply(v2, u, out=vel_out)
+        vel_out += v1
+        vel_out *= u
+        vel_out += v0
+        return pose_out, vel_out
+
+    def _move_cursor(self, query: np.ndarray) -> bool:
+        """
+        knot cursor를 query 이하 마지막 knot (= searchsorted(right) - 1)으로 이동.
+        Returns:
+            _MAX_CURSOR_STEPS 안에 맞췄으면 True
+        """
+        b = self._buffers
+        knot, index, knot_time, flag, step = b["knot"], b["knot_index"], b["u"], b["flag"], b["step"]
+        for _ in range(_MAX_CURSOR_STEPS):
+            # 앞으로: 다음 knot <= query (마지막 knot 뒤는 inf)
+            np.add(knot, b["one_index"], out=index)
+            self._cursor_knots.take(index, out=knot_time, mode="clip")
+            np.less_equal(knot_time, query, out=flag)
+            forward = np.count_nonzero(flag)
+            if forward:
+                np.copyto(step, flag)
+                knot += step
+            # 뒤로: 현재 knot > query (역재생)
+            self._cursor_knots.take(knot, out=knot_time, mode="clip")
+            np.greater(knot_time, query, out=flag)
+            backward = np.count_nonzero(flag)
+            if backward:
+                np.copyto(step, flag)
+                knot -= step
+            if not forward and not backward:
+                return True
+        return False
+
+    def _allocate_buffers(self):
+        n = self.n_robots
+        u = np.empty(n)
+        self._buffers = {
+            "time": np.zeros(()), "zero": np.zeros(()), "one": np.ones(()), "eps": np.full((), self.EPS),
+            "one_index": np.ones((), dtype=np.intp),
+            "query": np.empty(n), "knot": np.array(self.knot_start), "knot_index": np.empty(n, dtype=np.intp),
+            "seg": np.empty(n, dtype=np.intp), "flat_seg": np.empty(n, dtype=np.intp), "step": np.empty(n, dtype=np.intp),
+            "flag": np.empty(n, dtype=bool), "moving": np.empty(n), "D": np.empty(n), "D_safe": np.empty(n),
+            "u": u, "u_column": u[:, None], "u_full": np.empty((n, self.dim)),
+            # 구간 계수 c3, c2, c1, c0, v2, v1, v0 (각각 (N, dim))
+            "coeffs": tuple(np.empty((n, self.dim)) for _ in range(7)),
+        }
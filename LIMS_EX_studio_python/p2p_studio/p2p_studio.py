@@ -1,18 +1,58 @@
 import os
+import time
+import asyncio
 import numpy as np
-import csv
 from isaacsim.core.api import SimulationContext
-from isaacsim.core.utils.types import ArticulationAction
+from isaacsim.core.utils.types import ArticulationAction, ArticulationActions
 from .via_point_manager import IRIMCubicHermiteSpline
-from ..global_variables import LIMS_EX_JOINT_NAMES
+from .playback_table import compile_playback_table
+from .piecewise_spline import PiecewiseHermiteSpline, PlaybackClock
+from .fleet_playback import BatchedPiecewiseSpline
+from .trajectory_io import CSV_DECIMALS, VIA_POINT_CSV_NAME, cached_via_points, load_via_points, write_via_point_csv
+from .trajectory_loader import TrajectoryLoader
+from .playlist import Playlist
+from .via_point_stream import ViaPointStreamServer
+from .via_point_compression import compress_recording
+from .trajectory_library import TrajectoryLibrary
+from .trajectory_validator import TrajectoryValidator
+from .retiming import DEFAULT_APPROACH_DURATION, group_durations, retime_group
+from ..collision.collision_checker import BoxObstacle, CollisionChecker
+from ..collision.distance_query import DistanceQuery
+from ..ik_solver.dls_ik_solver import quaternion_to_matrix
+from ..profiling.callback_timer import CallbackTimer, TimingRing
+from ..recording.joint_state_log import JOINT_STATE_LOG_EXTENSION, JointStateLog
+from ..recording.joint_state_recorder import JointStateRecorder
+from ..recording.tracking_analytics import analyze_recording
+from ..global_variables import (
+    LIMS_EX_JOINT_NAMES, RECORDING_DIR_NAME, VIA_POINT_COMPRESSION_TOLERANCE_DEG, VIA_POINT_STREAM_PORT,
+    VIA_POINT_STREAM_QUEUE_SIZE,
+)
 np.set_printoptions(suppress=True, precision=3, linewidth=100) 
 
 class P2PStudio:
+    # live: 매 tick 구간 스플라인 보간, compiled: 재생 시작 시 physics dt 테이블로 미리 샘플링
+    # continuous: 전체 via point를 하나의 스플라인으로 연속 재생 (seek/speed/reverse 지원)
+    # inplace: continuous와 같은 궤적, 재생 시작 시 버퍼를 모두 할당하고 매 tick 재사용 (메모리 할당 없음)
+    PLAYBACK_MODES = ["live", "compiled", "continuous", "inplace"]
+    # via point에서 멈추지 않고 연속 탄젠트를 쓰는 모드
+    CONTINUOUS_MODES = ("continuous", "inplace")
+
     def __init__(self, ui_builder, traj_dir, p2p_name_field):
         self._ui_builder = ui_builder
         self._traj_dir = traj_dir
         self._p2p_name_field = p2p_name_field 
         self.via_points_cache = []
+        self.library = TrajectoryLibrary(traj_dir)
+        # CSV 로드/파싱은 worker thread에서 (Play 버튼 callback이 UI를 막지 않도록)
+        self._loader = TrajectoryLoader()
+        self._pending_load = None  # 로드 완료 후 재생을 시작할 asyncio task
+        self._validator = None
+        self._collision_checker = None
+        self._distance_query = None
+        # 자동 retiming 시 limit 대비 안전 여유 (0.1 -> 90%까지 사용)
+        self.retime_margin = 0.1
+        # 그리퍼-장애물 최소 clearance 목표 [m]
+        self.clearance_budget = 0.02
 
         # P2P Play 관련 변수들
         self._p2p_data = [] 
@@ -20,6 +60,49 @@ class P2PStudio:
         self._segment_time = 0.0
         self._spline = None
         self._playback_active = False
+        self._playback_mode = "live"
+
+        # compiled 모드 관련 변수들
+        self._playback_table = None
+        self._table_idx = 0
+
+        # continuous 모드 관련 변수들
+        self._trajectory = None
+        self._clock = None
+        self._playback_speed = 1.0
+        # clock이 없는 재생 (live / compiled)의 현재 궤적 시간 [s]을 돌려주는 함수 (joint state 기록용)
+        self._playback_time_source = None
+
+        # playlist 관련 변수들
+        self._playlist = None
+        self.playlist_loop = False
+
+        # streaming 관련 변수들
+        self._stream_server = None
+        # stream이 설치한 p2p_playback callback이 아직 등록되어 있는지
+        self._stream_playback_active = False
+        self.stream_port = VIA_POINT_STREAM_PORT
+        # via point 수신 -> 현재 구간 목표가 될 때까지의 지연 [ns]
+        self.stream_latency = TimingRing()
+        self.stream_underruns = 0
+
+        # joint state 기록
+        self._recorder = None
+        self._last_recording = None
+        # 기록 -> via point 압축 허용 오차 [deg]
+        self.compression_tolerance_deg = VIA_POINT_COMPRESSION_TOLERANCE_DEG
+
+        # fleet 모드 관련 변수들
+        self._fleet_trajectory = None
+        self._fleet_clock = None
+        self._fleet_active = False
+
+    def set_playback_mode(self, mode: str):
+        if mode not in self.PLAYBACK_MODES:
+            print(f"❌ 알 수 없는 playback mode: {mode}")
+            return
+        self._playback_mode = mode
+        print(f"✅ Playback mode: {mode}")
 
     def on_p2p_play_clicked(self):
         try:
@@ -28,35 +111,55 @@ class P2PStudio:
                 print("⚠️ Folder name을 입력하세요.")
                 return
             
-            csv_path = os.path.join(self._traj_dir, folder_name + "_group", "lims_ex_viapoints.csv")
+            csv_path = self._group_csv_path(folder_name)
             if not os.path.exists(csv_path):
                 print(f"❌ CSV 파일 없음: {csv_path}")
                 return
             
-            # 3. 데이터 파싱 (한번에 처리)
-            self._p2p_data = []
-            with open(csv_path, "r") as f:
-                reader = csv.reader(f)
-                next(reader)  # 헤더 스킵
-                for row in reader:
-                    if len(row) > 1:
-                        duration = float(row[0])
-                        positions = np.array([float(val) for val in row[1:]]) * np.pi / 180.0  # deg2rad
-                        self._p2p_data.append((duration, positions))
+            # 3. 데이터 로드 (바이너리 memory-map + path/mtime 캐시, 캐시에 없으면 worker thread)
+            self._when_loaded([csv_path], self._start_playback)
+        except Exception as e:
+            print(f"❌ P2P Play error: {e}")
+
+    def _start_playback(self, trajectories: list):
+        try:
+            self._p2p_data = trajectories[0].p2p_data
             
             if not self._p2p_data:
                 print("❌ 유효한 데이터가 없습니다.")
                 return
             
-            # 4. 재생 초기화
+            # 4. URDF limit 검증 (경고만 출력하므로 재생을 막지 않도록 worker thread에서)
+            articulation = self._ui_builder._scenario._articulation
+            if articulation is not None:
+                start_positions = articulation.get_joint_positions()[:len(LIMS_EX_JOINT_NAMES)]
+                self._loader.run(self._validate, start_positions, self._p2p_data,
+                                 self._playback_mode not in self.CONTINUOUS_MODES)
+
+            # 재생 초기화
             self._current_via_idx = 0
             self._segment_time = 0.0
+            self._segment_start = 0.0
             self._spline = None
+            self._clock = None
+            self._playback_time_source = None
             
-            # 5. 콜백 설정
+            # 5. 콜백 설정 (stream 재생 중이면 stream부터 종료)
+            self._stop_stream()
             sim_ctx = SimulationContext.instance()
             if self._playback_active:
                 sim_ctx.remove_physics_callback("p2p_playback")
+                self._playback_active = False
+
+            if self._playback_mode == "compiled":
+                self._start_compiled_playback(sim_ctx)
+                return
+            if self._playback_mode == "continuous":
+                self._start_continuous_playback(sim_ctx)
+                return
+            if self._playback_mode == "inplace":
+                self._start_inplace_playback(sim_ctx)
+                return
 
             def playback_step(step_dt):
                 articulation = self._ui_builder._scenario._articulation
@@ -98,15 +201,627 @@ class P2PStudio:
                 if self._segment_time >= duration:
                     self._current_via_idx += 1
                     self._segment_time = 0.0
+                    self._segment_start += duration
                     self._spline = None
             
-            sim_ctx.add_physics_callback("p2p_playback", playback_step)
+            sim_ctx.add_physics_callback("p2p_playback", CallbackTimer.instance().wrap("p2p_playback", playback_step))
             self._playback_active = True
+            self._playback_time_source = lambda: self._segment_start + self._segment_time
             print(f"▶️ P2P Playback 시작: {len(self._p2p_data)} via points")
             
         except Exception as e:
             print(f"❌ P2P Play error: {e}")
 
+    def _start_compiled_playback(self, sim_ctx):
+        """전체 via point를 physics dt로 미리 샘플링한 뒤, 매 tick 테이블 인덱싱만 수행"""
+        articulation = self._ui_builder._scenario._articulation
+        if articulation is None:
+            print("❌ Articulation not ready")
+            return
+
+        self._playback_table = compile_playback_table(
+            articulation.get_joint_positions(), self._p2p_data, sim_ctx.get_physics_dt(), len(LIMS_EX_JOINT_NAMES)
+        )
+        self._table_idx = 0
+        table = self._playback_table
+
+        def compiled_playback_step(step_dt):
+            articulation = self._ui_builder._scenario._articulation
+            if not articulation or self._table_idx >= len(table):
+                sim_ctx.remove_physics_callback("p2p_playback")
+                self._playback_active = False
+                print("✅ P2P Playback 완료")
+                return
+
+            idx = self._table_idx
+            articulation.apply_action(ArticulationAction(
+                joint_positions=table.positions[idx],
+                joint_velocities=table.velocities[idx]
+            ))
+            self._table_idx += 1
+
+        sim_ctx.add_physics_callback("p2p_playback", CallbackTimer.instance().wrap("p2p_playback", compiled_playback_step))
+        self._playback_active = True
+        # 마지막으로 적용한 행의 궤적 시간
+        self._playback_time_source = lambda: table.times[max(self._table_idx - 1, 0)]
+        print(f"▶️ P2P Playback 시작 (compiled): {len(self._p2p_data)} via points, {len(table)} steps")
+
+    def _start_continuous_playback(self, sim_ctx):
+        """현재 위치 + 전체 via point를 하나의 스플라인으로 만들고 전역 clock으로 재생"""
+        articulation = self._ui_builder._scenario._articulation
+        if articulation is None:
+            print("❌ Articulation not ready")
+            return
+
+        n_joints = len(LIMS_EX_JOINT_NAMES)
+        start_positions = articulation.get_joint_positions()
+        self._trajectory = PiecewiseHermiteSpline.from_via_points(start_positions[:n_joints], self._p2p_data)
+        start_time = self._trajectory.duration if self._playback_speed < 0 else 0.0
+        self._clock = PlaybackClock(self._trajectory.duration, self._playback_speed, start_time)
+        trajectory, clock = self._trajectory, self._clock
+        all_positions = start_positions.copy()
+
+        def continuous_playback_step(step_dt):
+            articulation = self._ui_builder._scenario._articulation
+            if not articulation or clock.finished:
+                sim_ctx.remove_physics_callback("p2p_playback")
+                self._playback_active = False
+                print("✅ P2P Playback 완료")
+                return
+
+            positions, velocities = trajectory.evaluate(clock.step(step_dt))
+            all_positions[:n_joints] = positions
+            articulation.apply_action(ArticulationAction(
+                joint_positions=all_positions.copy(),
+                joint_velocities=velocities
+            ))
+
+        sim_ctx.add_physics_callback("p2p_playback", CallbackTimer.instance().wrap("p2p_playback", continuous_playback_step))
+        self._playback_active = True
+        print(f"▶️ P2P Playback 시작 (continuous): {len(self._p2p_data)} via points, {trajectory.duration:.2f} s")
+
+    def _start_inplace_playback(self, sim_ctx):
+        """
+        continuous와 같은 궤적/clock을 쓰되, 위치/속도 버퍼와 ArticulationAction을 한 번만 만들고
+        매 tick evaluate_into로 제자리 갱신 (get_joint_positions 호출도 시작 시 한 번)
+        """
+        articulation = self._ui_builder._scenario._articulation
+        if articulation is None:
+            print("❌ Articulation not ready")
+            return
+
+        n_joints = len(LIMS_EX_JOINT_NAMES)
+        all_positions = np.array(articulation.get_joint_positions(), dtype=float)
+        self._trajectory = PiecewiseHermiteSpline.from_via_points(all_positions[:n_joints], self._p2p_data)
+        start_time = self._trajectory.duration if self._playback_speed < 0 else 0.0
+        self._clock = PlaybackClock(self._trajectory.duration, self._playback_speed, start_time)
+        trajectory, clock = self._trajectory, self._clock
+
+        positions = all_positions[:n_joints]  # all_positions의 view
+        velocities = np.zeros(n_joints)
+        action = ArticulationAction(joint_positions=all_positions, joint_velocities=velocities)
+        trajectory.evaluate_into(clock.time, positions, velocities)
+
+        def inplace_playback_step(step_dt):
+            articulation = self._ui_builder._scenario._articulation
+            if articulation is None or clock.finished:
+                sim_ctx.remove_physics_callback("p2p_playback")
+                self._playback_active = False
+                print("✅ P2P Playback 완료")
+                return
+
+            trajectory.evaluate_into(clock.step(step_dt), positions, velocities)
+            articulation.apply_action(action)
+
+        sim_ctx.add_physics_callback("p2p_playback", CallbackTimer.instance().wrap("p2p_playback", inplace_playback_step))
+        self._playback_active = True
+        print(f"▶️ P2P Playback 시작 (inplace): {len(self._p2p_data)} via points, {trajectory.duration:.2f} s")
+
+    def on_playlist_play_clicked(self):
+        """
+        P2P Folder에 쉼표로 나열한 그룹을 순서대로 끊김 없이 재생.
+        다음 그룹은 현재 그룹이 재생되는 동안 worker thread에서 로드/스플라인 생성.
+        """
+        try:
+            names = self._field_group_names()
+            if not names:
+                print("⚠️ P2P Folder에 그룹 이름을 쉼표로 구분해 입력하세요.")
+                return
+            csv_paths = [self._group_csv_path(name) for name in names]
+            for csv_path in csv_paths:
+                if not os.path.exists(csv_path):
+                    print(f"❌ CSV 파일 없음: {csv_path}")
+                    return
+
+            articulation = self._ui_builder._scenario._articulation
+            if articulation is None:
+                print("❌ Articulation not ready")
+                return
+
+            self._stop_stream()
+            sim_ctx = SimulationContext.instance()
+            if self._playback_active:
+                sim_ctx.remove_physics_callback("p2p_playback")
+                self._playback_active = False
+            self._clock = None
+            self._playback_time_source = None
+            if self._pending_load is not None:
+                self._pending_load.cancel()
+                self._pending_load = None
+
+            playlist = Playlist(csv_paths, self._loader,
+                                stop_at_via_points=self._playback_mode not in self.CONTINUOUS_MODES,
+                                loop=self.playlist_loop)
+            self._playlist = playlist
+            all_positions = np.array(articulation.get_joint_positions(), dtype=float)
+            future = playlist.schedule(0, all_positions[:len(LIMS_EX_JOINT_NAMES)])
+            playlist.schedule(1)
+            print(f"⏳ Playlist 준비 중: {', '.join(names)}")
+            self._pending_load = asyncio.ensure_future(
+                self._start_when_loaded([future], lambda splines: self._start_playlist_playback(sim_ctx, playlist, splines[0]))
+            )
+        except Exception as e:
+            print(f"❌ Playlist error: {e}")
+
+    def _start_playlist_playback(self, sim_ctx, playlist: Playlist, first_spline: PiecewiseHermiteSpline):
+        """
+        item 스플라인을 차례로 evaluate_into로 재생. 한 item이 끝난 step에서 남은 시간을 다음 item으로 넘기므로
+        경계에서 정지하거나 tick을 버리지 않음. item이 바뀔 때마다 그 다음 item을 worker에 예약.
+        다음 item이 아직 생성 중이면 physics thread를 막지 않고 마지막 자세 (속도 0)를 유지하다가 준비된 step부터 이어 감.
+        """
+        articulation = self._ui_builder._scenario._articulation
+        if articulation is None or self._playlist is not playlist:
+            return
+
+        n_joints = len(LIMS_EX_JOINT_NAMES)
+        all_positions = np.array(articulation.get_joint_positions(), dtype=float)
+        positions = all_positions[:n_joints]
+        velocities = np.zeros(n_joints)
+        action = ArticulationAction(joint_positions=all_positions, joint_velocities=velocities)
+        # [item 번호, item 내 시간, 스플라인, 다음 item을 기다리는 중]
+        state = [0, 0.0, first_spline, False]
+
+        def finish(message):
+            sim_ctx.remove_physics_callback("p2p_playback")
+            self._playback_active = False
+            print(message)
+
+        def playlist_step(step_dt):
+            articulation = self._ui_builder._scenario._articulation
+            if articulation is None:
+                finish("✅ Playlist 재생 중단")
+                return
+
+            # 역재생은 지원하지 않으므로 속도 크기만 사용
+            state[1] += step_dt * abs(self._playback_speed)
+            while state[1] >= state[2].duration:
+                try:
+                    spline, ready = playlist.take(state[0] + 1)
+                except Exception as e:
+                    finish(f"❌ Playlist error: {e}")
+                    return
+                if not ready:
+                    # 기다린 시간만큼 다음 item을 건너뛰지 않도록 끝 시각에 고정
+                    if not state[3]:
+                        state[3] = True
+                        print(f"⚠️ 다음 그룹 준비가 늦어 마지막 자세 유지: {playlist.name(state[0] + 1)}")
+                    state[1] = state[2].duration
+                    state[2].evaluate_into(state[1], positions, velocities)
+                    velocities.fill(0.0)
+                    articulation.apply_action(action)
+                    return
+                if spline is None:
+                    state[2].evaluate_into(state[2].duration, positions, velocities)
+                    articulation.apply_action(action)
+                    finish("✅ Playlist 재생 완료")
+                    return
+                state[3] = False
+                state[1] -= state[2].duration
+                state[0] += 1
+                state[2] = spline
+                playlist.schedule(state[0] + 1)
+                print(f"▶️ Playlist [{state[0] + 1}] {playlist.name(state[0])}")
+
+            state[2].evaluate_into(state[1], positions, velocities)
+            articulation.apply_action(action)
+
+        sim_ctx.add_physics_callback("p2p_playback", CallbackTimer.instance().wrap("p2p_playback", playlist_step))
+        self._playback_active = True
+        print(f"▶️ Playlist [1] {playlist.name(0)} ({len(playlist.names)} groups{', loop' if playlist.loop else ''})")
+
+    def on_stream_clicked(self):
+        """외부 프로세스가 localhost TCP로 보내는 via point를 실시간 재생 (다시 누르면 중지)"""
+        try:
+            if self._stream_server is not None:
+                # 재생 중이면 중지, 스트림이 이미 스스로 끝났으면 thread만 정리하고 새로 시작
+                stopping = self._stream_playback_active
+                self._stop_stream()
+                if stopping:
+                    return
+
+            articulation = self._ui_builder._scenario._articulation
+            if articulation is None:
+                print("❌ Articulation not ready")
+                return
+
+            sim_ctx = SimulationContext.instance()
+            if self._playback_active:
+                sim_ctx.remove_physics_callback("p2p_playback")
+                self._playback_active = False
+            self._clock = None
+            self._playback_time_source = None
+
+            server = ViaPointStreamServer(len(LIMS_EX_JOINT_NAMES), port=self.stream_port,
+                                          queue_size=VIA_POINT_STREAM_QUEUE_SIZE)
+            server.start()
+            self._stream_server = server
+            self._start_stream_playback(sim_ctx, server)
+            host, port = server.address
+            print(f"📡 Stream 대기 중: {host}:{port}")
+        except Exception as e:
+            print(f"❌ Stream error: {e}")
+
+    def _stop_stream(self):
+        """UI / cleanup 경로: stream 재생을 멈추고 reader thread를 join"""
+        server, self._stream_server = self._stream_server, None
+        if server is None:
+            return
+        self._finish_stream_playback(server)
+        server.stop()
+        stats = self.stream_latency.stats()
+        print(f"✅ Stream 종료: {server.received} via points, underrun {self.stream_underruns}회, "
+              f"latency p50 {stats['p50'] / 1000.0:.1f} / p99 {stats['p99'] / 1000.0:.1f} / max {stats['max'] / 1000.0:.1f} ms")
+
+    def _finish_stream_playback(self, server: ViaPointStreamServer):
+        """
+        stream이 설치한 p2p_playback callback만 제거하고 reader thread에 종료를 알림.
+        join / 통계 계산은 하지 않으므로 physics callback에서도 호출 가능 (다른 모드의 callback은 건드리지 않음).
+        """
+        if not self._stream_playback_active:
+            return
+        self._stream_playback_active = False
+        SimulationContext.instance().remove_physics_callback("p2p_playback")
+        self._playback_active = False
+        server.request_stop()
+
+    def _start_stream_playback(self, sim_ctx, server: ViaPointStreamServer):
+        """
+        live 모드와 같은 IRIMCubicHermiteSpline ring buffer로 스트림을 재생.
+        버퍼 [P0, P1, P2, P3]에서 P1 -> P2를 재생하고, 구간이 끝날 때마다 queue의 다음 점을 add_back_via_point로 밀어 넣음.
+        underrun (다음 점 없음)이면 P3를 duration 0으로 한 번 더 넣어 P3에서 탄젠트 0으로 감속 정지하고,
+        정지한 위치에서 새 점이 오면 live 모드 시작과 같이 [P, P, target, lookahead]로 다시 시작.
+        """
+        n_joints = len(LIMS_EX_JOINT_NAMES)
+        articulation = self._ui_builder._scenario._articulation
+        all_positions = np.array(articulation.get_joint_positions(), dtype=float)
+        self.stream_latency.clear()
+        self.stream_underruns = 0
+        # spline: 현재 ring buffer, resting: 정지 상태 (rest 위치), time: 구간 내 시간 [s]
+        # stopping: 마지막 점이 정지용 복제, lookahead_ns: P3 수신 시각 (P2가 될 때 지연 기록)
+        state = {"spline": None, "resting": True, "rest": all_positions[:n_joints].copy(), "time": 0.0,
+                 "stopping": False, "lookahead_ns": None}
+
+        def buffer_point(spline, offset: int):
+            return spline.positions[(spline.head + offset) % spline.BUFFER_SIZE]
+
+        def activate(received_ns):
+            if received_ns is not None:
+                self.stream_latency.record(time.perf_counter_ns() - received_ns)
+
+        def push_lookahead(spline):
+            item = server.poll()
+            if item is None:
+                # 다음 점이 없으면 마지막 점에서 정지 (duration 0 복제 -> 탄젠트 0)
+                spline.add_back_via_point(0.0, buffer_point(spline, spline.filled - 1).copy())
+                state["stopping"], state["lookahead_ns"] = True, None
+            else:
+                spline.add_back_via_point(item[0], item[1])
+                state["stopping"], state["lookahead_ns"] = False, item[2]
+
+        def restart() -> bool:
+            """정지 위치에서 새 점으로 출발 (live 모드 시작과 같은 [rest, rest, target, lookahead])"""
+            item = server.poll()
+            if item is None:
+                return False
+            spline = IRIMCubicHermiteSpline(n_joints)
+            spline.add_back_via_point(0.0, state["rest"])
+            spline.add_back_via_point(0.0, state["rest"])
+            spline.add_back_via_point(item[0], item[1])
+            activate(item[2])
+            push_lookahead(spline)
+            state["spline"], state["resting"] = spline, False
+            return True
+
+        def stream_step(step_dt):
+            articulation = self._ui_builder._scenario._articulation
+            if articulation is None:
+                self._finish_stream_playback(server)
+                return
+
+            if state["resting"]:
+                if not restart():
+                    if server.ended:
+                        self._finish_stream_playback(server)
+                        print("✅ Stream 재생 완료")
+                    return
+                state["time"] = 0.0
+
+            state["time"] += step_dt
+            spline = state["spline"]
+            while state["time"] > spline.durations[(spline.head + 2) % spline.BUFFER_SIZE]:
+                state["time"] -= spline.durations[(spline.head + 2) % spline.BUFFER_SIZE]
+                if not state["stopping"]:
+                    activate(state["lookahead_ns"])
+                    push_lookahead(spline)
+                    continue
+                # P2에서 정지 완료 (underrun) -> 새 점이 있으면 남은 시간으로 바로 재시작
+                state["rest"] = buffer_point(spline, 2).copy()
+                state["resting"] = True
+                if not server.ended:
+                    self.stream_underruns += 1
+                if not restart():
+                    all_positions[:n_joints] = state["rest"]
+                    articulation.apply_action(ArticulationAction(
+                        joint_positions=all_positions.copy(), joint_velocities=np.zeros(n_joints)
+                    ))
+                    return
+                spline = state["spline"]
+
+            _, positions, velocities = spline.get_target(state["time"] * 1000.0)
+            if positions is not None:
+                all_positions[:n_joints] = positions
+                articulation.apply_action(ArticulationAction(
+                    joint_positions=all_positions.copy(), joint_velocities=velocities
+                ))
+
+        sim_ctx.add_physics_callback("p2p_playback", CallbackTimer.instance().wrap("p2p_playback", stream_step))
+        self._playback_active = True
+        self._stream_playback_active = True
+
+    def on_fleet_play_clicked(self):
+        """
+        UIBuilder._fleet_view의 N개 로봇이 각자 그룹을 재생.
+        P2P Folder에 쉼표로 나열한 그룹 (비어 있으면 라이브러리 전체)을 로봇에 차례로 배정.
+        """
+        try:
+            view = self._ui_builder._fleet_view
+            if view is None:
+                print("❌ Fleet not ready (Fleet Setup을 먼저 실행하세요)")
+                return
+
+            names = self._field_group_names() or sorted(self.library.scan())
+            if not names:
+                print("❌ 재생할 그룹이 없습니다.")
+                return
+
+            csv_paths = [self._group_csv_path(name) for name in names]
+            for csv_path in csv_paths:
+                if not os.path.exists(csv_path):
+                    print(f"❌ CSV 파일 없음: {csv_path}")
+                    return
+
+            self._when_loaded(csv_paths, self._on_fleet_loaded)
+        except Exception as e:
+            print(f"❌ Fleet Play error: {e}")
+
+    def _on_fleet_loaded(self, trajectories: list):
+        try:
+            view = self._ui_builder._fleet_view
+            if view is None:
+                print("❌ Fleet not ready (Fleet Setup을 먼저 실행하세요)")
+                return
+            for trajectory in trajectories:
+                if not trajectory.p2p_data:
+                    print("❌ 유효한 데이터가 없는 그룹이 있습니다.")
+                    return
+
+            sim_ctx = SimulationContext.instance()
+            if self._fleet_active:
+                sim_ctx.remove_physics_callback("fleet_playback")
+                self._fleet_active = False
+
+            # 그룹을 로봇에 차례로 배정
+            p2p_data_list = [trajectories[i % len(trajectories)].p2p_data for i in range(view.count)]
+            self._start_fleet_playback(sim_ctx, view, p2p_data_list)
+        except Exception as e:
+            print(f"❌ Fleet Play error: {e}")
+
+    def _start_fleet_playback(self, sim_ctx, view, p2p_data_list: list):
+        """
+        로봇별 스플라인을 BatchedPiecewiseSpline으로 묶어 매 tick (N, dim) 평가 한 번 + apply_action 한 번.
+        위치/속도는 (N, dof) 버퍼의 view에 직접 기록하고, ArticulationActions는 시작 시 한 번만 생성.
+        """
+        n_joints = len(LIMS_EX_JOINT_NAMES)
+        all_positions = np.array(view.get_joint_positions(), dtype=float)
+        all_velocities = np.zeros_like(all_positions)
+        self._fleet_trajectory = BatchedPiecewiseSpline.from_via_points(
+            all_positions[:, :n_joints], p2p_data_list,
+            stop_at_via_points=self._playback_mode not in self.CONTINUOUS_MODES,
+        )
+        start_time = self._fleet_trajectory.duration if self._playback_speed < 0 else 0.0
+        self._fleet_clock = PlaybackClock(self._fleet_trajectory.duration, self._playback_speed, start_time)
+        trajectory, clock = self._fleet_trajectory, self._fleet_clock
+
+        positions = all_positions[:, :n_joints]
+        velocities = all_velocities[:, :n_joints]
+        action = ArticulationActions(joint_positions=all_positions, joint_velocities=all_velocities)
+        trajectory.evaluate(clock.time, positions, velocities)
+
+        def fleet_playback_step(step_dt):
+            view = self._ui_builder._fleet_view
+            if view is None or clock.finished:
+                sim_ctx.remove_physics_callback("fleet_playback")
+                self._fleet_active = False
+                print("✅ Fleet Playback 완료")
+                return
+
+            trajectory.evaluate(clock.step(step_dt), positions, velocities)
+            view.apply_action(action)
+
+        sim_ctx.add_physics_callback("fleet_playback", CallbackTimer.instance().wrap("fleet_playback", fleet_playback_step))
+        self._fleet_active = True
+        print(f"▶️ Fleet Playback 시작: {trajectory.n_robots} robots, {trajectory.duration:.2f} s")
+
+    def _group_csv_path(self, group_name: str) -> str:
+        return os.path.join(self._traj_dir, group_name + "_group", VIA_POINT_CSV_NAME)
+
+    def _field_group_names(self) -> list:
+        """P2P Folder 필드의 쉼표로 구분된 그룹 이름들"""
+        return [name.strip() for name in self._p2p_name_field.model.get_value_as_string().split(",") if name.strip()]
+
+    def _when_loaded(self, csv_paths: list, start_fn):
+        """
+        csv_paths가 모두 캐시에 있으면 바로 start_fn([ViaPointTrajectory, ...]) 호출.
+        아니면 worker thread에서 로드하고, 끝나면 main thread의 asyncio task에서 호출 (이전에 기다리던 재생은 취소).
+        """
+        if self._pending_load is not None:
+            self._pending_load.cancel()
+            self._pending_load = None
+
+        trajectories = [cached_via_points(csv_path) for csv_path in csv_paths]
+        if all(trajectory is not None for trajectory in trajectories):
+            start_fn(trajectories)
+            return
+
+        futures = [self._loader.submit(csv_path) for csv_path in csv_paths]
+        print(f"⏳ 로딩 중: {', '.join(os.path.basename(os.path.dirname(p)) for p in csv_paths)}")
+        self._pending_load = asyncio.ensure_future(self._start_when_loaded(futures, start_fn))
+
+    async def _start_when_loaded(self, futures: list, start_fn):
+        try:
+            # shield: 재생이 취소돼도 같은 Future를 기다리는 prefetch 로드는 계속 진행
+            trajectories = [await asyncio.shield(asyncio.wrap_future(future)) for future in futures]
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._pending_load = None
+            print(f"❌ 로드 실패: {e}")
+            return
+        self._pending_load = None
+        start_fn(trajectories)
+
+    @property
+    def pending_load(self):
+        """로드 완료를 기다리는 asyncio task (없으면 None)"""
+        return self._pending_load
+
+    def prefetch_groups(self, group_names: list):
+        """곧 재생할 가능성이 높은 그룹을 worker thread에서 미리 로드 (캐시에 있는 그룹은 생략)"""
+        csv_paths = [self._group_csv_path(name) for name in group_names]
+        self._loader.prefetch([csv_path for csv_path in csv_paths if cached_via_points(csv_path) is None])
+
+    def on_group_field_changed(self):
+        """P2P Folder 입력이 끝나면 입력한 그룹을 미리 로드"""
+        self.prefetch_groups(self._field_group_names())
+
+    def cleanup(self, wait: bool = False):
+        self._stop_stream()
+        self._stop_recording()
+        if self._pending_load is not None:
+            self._pending_load.cancel()
+            self._pending_load = None
+        self._loader.shutdown(wait)
+
+    def _clocks(self) -> list:
+        return [clock for clock in (self._clock, self._fleet_clock) if clock is not None]
+
+    def seek(self, t: float):
+        """continuous / fleet 재생 위치를 t [s]로 이동"""
+        for clock in self._clocks():
+            clock.seek(t)
+
+    def seek_fraction(self, fraction: float):
+        """continuous / fleet 재생 위치를 전체 길이 대비 비율(0~1)로 이동 (scrub 슬라이더용)"""
+        for clock in self._clocks():
+            clock.seek(fraction * clock.duration)
+
+    def set_playback_speed(self, speed: float):
+        """재생 속도 배율 (음수면 역재생). 재생 중이면 즉시 반영"""
+        self._playback_speed = speed
+        for clock in self._clocks():
+            clock.set_speed(speed)
+
+    def on_reverse_clicked(self):
+        self.set_playback_speed(-self._playback_speed)
+        print(f"🔁 Playback speed: {self._playback_speed}")
+
+    def _validate(self, start_positions, p2p_data, stop_at_via_points: bool):
+        """재생될 궤적을 URDF 위치/속도/가속도 limit으로 검증하고 결과 출력"""
+        if self._validator is None:
+            self._validator = TrajectoryValidator()
+        report = self._validator.validate_via_points(start_positions, p2p_data, stop_at_via_points)
+        print(report.summary())
+        return report
+
+    def on_retime_clicked(self):
+        """입력한 그룹의 duration을 URDF limit 기반 최소값으로 다시 계산 (첫 행 유지)"""
+        folder_name = self._p2p_name_field.model.get_value_as_string().strip()
+        if not folder_name:
+            print("⚠️ Folder name을 입력하세요.")
+            return
+
+        csv_path = os.path.join(self._traj_dir, folder_name + "_group", VIA_POINT_CSV_NAME)
+        if not os.path.exists(csv_path):
+            print(f"❌ CSV 파일 없음: {csv_path}")
+            return
+
+        durations = retime_group(csv_path, self.retime_margin,
+                                 stop_at_via_points=self._playback_mode not in self.CONTINUOUS_MODES)
+        print(f"✅ Retime 완료: {np.round(durations, 3).tolist()} (총 {np.sum(durations):.2f} s)")
+
+    def on_collision_check_clicked(self):
+        """입력한 그룹을 현재 자세에서 재생했을 때 self-collision / cuboid 충돌 검사 + 그리퍼 clearance"""
+        folder_name = self._p2p_name_field.model.get_value_as_string().strip()
+        if not folder_name:
+            print("⚠️ Folder name을 입력하세요.")
+            return
+
+        csv_path = os.path.join(self._traj_dir, folder_name + "_group", VIA_POINT_CSV_NAME)
+        if not os.path.exists(csv_path):
+            print(f"❌ CSV 파일 없음: {csv_path}")
+            return
+
+        p2p_data = load_via_points(csv_path).p2p_data
+        if not p2p_data:
+            print("❌ 유효한 데이터가 없습니다.")
+            return
+
+        articulation = self._ui_builder._scenario._articulation
+        if articulation is not None:
+            start_positions = articulation.get_joint_positions()[:len(LIMS_EX_JOINT_NAMES)]
+        else:
+            start_positions = p2p_data[0][1]
+
+        # proxy 생성은 한 번만, 장애물은 매번 현재 cuboid 위치로 갱신
+        if self._collision_checker is None:
+            self._collision_checker = CollisionChecker()
+            self._distance_query = DistanceQuery(fk=self._collision_checker.fk)
+        obstacles = self._scene_obstacles()
+        self._collision_checker.obstacles = obstacles
+        self._distance_query.obstacles = obstacles
+
+        trajectory = PiecewiseHermiteSpline.from_via_points(
+            start_positions, p2p_data, stop_at_via_points=self._playback_mode not in self.CONTINUOUS_MODES
+        )
+        report = self._collision_checker.check_trajectory(trajectory)
+        print(report.summary())
+        if obstacles:
+            print(self._distance_query.clearance_trajectory(trajectory).summary(self.clearance_budget))
+        return report
+
+    def _scene_obstacles(self) -> list:
+        cuboid = self._ui_builder._cuboid
+        if cuboid is None:
+            return []
+        position, orientation = cuboid.get_world_pose()
+        half_extents = 0.5 * cuboid.get_size() * np.asarray(cuboid.get_local_scale())
+        return [BoxObstacle("cuboid", position, half_extents, quaternion_to_matrix(orientation)[0])]
+
+    def on_library_clicked(self):
+        """trajectory 폴더를 스캔(변경된 그룹만)하고 목록 출력"""
+        self.library.scan()
+        self.library.print_summary()
+
     def on_via_point_clicked(self):
         articulation = self._ui_builder._scenario._articulation
         if articulation is None:
@@ -123,6 +838,155 @@ class P2PStudio:
             print(f"Point {i+1}: {formatted_point}")
         print("\n")
 
+    def on_record_clicked(self):
+        """
+        매 physics step의 joint state (위치, 속도, 적용된 목표)를 파일에 기록 (다시 누르면 중지).
+        파일: <trajectory>/recordings/joint_states_<시각>.lxjs
+        """
+        try:
+            if self._recorder is not None:
+                self._stop_recording()
+                return
+
+            articulation = self._ui_builder._scenario._articulation
+            if articulation is None:
+                print("❌ Articulation not ready")
+                return
+
+            sim_ctx = SimulationContext.instance()
+            file_name = f"joint_states_{time.strftime('%Y%m%d_%H%M%S')}{JOINT_STATE_LOG_EXTENSION}"
+            recorder = JointStateRecorder(
+                os.path.join(self._traj_dir, RECORDING_DIR_NAME, file_name),
+                articulation.dof_names,
+                metadata={
+                    "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "physics_dt": sim_ctx.get_physics_dt(),
+                    "group": self._p2p_name_field.model.get_value_as_string().strip(),
+                    "playback_mode": self._playback_mode,
+                },
+            )
+            recorder.start()
+            self._recorder = recorder
+            self._start_recording(sim_ctx, recorder)
+            print(f"▶️ Joint state 기록 시작: {recorder.path}")
+        except Exception as e:
+            print(f"❌ Record error: {e}")
+
+    def _start_recording(self, sim_ctx, recorder: JointStateRecorder):
+        state = {"time": 0.0}
+        nan = float("nan")
+
+        def record_step(step_dt):
+            articulation = self._ui_builder._scenario._articulation
+            if articulation is None:
+                return
+            state["time"] += step_dt
+            # P2P 재생 중이면 궤적 시간도 함께 기록 (tracking error 분석에서 기준 궤적과 맞춤)
+            clock, source = self._clock, self._playback_time_source
+            if not self._playback_active:
+                playback_time = nan
+            elif clock is not None:
+                playback_time = clock.time if not clock.finished else nan
+            else:
+                playback_time = source() if source is not None else nan
+            action = articulation.get_applied_action()
+            recorder.record(state["time"], playback_time, articulation.get_joint_positions(),
+                            articulation.get_joint_velocities(), action.joint_positions if action is not None else None)
+
+        sim_ctx.add_physics_callback("joint_state_recorder",
+                                     CallbackTimer.instance().wrap("joint_state_recorder", record_step))
+
+    def _stop_recording(self):
+        recorder, self._recorder = self._recorder, None
+        if recorder is None:
+            return
+        sim_ctx = SimulationContext.instance()
+        if sim_ctx.physics_callback_exists("joint_state_recorder"):
+            sim_ctx.remove_physics_callback("joint_state_recorder")
+        recorder.stop()
+        self._last_recording = recorder.path
+        size_mb = os.path.getsize(recorder.path) / 1e6 if os.path.exists(recorder.path) else 0.0
+        print(f"✅ Joint state 기록 종료: {recorder.flushed} records (dropped {recorder.dropped}), "
+              f"{size_mb:.1f} MB -> {recorder.path}")
+
+    def on_compress_clicked(self):
+        """
+        마지막 joint state 기록 (없으면 recordings 폴더의 최신 기록)을 허용 오차 안에서 최소한의 via point로 압축해
+        P2P Folder 이름의 그룹으로 저장 (worker thread에서 실행)
+        """
+        folder_name = self._p2p_name_field.model.get_value_as_string().strip()
+        if not folder_name:
+            print("⚠️ Folder name을 입력하세요.")
+            return
+        log_path = self._last_recording or self._latest_recording()
+        if log_path is None or not os.path.exists(log_path):
+            print("⚠️ 압축할 기록이 없습니다.")
+            return
+        if self._recorder is not None and self._recorder.path == log_path:
+            print("⚠️ 기록 중인 파일은 압축할 수 없습니다.")
+            return
+
+        folder_path = os.path.join(self._traj_dir, folder_name + "_group")
+        os.makedirs(folder_path, exist_ok=True)
+        csv_path = os.path.join(folder_path, VIA_POINT_CSV_NAME)
+        # 재생할 모드의 탄젠트 규칙으로 복원 오차를 계산
+        stop_at_via_points = self._playback_mode not in self.CONTINUOUS_MODES
+        self._loader.run(self._compress, log_path, csv_path, np.radians(self.compression_tolerance_deg),
+                         stop_at_via_points)
+        print(f"⏳ 압축 중: {log_path} -> {csv_path}")
+
+    def _compress(self, log_path: str, csv_path: str, tolerance: float, stop_at_via_points: bool):
+        start = time.perf_counter()
+        log = JointStateLog(log_path)
+        trajectory, error = compress_recording(log, csv_path, tolerance, LIMS_EX_JOINT_NAMES,
+                                               stop_at_via_points=stop_at_via_points)
+        print(f"✅ 압축 완료: {len(log)} samples -> {len(trajectory)} via points "
+              f"(max error {np.degrees(error.max()):.3f} deg, {time.perf_counter() - start:.1f} s) -> {csv_path}")
+        return trajectory
+
+    def on_analyze_clicked(self):
+        """
+        마지막 joint state 기록을 재생한 via point 그룹 (기록 당시 그룹, 없으면 P2P Folder 이름)과 비교해
+        조인트별 / CSV 행별 tracking error (RMS, peak, lag, overshoot)를 계산 (worker thread에서 실행).
+        보고서: <기록 파일>.tracking.csv
+        """
+        log_path = self._last_recording or self._latest_recording()
+        if log_path is None or not os.path.exists(log_path):
+            print("⚠️ 분석할 기록이 없습니다.")
+            return
+        if self._recorder is not None and self._recorder.path == log_path:
+            print("⚠️ 기록 중인 파일은 분석할 수 없습니다.")
+            return
+        self._loader.run(self._analyze, log_path, self._p2p_name_field.model.get_value_as_string().strip())
+        print(f"⏳ Tracking error 분석 중: {log_path}")
+
+    def _analyze(self, log_path: str, folder_name: str):
+        start = time.perf_counter()
+        log = JointStateLog(log_path)
+        group = log.metadata.get("group") or folder_name
+        csv_path = self._group_csv_path(group)
+        if not group or not os.path.exists(csv_path):
+            print(f"❌ 기준 그룹을 찾을 수 없습니다: {group or '(없음)'}")
+            return None
+        # 기록 당시 재생 모드의 탄젠트 규칙으로 기준 궤적 생성
+        playback_mode = log.metadata.get("playback_mode", self._playback_mode)
+        stop_at_via_points = playback_mode not in self.CONTINUOUS_MODES
+        # live는 구간마다 측정 위치에서 다시 출발하므로 기록된 명령 위치 (target)와 비교
+        report = analyze_recording(log, load_via_points(csv_path).p2p_data, LIMS_EX_JOINT_NAMES, stop_at_via_points,
+                                   use_targets=playback_mode == "live")
+        report_path = os.path.splitext(log_path)[0] + ".tracking.csv"
+        report.write_csv(report_path)
+        print(report.summary())
+        print(f"✅ 분석 완료: {len(log)} records ({time.perf_counter() - start:.1f} s) -> {report_path}")
+        return report
+
+    def _latest_recording(self):
+        recording_dir = os.path.join(self._traj_dir, RECORDING_DIR_NAME)
+        if not os.path.isdir(recording_dir):
+            return None
+        paths = [entry.path for entry in os.scandir(recording_dir) if entry.name.endswith(JOINT_STATE_LOG_EXTENSION)]
+        return max(paths, key=os.path.getmtime) if paths else None
+
     def on_clear_clicked(self):
         self.via_points_cache = []
         print("✅ Via Point 리스트 초기화")
@@ -139,28 +1003,32 @@ class P2PStudio:
             print("❌ Articulation not ready")
             return
 
+        if not self.via_points_cache:
+            print("⚠️ 저장할 Via Point가 없습니다.")
+            return
+
         # 폴더 생성
         os.makedirs(folder_path, exist_ok=True)
 
         # CSV 파일 경로
-        csv_path = os.path.join(folder_path, 'lims_ex_viapoints.csv')
+        csv_path = os.path.join(folder_path, VIA_POINT_CSV_NAME)
         
         # 조인트 이름을 인덱스로 매핑
         joint_names_all = articulation.dof_names
         indices = [joint_names_all.index(joint) for joint in LIMS_EX_JOINT_NAMES]
         
-        # CSV 파일 작성
-        with open(csv_path, 'w', newline='') as f:
-            writer = csv.writer(f)
-            
-            # 헤더 작성: duration + 실제 조인트 이름들
-            header = ["duration"] + LIMS_EX_JOINT_NAMES
-            writer.writerow(header)
-            
-            # 데이터 작성
-            for via_point in self.via_points_cache:
-                row = [3.0] + [round(np.degrees(via_point[idx]), 3) for idx in indices]
-                writer.writerow(row)
+        # CSV + 바이너리 파일 작성 (Retime과 같게 CSV에 저장되는 반올림 값으로 duration 계산)
+        positions_deg = np.degrees(np.array(self.via_points_cache).reshape(len(self.via_points_cache), -1)[:, indices])
+        positions_deg = np.round(positions_deg, CSV_DECIMALS)
+        stop_at_via_points = self._playback_mode not in self.CONTINUOUS_MODES
+        # 첫 행은 고정 approach duration, 나머지는 현재 재생 모드의 limit 기반 최소 duration
+        durations = group_durations(positions_deg * np.pi / 180.0, np.zeros(len(positions_deg)), self.retime_margin,
+                                    DEFAULT_APPROACH_DURATION, stop_at_via_points)
+        trajectory = write_via_point_csv(csv_path, durations, positions_deg, LIMS_EX_JOINT_NAMES)
+
+        # 첫 via point 기준으로 나머지 구간 검증 (첫 구간은 재생 시작 위치에 따라 달라짐, 현재 재생 모드의 탄젠트 규칙)
+        if len(trajectory) > 1:
+            self._validate(trajectory.positions[0], trajectory.p2p_data[1:], stop_at_via_points)
         
         print(f"✅ Via Point가 {csv_path}에 저장되었습니다.")
 
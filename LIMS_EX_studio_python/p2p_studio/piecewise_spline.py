@@ -0,0 +1,241 @@
+import bisect
+import numpy as np
+from .via_point_manager import hermite_tangents, hermite_coefficients
+
+
+class PiecewiseHermiteSpline:
+    """
+    전체 via point를 하나로 잇는 구간별 Cubic Hermite 스플라인.
+    탄젠트 규칙은 IRIMCubicHermiteSpline과 동일 (인접 기울기 부호가 같을 때만 평균, 양 끝점은 0).
+    """
+
+    def __init__(self, durations: np.ndarray, positions: np.ndarray, stop_at_via_points: bool = False, eps: float = 1e-6,
+                 start_tangent: np.ndarray = None, end_tangent: np.ndarray = None):
+        """
+        Args:
+            durations: (S,) 구간별 duration [s] (positions[k] -> positions[k+1])
+            positions: (S+1, dim) knot 위치 [rad]
+            stop_at_via_points: True면 모든 via point에서 정지 (live 모드와 같은 rest-to-rest 프로파일)
+            eps: duration 분모 체크용 epsilon
+            start_tangent / end_tangent: (dim,) 양 끝점 속도 [rad/s] (기본 0, 앞뒤 궤적과 이어 붙일 때 사용)
+        """
+        self.EPS = eps
+        self.stop_at_via_points = stop_at_via_points
+        self.durations = np.asarray(durations, dtype=float).reshape(-1)
+        self.positions = np.asarray(positions, dtype=float)
+        if self.positions.shape[0] != self.durations.shape[0] + 1:
+            raise ValueError("positions must have exactly one more row than durations")
+        self.dim = self.positions.shape[1]
+        self.start_tangent = np.zeros(self.dim) if start_tangent is None else np.asarray(start_tangent, dtype=float)
+        self.end_tangent = np.zeros(self.dim) if end_tangent is None else np.asarray(end_tangent, dtype=float)
+
+        # 누적 knot 시간 (binary search용)
+        self.knot_times = np.concatenate(([0.0], np.cumsum(self.durations)))
+        self._knot_list = self.knot_times.tolist()
+        self._compute_coefficients()
+
+        # evaluate_into()용 버퍼 (처음 호출 시 할당)
+        self._eval_pos = None
+
+    @classmethod
+    def from_via_points(cls, start_positions: np.ndarray, p2p_data: list, **kwargs) -> "PiecewiseHermiteSpline":
+        """시작 위치 + [(duration, target_pos), ...] (CSV 행 순서)로 생성"""
+        durations = np.array([duration for duration, _ in p2p_data], dtype=float)
+        positions = np.vstack([np.asarray(start_positions, dtype=float)] + [pos for _, pos in p2p_data])
+        return cls(durations, positions, **kwargs)
+
+    @property
+    def duration(self) -> float:
+        return self._knot_list[-1]
+
+    @property
+    def n_segments(self) -> int:
+        return self.durations.shape[0]
+
+    def _compute_coefficients(self):
+        """모든 구간의 u에 대한 위치/속도/가속도 다항식 계수를 한 번에 계산"""
+        D = self.durations[:, None]
+        moving = D > self.EPS
+        safe_D = np.where(moving, D, 1.0)
+
+        # 구간 기울기 (duration이 EPS 이하인 구간은 0)
+        slopes = np.where(moving, np.diff(self.positions, axis=0) / safe_D, 0.0)
+
+        # knot 탄젠트: 양 끝점은 start/end_tangent (기본 0), 내부는 C++ 규칙
+        tangents = np.zeros_like(self.positions)
+        if not self.stop_at_via_points and self.n_segments > 1:
+            tangents[1:-1] = hermite_tangents(slopes[:-1], slopes[1:])
+        tangents[0] = self.start_tangent
+        tangents[-1] = self.end_tangent
+
+        T1 = tangents[:-1] * D
+        T2 = tangents[1:] * D
+        # (S, 4, dim): [c3, c2, c1, c0]
+        self.pos_coeffs = np.ascontiguousarray(
+            hermite_coefficients(self.positions[:-1], self.positions[1:], T1, T2).transpose(1, 0, 2)
+        )
+        c3, c2, c1 = self.pos_coeffs[:, 0], self.pos_coeffs[:, 1], self.pos_coeffs[:, 2]
+        self.vel_coeffs = np.ascontiguousarray(np.stack((3 * c3, 2 * c2, c1), axis=1) / safe_D[:, :, None])
+        self.acc_coeffs = np.ascontiguousarray(np.stack((6 * c3, 2 * c2), axis=1) / (safe_D * safe_D)[:, :, None])
+
+    def find_segment(self, t: float) -> int:
+        """t가 속한 구간 인덱스 (O(log n) binary search)"""
+        seg = bisect.bisect_right(self._knot_list, t) - 1
+        return min(max(seg, 0), self.n_segments - 1)
+
+    def evaluate(self, t: float) -> tuple:
+        """
+        단일 시간 t [s]에서 위치/속도 계산 (범위 밖은 양 끝점으로 clamp)
+        Returns:
+            (pose_out, vel_out) - (dim,) 배열
+        """
+        t = min(max(t, 0.0), self._knot_list[-1])
+        seg = self.find_segment(t)
+        u = self._normalized_time(seg, t)
+        c3, c2, c1, c0 = self.pos_coeffs[seg]
+        v2, v1, v0 = self.vel_coeffs[seg]
+        return ((c3 * u + c2) * u + c1) * u + c0, (v2 * u + v1) * u + v0
+
+    def evaluate_into(self, t: float, pose_out: np.ndarray, vel_out: np.ndarray):
+        """
+        evaluate()와 같은 값을 미리 할당된 (dim,) 배열에 기록.
+        처음 호출 시 버퍼 / 구간별 계수 view / 구간 끝 시간 목록을 만들어 두므로
+        이후에는 구간이 바뀔 때도 numpy 객체를 새로 만들지 않음 (계수를 버퍼에 복사만 함).
+        """
+        if self._eval_pos is None:
+            self._allocate_eval_buffers()
+        # builtin min/max는 호출마다 iterator를 할당하므로 비교로 clamp
+        if t < 0.0:
+            t = 0.0
+        elif t > self._knot_list[-1]:
+            t = self._knot_list[-1]
+        if not self._eval_start <= t < self._eval_end:
+            # 구간 끝 시간 목록 (마지막은 inf)에서 찾으면 clamp / ±1 정수 연산이 필요 없음 (find_segment와 같은 결과)
+            self._load_eval_segment(bisect.bisect_right(self._segment_ends, t))
+
+        u = (t - self._eval_start) / self._eval_duration if self._eval_duration > self.EPS else 1.0
+        self._eval_u[()] = u
+        c3, c2, c1, c0 = self._eval_pos_rows
+        v2, v1, v0 = self._eval_vel_rows
+        # Horner (out= 로 in-place)
+        np.multiply(c3, self._eval_u, out=pose_out)
+        np.add(pose_out, c2, out=pose_out)
+        np.multiply(pose_out, self._eval_u, out=pose_out)
+        np.add(pose_out, c1, out=pose_out)
+        np.multiply(pose_out, self._eval_u, out=pose_out)
+        np.add(pose_out, c0, out=pose_out)
+        np.multiply(v2, self._eval_u, out=vel_out)
+        np.add(vel_out, v1, out=vel_out)
+        np.multiply(vel_out, self._eval_u, out=vel_out)
+        np.add(vel_out, v0, out=vel_out)
+
+    def _allocate_eval_buffers(self):
+        self._eval_pos = np.empty((4, self.dim))
+        self._eval_vel = np.empty((3, self.dim))
+        self._eval_pos_rows = tuple(self._eval_pos)
+        self._eval_vel_rows = tuple(self._eval_vel)
+        # Python float 대신 0-d 배열을 ufunc 인자로 써서 임시 scalar 배열 생성을 피함
+        self._eval_u = np.zeros(())
+        self._durations_list = self.durations.tolist()
+        # pos_coeffs[seg] 인덱싱은 매번 view 객체를 만들므로 구간별 view를 미리 만들어 둠 (구간당 약 200 B)
+        self._pos_coeff_rows = list(self.pos_coeffs)
+        self._vel_coeff_rows = list(self.vel_coeffs)
+        self._segment_ends = self._knot_list[1:-1] + [float("inf")]
+        self._load_eval_segment(0)
+
+    def _load_eval_segment(self, seg: int):
+        np.copyto(self._eval_pos, self._pos_coeff_rows[seg])
+        np.copyto(self._eval_vel, self._vel_coeff_rows[seg])
+        self._eval_start = self._knot_list[seg]
+        self._eval_duration = self._durations_list[seg]
+        # 마지막 구간은 끝점(t == duration)까지 포함
+        self._eval_end = self._segment_ends[seg]
+
+    def evaluate_batch(self, t: np.ndarray, with_acceleration: bool = False) -> tuple:
+        """
+        N개의 시간 [s]을 한 번에 계산 (범위 밖은 양 끝점으로 clamp)
+        Returns:
+            (pose_out, vel_out[, acc_out]) - 각각 (N, dim) 배열
+        """
+        t = np.clip(np.asarray(t, dtype=float).reshape(-1), 0.0, self._knot_list[-1])
+        seg = np.clip(np.searchsorted(self.knot_times, t, side="right") - 1, 0, self.n_segments - 1)
+        D = self.durations[seg]
+        u = np.where(D > self.EPS, (t - self.knot_times[seg]) / np.where(D > self.EPS, D, 1.0), 1.0)[:, None]
+
+        c = self.pos_coeffs[seg]
+        v = self.vel_coeffs[seg]
+        pose_out = ((c[:, 0] * u + c[:, 1]) * u + c[:, 2]) * u + c[:, 3]
+        vel_out = (v[:, 0] * u + v[:, 1]) * u + v[:, 2]
+        if not with_acceleration:
+            return pose_out, vel_out
+        a = self.acc_coeffs[seg]
+        return pose_out, vel_out, a[:, 0] * u + a[:, 1]
+
+    def _normalized_time(self, seg: int, t: float) -> float:
+        seg_dur = self.durations[seg]
+        if seg_dur <= self.EPS:
+            return 1.0
+        return (t - self._knot_list[seg]) / seg_dur
+
+
+class PlaybackClock:
+    """
+    궤적 재생 시간. 구간마다 0으로 리셋하지 않고 전역 경과 시간에서 계산하므로 drift가 없음.
+    speed < 0이면 역재생, seek/scrub은 현재 위치를 바로 옮김.
+    """
+
+    def __init__(self, duration: float, speed: float = 1.0, start_time: float = 0.0):
+        self.duration = duration
+        self._speed = speed
+        # 경과 시간 (Kahan 보상합으로 누적 오차 제거)
+        self._elapsed = 0.0
+        self._elapsed_comp = 0.0
+        # 마지막 seek/speed 변경 시점 기준: time = anchor_time + speed * (elapsed - anchor_elapsed)
+        self._anchor_time = self._clamp(start_time)
+        self._anchor_elapsed = 0.0
+
+    @property
+    def time(self) -> float:
+        return self._clamp(self._anchor_time + self._speed * (self._elapsed - self._anchor_elapsed))
+
+    @property
+    def speed(self) -> float:
+        return self._speed
+
+    @property
+    def finished(self) -> bool:
+        t = self.time
+        return (self._speed > 0 and t >= self.duration) or (self._speed < 0 and t <= 0.0)
+
+    def step(self, dt: float) -> float:
+        """physics dt만큼 전진하고 현재 궤적 시간 반환"""
+        y = dt - self._elapsed_comp
+        elapsed = self._elapsed + y
+        self._elapsed_comp = (elapsed - self._elapsed) - y
+        self._elapsed = elapsed
+        return self.time
+
+    def seek(self, t: float):
+        """궤적 시간 t [s]로 이동"""
+        self._anchor_time = self._clamp(t)
+        self._anchor_elapsed = self._elapsed
+
+    def scrub(self, delta: float):
+        """현재 위치에서 delta [s]만큼 이동"""
+        self.seek(self.time + delta)
+
+    def set_speed(self, speed: float):
+        """재생 속도 배율 (음수면 역재생)"""
+        self.seek(self.time)
+        self._speed = speed
+
+    def reverse(self):
+        self.set_speed(-self._speed)
+
+    def _clamp(self, t: float) -> float:
+        # 매 physics step 호출되므로 builtin min/max(iterator 할당) 대신 비교
+        if t < 0.0:
+            return 0.0
+        if t > self.duration:
+            return self.duration
+        return t
@@ -0,0 +1,82 @@
+import numpy as np
+from .via_point_manager import IRIMCubicHermiteSpline
+
+
+class PlaybackTable:
+    """P2P 궤적 전체를 physics dt 간격으로 미리 샘플링한 position/velocity 테이블"""
+
+    def __init__(self, positions: np.ndarray, velocities: np.ndarray, dt: float, times: np.ndarray = None):
+        """
+        Args:
+            positions: (M, n_dof) 매 step 적용할 전체 DOF 위치
+            velocities: (M, n_joints) 매 step 적용할 조인트 속도
+            dt: 샘플링에 사용한 physics dt [s]
+            times: (M,) 각 행의 via point 궤적 시간 [s] (구간 시작 시각 + 구간 내 시간)
+        """
+        self.positions = positions
+        self.velocities = velocities
+        self.dt = dt
+        self.times = times
+
+    def __len__(self) -> int:
+        return self.positions.shape[0]
+
+    @property
+    def duration(self) -> float:
+        return len(self) * self.dt
+
+
+def compile_playback_table(start_positions: np.ndarray, p2p_data: list, dt: float, n_joints: int) -> PlaybackTable:
+    """
+    live playback(playback_step)과 같은 구간별 rest-to-rest 스플라인을 한 번에 샘플링.
+    live 모드는 구간 시작 시 실제 조인트 위치를 읽지만, 여기서는 이전 구간의 목표 위치를 시작점으로 사용.
+
+    Args:
+        start_positions: (n_dof,) 재생 시작 시점의 전체 DOF 위치
+        p2p_data: [(duration, target_pos), ...] - target_pos는 (n_joints,) [rad]
+        dt: physics dt [s]
+        n_joints: 스플라인으로 보간할 앞쪽 조인트 개수
+    """
+    # 1) 구간별 tick 시간 계산 (live와 동일하게 segment_time += dt 누적, duration에서 clamp)
+    segment_times = []
+    for duration, _ in p2p_data:
+        n_ticks = max(int(np.ceil(duration / dt)), 1) + 1
+        ticks = np.cumsum(np.full(n_ticks, dt))
+        n_ticks = int(np.searchsorted(ticks, duration, side="left")) + 1
+        segment_times.append(np.minimum(ticks[:min(n_ticks, len(ticks))], duration))
+
+    # 2) 테이블 한 번에 할당
+    n_rows = sum(len(t) for t in segment_times)
+    positions = np.empty((n_rows, len(start_positions)))
+    positions[:] = start_positions
+    velocities = np.zeros((n_rows, n_joints))
+    segment_starts = np.concatenate(([0.0], np.cumsum([duration for duration, _ in p2p_data])))
+    row_times = np.concatenate([start + t for start, t in zip(segment_starts, segment_times)]) if n_rows else np.zeros(0)
+
+    # 3) 구간별 배치 보간
+    current_pos = np.asarray(start_positions[:n_joints], dtype=float)
+    row = 0
+    for (duration, target_pos), times in zip(p2p_data, segment_times):
+        spline = IRIMCubicHermiteSpline(n_joints)
+        spline.add_back_via_point(0.0, current_pos)
+        spline.add_back_via_point(0.0, current_pos)
+        spline.add_back_via_point(duration, target_pos)
+        spline.add_back_via_point(0.0, target_pos)
+
+        rows = slice(row, row + len(times))
+        status, pose_out, vel_out = spline.get_targets(times * 1000.0)
+        if pose_out is None:
+            # 보간 불가 구간 (duration≈0): live처럼 명령 없이 이전 목표 유지
+            positions[rows, :n_joints] = positions[row - 1, :n_joints] if row > 0 else current_pos
+            velocities[rows] = 0.0
+        else:
+            positions[rows, :n_joints] = pose_out
+            velocities[rows] = vel_out
+            # ms 변환 오차로 duration을 넘은 tick (NaN): live처럼 명령 없이 직전 목표 유지
+            for r in row + np.flatnonzero(status != 0):
+                positions[r, :n_joints] = positions[r - 1, :n_joints] if r > 0 else current_pos
+                velocities[r] = velocities[r - 1] if r > 0 else 0.0
+            current_pos = np.asarray(target_pos, dtype=float)
+        row += len(times)
+
+    return PlaybackTable(positions, velocities, dt, row_times)
@@ -0,0 +1,116 @@
+import os
+import threading
+import numpy as np
+from .piecewise_spline import PiecewiseHermiteSpline
+from .trajectory_io import load_via_points
+from .via_point_manager import hermite_tangents
+
+# duration 분모 체크용 (PiecewiseHermiteSpline 기본 eps와 같음)
+_DURATION_EPS = 1e-6
+
+
+class Playlist:
+    """
+    여러 via point 그룹을 이어서 재생하는 큐.
+    item k (k번째로 재생할 그룹)의 스플라인은 k-1이 재생되는 동안 worker thread에서 미리 만들고,
+    그룹 경계의 탄젠트는 앞 그룹 마지막 구간과 다음 그룹 첫 행(접근 구간)의 기울기로 계산해 멈추지 않고 이어 감.
+    """
+
+    def __init__(self, csv_paths: list, loader, stop_at_via_points: bool = False, loop: bool = False):
+        """
+        Args:
+            csv_paths: 재생 순서대로의 그룹 CSV 경로
+            loader: TrajectoryLoader (로드/스플라인 생성을 실행할 worker)
+            stop_at_via_points: True면 그룹 내부와 경계 모두 rest-to-rest
+            loop: True면 마지막 그룹 다음에 처음 그룹으로 반복
+        """
+        if not csv_paths:
+            raise ValueError("playlist needs at least one group")
+        self.csv_paths = list(csv_paths)
+        self.names = [os.path.basename(os.path.dirname(path)) for path in self.csv_paths]
+        self.stop_at_via_points = stop_at_via_points
+        self.loop = loop
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._compiled = {}  # item 번호 -> Future[PiecewiseHermiteSpline]
+
+    def group_index(self, item: int):
+        """item 번호 -> 그룹 인덱스 (끝났으면 None)"""
+        if self.loop:
+            return item % len(self.csv_paths)
+        return item if item < len(self.csv_paths) else None
+
+    def name(self, item: int) -> str:
+        return self.names[self.group_index(item)]
+
+    def schedule(self, item: int, start_positions: np.ndarray = None):
+        """
+        item의 스플라인 생성을 worker에 예약 (이미 예약됐으면 무시).
+        item 0은 start_positions에서 출발, 그 외는 item-1이 먼저 예약돼 있어야 함.
+        Returns:
+            Future (끝난 playlist면 None)
+        """
+        if self.group_index(item) is None:
+            return None
+        with self._lock:
+            future = self._compiled.get(item)
+            if future is not None:
+                return future
+            # 로드를 먼저 큐에 넣어야 compile이 worker를 모두 차지한 채 로드를 기다리지 않음
+            for group in (self.group_index(item), self.group_index(item + 1)):
+                if group is not None:
+                    self._loader.submit(self.csv_paths[group])
+            future = self._loader.run(self._compile, item, start_positions)
+            self._compiled[item] = future
+            # 재생이 끝난 item은 버림
+            self._compiled.pop(item - 2, None)
+            return future
+
+    def take(self, item: int):
+        """
+        item 스플라인 반환. physics callback에서 부르므로 기다리지 않음 (생성 실패는 예외로 전달).
+        Returns:
+            (PiecewiseHermiteSpline 또는 None, 준비 여부) - 끝난 playlist면 (None, True), 아직 생성 중이면 (None, False)
+        """
+        future = self.schedule(item)
+        if future is None:
+            return None, True
+        if not future.done():
+            return None, False
+        return future.result(), True
+
+    def _load(self, group: int):
+        # worker 안에서 다른 worker 작업을 기다리면 worker가 모두 막힐 수 있으므로 직접 로드 (prefetch된 경우 캐시)
+        return load_via_points(self.csv_paths[group])
+
+    def _compile(self, item: int, start_positions: np.ndarray) -> PiecewiseHermiteSpline:
+        if item > 0:
+            previous = self._compiled[item - 1].result()
+            start_positions, start_tangent = previous.positions[-1], previous.end_tangent
+        else:
+            start_positions = np.asarray(start_positions, dtype=float)
+            start_tangent = None
+        dim = start_positions.shape[0]
+
+        trajectory = self._load(self.group_index(item))
+        if len(trajectory) == 0:
+            raise ValueError(f"{self.name(item)}: 유효한 데이터가 없습니다.")
+        positions = np.empty((len(trajectory) + 1, dim))
+        positions[0] = start_positions
+        positions[1:] = trajectory.positions[:, :dim]
+        durations = np.asarray(trajectory.durations, dtype=float)
+
+        # 다음 그룹 첫 행(이 그룹 끝 -> 다음 그룹 첫 via point)까지 보고 경계 탄젠트 결정
+        end_tangent = None
+        next_group = self.group_index(item + 1)
+        if not self.stop_at_via_points and next_group is not None:
+            next_trajectory = self._load(next_group)
+            if len(next_trajectory) > 0 and next_trajectory.durations[0] > _DURATION_EPS:
+                next_slope = (next_trajectory.positions[0, :dim] - positions[-1]) / next_trajectory.durations[0]
+                last_duration = durations[-1]
+                last_slope = ((positions[-1] - positions[-2]) / last_duration
+                              if last_duration > _DURATION_EPS else np.zeros(dim))
+                end_tangent = hermite_tangents(last_slope, next_slope)
+
+        return PiecewiseHermiteSpline(durations, positions, self.stop_at_via_points,
+                                      start_tangent=start_tangent, end_tangent=end_tangent)
@@ -0,0 +1,110 @@
+import os
+import numpy as np
+from .piecewise_spline import PiecewiseHermiteSpline
+from .trajectory_io import VIA_POINT_CSV_NAME, load_via_points, write_via_point_csv
+from .trajectory_validator import JointLimits
+
+# 저장 시 첫 via point까지의 duration (재생 시작 위치를 알 수 없으므로 고정값)
+DEFAULT_APPROACH_DURATION = 3.0
+# 움직임이 거의 없는 구간의 최소 duration [s]
+DEFAULT_MIN_DURATION = 0.1
+# 구간 내부 peak 탐색용 u 샘플 수
+_PEAK_SAMPLES = 33
+
+
+def minimum_segment_durations(positions: np.ndarray, limits: JointLimits = None, margin: float = 0.0,
+                              stop_at_via_points: bool = True, min_duration: float = DEFAULT_MIN_DURATION,
+                              max_iterations: int = 50) -> np.ndarray:
+    """
+    모든 구간의 최소 duration을 한 번에 계산 (Hermite 프로파일이 속도/가속도 limit 안에 들도록)
+    Args:
+        positions: (S+1, dim) knot 위치 [rad]
+        limits: 조인트 limit (기본: LIMS_EX.urdf)
+        margin: 안전 여유 (0.1 -> limit의 90%까지만 사용)
+        stop_at_via_points: True면 rest-to-rest (live/compiled), False면 continuous 탄젠트 규칙
+    Returns:
+        (S,) 구간별 duration [s] (ms 단위 올림)
+    """
+    if limits is None:
+        limits = JointLimits.from_urdf()
+    positions = np.asarray(positions, dtype=float)
+    dim = positions.shape[1]
+    v_max = limits.velocity[:dim] * (1.0 - margin)
+    a_max = limits.acceleration[:dim] * (1.0 - margin)
+
+    # 1) rest-to-rest 해석해: peak vel = 1.5|Δ|/T, peak acc = 6|Δ|/T²
+    delta = np.abs(np.diff(positions, axis=0))
+    durations = np.max(np.maximum(1.5 * delta / v_max, np.sqrt(6.0 * delta / a_max)), axis=1)
+    durations = np.maximum(durations, min_duration)
+
+    # 2) continuous 탄젠트는 이웃 구간 duration에 의존 -> 초과 구간만 늘리며 반복
+    if not stop_at_via_points:
+        u = np.linspace(0.0, 1.0, _PEAK_SAMPLES)[None, :, None]
+        for _ in range(max_iterations):
+            spline = PiecewiseHermiteSpline(durations, positions)
+            v = spline.vel_coeffs[:, None]  # (S, 1, 3, dim)
+            a = spline.acc_coeffs[:, None]
+            vel = (v[:, :, 0] * u + v[:, :, 1]) * u + v[:, :, 2]
+            acc = a[:, :, 0] * u + a[:, :, 1]
+            # duration을 k배 하면 속도는 1/k, 가속도는 1/k²
+            ratio = np.maximum(
+                np.max(np.abs(vel) / v_max, axis=(1, 2)),
+                np.sqrt(np.max(np.abs(acc) / a_max, axis=(1, 2))),
+            )
+            if np.all(ratio <= 1.0 + 1e-6):
+                break
+            durations = np.where(ratio > 1.0, durations * ratio * 1.01, durations)
+
+    return np.ceil(durations * 1000.0 - 1e-9) / 1000.0
+
+
+def group_durations(positions: np.ndarray, durations: np.ndarray, margin: float = 0.0, approach_duration: float = None,
+                    stop_at_via_points: bool = True, limits: JointLimits = None) -> np.ndarray:
+    """
+    그룹의 행별 duration (Save / Retime 공통 규칙).
+    첫 행(재생 시작 위치 -> 첫 via point)은 approach_duration (None이면 durations[0] 유지), 나머지는 최소 duration.
+    Args:
+        positions: (N, dim) via point 위치 [rad] (CSV에 저장되는 값)
+        durations: (N,) 기존 duration [s]
+    Returns:
+        새 durations (N,)
+    """
+    durations = np.array(durations, dtype=float)
+    if len(durations) == 0:
+        return durations
+    if approach_duration is not None:
+        durations[0] = approach_duration
+    if len(durations) > 1:
+        durations[1:] = minimum_segment_durations(positions, limits, margin, stop_at_via_points)
+    return durations
+
+
+def retime_group(csv_path: str, margin: float = 0.0, approach_duration: float = None,
+                 stop_at_via_points: bool = True, limits: JointLimits = None) -> np.ndarray:
+    """
+    저장된 그룹의 duration을 다시 계산해 CSV/바이너리를 덮어씀 (규칙은 group_durations).
+    Returns:
+        새 durations (N,)
+    """
+    trajectory = load_via_points(csv_path)
+    positions = np.array(trajectory.positions, dtype=float)
+    durations = group_durations(positions, trajectory.durations, margin, approach_duration, stop_at_via_points, limits)
+    if len(durations) == 0:
+        return durations
+
+    write_via_point_csv(csv_path, durations, np.degrees(positions), trajectory.joint_names)
+    return durations
+
+
+def retime_library(traj_dir: str, margin: float = 0.0, stop_at_via_points: bool = True) -> dict:
+    """traj_dir 아래 모든 *_group을 retime. Returns: {group 폴더 이름: (이전 총 시간, 새 총 시간)}"""
+    limits = JointLimits.from_urdf()
+    result = {}
+    for entry in sorted(os.scandir(traj_dir), key=lambda e: e.name):
+        csv_path = os.path.join(entry.path, VIA_POINT_CSV_NAME)
+        if not entry.is_dir() or not os.path.exists(csv_path):
+            continue
+        before = load_via_points(csv_path).total_duration
+        after = float(np.sum(retime_group(csv_path, margin, None, stop_at_via_points, limits)))
+        result[entry.name] = (before, after)
+    return result
@@ -0,0 +1,202 @@
+import os
+import csv
+import threading
+import numpy as np
+
+VIA_POINT_CSV_NAME = "lims_ex_viapoints.csv"
+# CSV에 저장하는 위치 소수점 자리수 [deg]
+CSV_DECIMALS = 3
+
+# 바이너리 포맷 버전 (파일 이름에 포함: lims_ex_viapoints.v2.npy)
+# 구조: duration + 조인트 이름 필드를 가진 float64 structured array, positions는 rad
+# 첫 record는 header: 원본 CSV의 (st_mtime_ns, st_size)를 int64로 저장 (같을 때만 바이너리 사용)
+BINARY_FORMAT_VERSION = 2
+
+# 로드 캐시: abs path -> (mtime_ns, size, ViaPointTrajectory)
+# TrajectoryLoader worker thread와 main thread가 함께 접근하므로 _cache_lock으로 보호
+_trajectory_cache = {}
+_cache_lock = threading.Lock()
+
+
+class ViaPointTrajectory:
+    """via point 그룹 데이터 (duration [s], positions [rad], 조인트 이름)"""
+
+    def __init__(self, durations: np.ndarray, positions: np.ndarray, joint_names: list):
+        """
+        Args:
+            durations: (N,) 각 via point까지의 이동 시간 [s]
+            positions: (N, dim) via point 위치 [rad]
+            joint_names: positions 열 순서의 조인트 이름
+        """
+        self.durations = durations
+        self.positions = positions
+        self.joint_names = list(joint_names)
+        self._p2p_data = None
+
+    def __len__(self) -> int:
+        return self.durations.shape[0]
+
+    @property
+    def total_duration(self) -> float:
+        return float(np.sum(self.durations))
+
+    @property
+    def p2p_data(self) -> list:
+        """P2PStudio 재생용 [(duration, positions), ...] (한 번만 생성)"""
+        if self._p2p_data is None:
+            self._p2p_data = [(float(d), p) for d, p in zip(self.durations, self.positions)]
+        return self._p2p_data
+
+
+def binary_path_for(csv_path: str) -> str:
+    """CSV 옆에 저장되는 바이너리 파일 경로"""
+    return os.path.splitext(csv_path)[0] + f".v{BINARY_FORMAT_VERSION}.npy"
+
+
+def read_via_point_csv(csv_path: str) -> ViaPointTrajectory:
+    """CSV (duration + degree) 파싱. 헤더 다음 행들을 한 번에 변환"""
+    with open(csv_path, "r") as f:
+        header = next(csv.reader([f.readline()]))
+        # 헤더만 있는 그룹은 loadtxt 없이 0행 (빈 입력 경고 방지)
+        start = f.tell()
+        has_rows = any(line.strip() for line in f)
+        f.seek(start)
+        rows = np.loadtxt(f, delimiter=",", ndmin=2) if has_rows else np.zeros((0, len(header)))
+    positions = rows[:, 1:] * np.pi / 180.0  # deg2rad
+    return ViaPointTrajectory(np.ascontiguousarray(rows[:, 0]), positions, header[1:])
+
+
+def write_via_point_csv(csv_path: str, durations, positions_deg, joint_names: list):
+    """
+    CSV 저장 (값은 degree, 소수점 3자리) 후 같은 값으로 바이너리 파일도 갱신
+    Args:
+        durations: (N,) [s]
+        positions_deg: (N, dim) [deg]
+    """
+    durations = np.asarray(durations, dtype=float).reshape(-1)
+    positions_deg = np.asarray(positions_deg, dtype=float).reshape(len(durations), len(joint_names))
+    positions_deg = np.round(positions_deg, CSV_DECIMALS)
+
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+
+        # 헤더 작성: duration + 실제 조인트 이름들
+        writer.writerow(["duration"] + list(joint_names))
+        for duration, row in zip(durations.tolist(), positions_deg.tolist()):
+            writer.writerow([duration] + row)
+
+    trajectory = ViaPointTrajectory(durations, positions_deg * np.pi / 180.0, joint_names)
+    write_via_point_binary(binary_path_for(csv_path), trajectory, os.stat(csv_path))
+    return trajectory
+
+
+def write_via_point_binary(path: str, trajectory: ViaPointTrajectory, source_stat: os.stat_result):
+    """
+    structured .npy로 저장 (임시 파일에 쓴 뒤 교체)
+    Args:
+        source_stat: 이 데이터를 읽은 / 쓴 CSV의 stat (header에 기록)
+    """
+    if not trajectory.joint_names:
+        # header (int64 2개)를 담을 열이 없음 -> CSV만 사용
+        return
+    dtype = np.dtype([("duration", "<f8")] + [(name, "<f8") for name in trajectory.joint_names])
+    records = np.empty(len(trajectory) + 1, dtype=dtype)
+    header = records[:1].view(np.int64)
+    header[:] = 0
+    header[0], header[1] = source_stat.st_mtime_ns, source_stat.st_size
+    # 열 수를 명시 (0행 그룹은 -1로 추론할 수 없음)
+    table = records[1:].view(np.float64).reshape(len(trajectory), len(dtype))
+    table[:, 0] = trajectory.durations
+    table[:, 1:] = trajectory.positions
+
+    # 여러 thread가 같은 파일을 동시에 쓸 수 있으므로 임시 파일 이름은 thread별로
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, records)
+    # 캐시가 기존 파일을 memory-map으로 잡고 있으면 Windows에서 교체가 실패하므로 캐시 항목을 먼저 버림 (마지막 참조면 unmap)
+    _drop_cached_binary(path)
+    try:
+        os.replace(tmp_path, path)
+    except PermissionError:
+        # 다른 곳에서 아직 map 중: 기존 바이너리는 header가 새 CSV와 달라 무시되므로 다음 로드에서 CSV를 다시 읽음
+        os.remove(tmp_path)
+        print(f"⚠️ 사용 중인 바이너리 파일은 교체하지 않음: {path}")
+
+
+def _drop_cached_binary(path: str):
+    """path 바이너리를 읽어 둔 캐시 항목 제거"""
+    path = os.path.abspath(path)
+    with _cache_lock:
+        for key in [key for key in _trajectory_cache if binary_path_for(key) == path]:
+            del _trajectory_cache[key]
+
+
+def read_via_point_binary(path: str, source_stat: os.stat_result = None):
+    """
+    바이너리 파일을 memory-map으로 로드 (복사 없음)
+    Returns:
+        ViaPointTrajectory, source_stat을 주었는데 header의 CSV (mtime, size)와 다르면 None
+    """
+    records = np.load(path, mmap_mode="r")
+    if source_stat is not None:
+        header = records[:1].view(np.int64)
+        if header.shape[0] < 2 or (int(header[0]), int(header[1])) != (source_stat.st_mtime_ns, source_stat.st_size):
+            return None
+    table = records[1:].view(np.float64).reshape(len(records) - 1, len(records.dtype))
+    return ViaPointTrajectory(table[:, 0], table[:, 1:], records.dtype.names[1:])
+
+
+def _source_stat(csv_path: str):
+    binary_path = binary_path_for(csv_path)
+    source_path = csv_path if os.path.exists(csv_path) else binary_path
+    return source_path, os.stat(source_path)
+
+
+def cached_via_points(csv_path: str):
+    """캐시에 최신 데이터가 있으면 반환 (파일 stat만 수행), 없으면 None"""
+    try:
+        _, stat = _source_stat(csv_path)
+    except OSError:
+        return None
+    with _cache_lock:
+        cached = _trajectory_cache.get(os.path.abspath(csv_path))
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    return None
+
+
+def load_via_points(csv_path: str) -> ViaPointTrajectory:
+    """
+    via point 그룹 로드. (path, mtime) 캐시 -> 같은 CSV (mtime, size)로 만든 바이너리 -> CSV 순서로 시도하고,
+    CSV를 파싱한 경우 바이너리 파일을 새로 써둠.
+    """
+    binary_path = binary_path_for(csv_path)
+    source_path, stat = _source_stat(csv_path)
+
+    key = os.path.abspath(csv_path)
+    with _cache_lock:
+        cached = _trajectory_cache.get(key)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    if source_path == binary_path:
+        trajectory = read_via_point_binary(binary_path)
+    elif os.path.exists(binary_path):
+        trajectory = read_via_point_binary(binary_path, stat)
+    else:
+        trajectory = None
+    if trajectory is None:
+        trajectory = read_via_point_csv(csv_path)
+        try:
+            write_via_point_binary(binary_path, trajectory, stat)
+        except OSError as e:
+            print(f"⚠️ 바이너리 저장 실패: {e}")
+
+    with _cache_lock:
+        _trajectory_cache[key] = (stat.st_mtime_ns, stat.st_size, trajectory)
+    return trajectory
+
+
+def clear_trajectory_cache():
+    with _cache_lock:
+        _trajectory_cache.clear()
@@ -0,0 +1,149 @@
+import os
+import json
+import hashlib
+import numpy as np
+from .trajectory_io import VIA_POINT_CSV_NAME, binary_path_for, load_via_points
+
+LIBRARY_INDEX_NAME = ".library_index.json"
+LIBRARY_INDEX_VERSION = 1
+GROUP_SUFFIX = "_group"
+
+
+class TrajectoryLibrary:
+    """
+    TRAJECTORY_DIR 아래 *_group 폴더들의 메타데이터 인덱스.
+    요약 정보는 디스크(.library_index.json)에 캐시되고, 재스캔 시 파일 mtime/size가 바뀐 그룹만 다시 읽음.
+    """
+
+    def __init__(self, traj_dir: str):
+        self._traj_dir = traj_dir
+        self._index_path = os.path.join(traj_dir, LIBRARY_INDEX_NAME)
+        self.entries = {}  # group name (suffix 제외) -> metadata dict
+        self._load_index()
+
+    def scan(self) -> dict:
+        """그룹 폴더를 스캔하고 변경된 그룹만 요약을 갱신. Returns: entries"""
+        if not os.path.isdir(self._traj_dir):
+            return self.entries
+
+        changed = False
+        seen = set()
+        for dir_entry in os.scandir(self._traj_dir):
+            if not dir_entry.is_dir() or not dir_entry.name.endswith(GROUP_SUFFIX):
+                continue
+            name = dir_entry.name[:-len(GROUP_SUFFIX)]
+            source_path = self._source_path(dir_entry.path)
+            if source_path is None:
+                continue
+            seen.add(name)
+
+            stat = os.stat(source_path)
+            entry = self.entries.get(name)
+            if entry is not None and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                continue
+
+            try:
+                self.entries[name] = self._summarize(dir_entry.path, source_path, stat)
+                changed = True
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 라이브러리 스캔 실패 ({dir_entry.name}): {e}")
+
+        for name in set(self.entries) - seen:
+            del self.entries[name]
+            changed = True
+
+        if changed:
+            self._save_index()
+        return self.entries
+
+    def query(self, name: str = None, min_duration: float = None, max_duration: float = None,
+              joint_ranges: dict = None) -> list:
+        """
+        조건에 맞는 그룹 이름 목록 (이름순)
+        Args:
+            name: 그룹 이름에 포함된 문자열
+            min_duration, max_duration: 전체 재생 시간 범위 [s]
+            joint_ranges: {joint_name: (lower, upper)} [rad] - 궤적의 via point가 모두 이 범위 안에 있는 그룹만
+        """
+        result = []
+        for group_name, entry in self.entries.items():
+            if name is not None and name not in group_name:
+                continue
+            if min_duration is not None and entry["total_duration"] < min_duration:
+                continue
+            if max_duration is not None and entry["total_duration"] > max_duration:
+                continue
+            if joint_ranges and not self._within_ranges(entry, joint_ranges):
+                continue
+            result.append(group_name)
+        return sorted(result)
+
+    def print_summary(self):
+        print(f"📚 Trajectory Library: {len(self.entries)} groups ({self._traj_dir})")
+        for group_name in sorted(self.entries):
+            entry = self.entries[group_name]
+            print(f"  {group_name}: {entry['n_points']} points, {entry['total_duration']:.2f} s, "
+                  f"hash {entry['content_hash'][:8]}")
+
+    @staticmethod
+    def _source_path(group_path: str):
+        csv_path = os.path.join(group_path, VIA_POINT_CSV_NAME)
+        if os.path.exists(csv_path):
+            return csv_path
+        binary_path = binary_path_for(csv_path)
+        if os.path.exists(binary_path):
+            return binary_path
+        return None
+
+    @staticmethod
+    def _summarize(group_path: str, source_path: str, stat) -> dict:
+        trajectory = load_via_points(os.path.join(group_path, VIA_POINT_CSV_NAME))
+        with open(source_path, "rb") as f:
+            content_hash = hashlib.sha1(f.read()).hexdigest()
+
+        if len(trajectory) > 0:
+            joint_min = np.min(trajectory.positions, axis=0).tolist()
+            joint_max = np.max(trajectory.positions, axis=0).tolist()
+        else:
+            joint_min = joint_max = []
+        return {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "n_points": len(trajectory),
+            "total_duration": trajectory.total_duration,
+            "joint_names": trajectory.joint_names,
+            "joint_min": joint_min,
+            "joint_max": joint_max,
+            "content_hash": content_hash,
+        }
+
+    @staticmethod
+    def _within_ranges(entry: dict, joint_ranges: dict) -> bool:
+        for joint_name, (lower, upper) in joint_ranges.items():
+            if joint_name not in entry["joint_names"]:
+                return False
+            idx = entry["joint_names"].index(joint_name)
+            if entry["joint_min"][idx] < lower or entry["joint_max"][idx] > upper:
+                return False
+        return True
+
+    def _load_index(self):
+        if not os.path.exists(self._index_path):
+            return
+        try:
+            with open(self._index_path, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 라이브러리 인덱스 로드 실패: {e}")
+            return
+        if index.get("version") == LIBRARY_INDEX_VERSION:
+            self.entries = index.get("groups", {})
+
+    def _save_index(self):
+        tmp_path = self._index_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"version": LIBRARY_INDEX_VERSION, "groups": self.entries}, f)
+            os.replace(tmp_path, self._index_path)
+        except OSError as e:
+            print(f"⚠️ 라이브러리 인덱스 저장 실패: {e}")
@@ -0,0 +1,75 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from .trajectory_io import ViaPointTrajectory, load_via_points
+
+# 로드 worker 수 (파일 I/O + CSV 파싱, numpy가 GIL을 놓는 구간이 대부분)
+DEFAULT_LOADER_WORKERS = 2
+
+
+def _report_error(future: Future):
+    if not future.cancelled() and future.exception() is not None:
+        print(f"❌ Background task error: {future.exception()}")
+
+
+class TrajectoryLoader:
+    """
+    via point 그룹을 worker thread에서 로드 (UI / update loop를 막지 않도록).
+    같은 경로를 이미 로드 중이면 그 Future를 그대로 돌려주므로, prefetch 후 Play는 로드를 기다리기만 함.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_LOADER_WORKERS):
+        self._max_workers = max_workers
+        self._executor = None  # 첫 submit에서 생성 (shutdown 후에도 다시 생성)
+        self._lock = threading.Lock()
+        self._futures = {}  # abs path -> 로드 중인 Future
+
+    def submit(self, csv_path: str) -> Future:
+        """csv_path 로드를 시작(또는 진행 중인 로드에 합류). Returns: ViaPointTrajectory Future"""
+        key = os.path.abspath(csv_path)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self._max_workers, thread_name_prefix="trajectory_loader")
+            future = self._executor.submit(self._load, csv_path)
+            self._futures[key] = future
+        # 완료된 Future는 지움 (이후 파일이 바뀌었을 수 있으므로 다음 submit은 다시 로드, 최신이면 load_via_points 캐시가 처리)
+        # 이미 끝났으면 callback이 바로 호출되므로 lock 밖에서 등록
+        future.add_done_callback(lambda f: self._forget(key, f))
+        return future
+
+    def run(self, fn, *args) -> Future:
+        """로드 외의 무거운 작업 (검증 등)을 같은 worker thread에서 실행"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self._max_workers, thread_name_prefix="trajectory_loader")
+            future = self._executor.submit(fn, *args)
+        # 기다리는 쪽이 없으므로 예외는 여기서 출력
+        future.add_done_callback(_report_error)
+        return future
+
+    def prefetch(self, csv_paths: list) -> list:
+        """재생할 가능성이 높은 그룹을 미리 로드. Returns: [Future, ...]"""
+        return [self.submit(csv_path) for csv_path in csv_paths if os.path.exists(csv_path)]
+
+    def shutdown(self, wait: bool = False):
+        """대기 중인 로드를 취소하고 worker thread 종료 (다음 submit에서 다시 시작). wait면 실행 중인 작업이 끝날 때까지 대기"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._futures.clear()
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _forget(self, key: str, future: Future):
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+    @staticmethod
+    def _load(csv_path: str) -> ViaPointTrajectory:
+        trajectory = load_via_points(csv_path)
+        # 재생 시작 시 main thread에서 하지 않도록 p2p_data 리스트도 여기서 생성
+        trajectory.p2p_data
+        return trajectory
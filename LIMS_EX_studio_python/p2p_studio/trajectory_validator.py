@@ -0,0 +1,125 @@
+import numpy as np
+from .piecewise_spline import PiecewiseHermiteSpline
+from ..ik_solver.urdf_kinematics import parse_urdf
+from ..global_variables import LIMS_EX_URDF_PATH, LIMS_EX_JOINT_NAMES, LIMS_EX_MAX_JOINT_ACCELERATION
+
+
+class JointLimits:
+    """조인트별 위치/속도/가속도 limit 배열"""
+
+    def __init__(self, joint_names: list, lower: np.ndarray, upper: np.ndarray, velocity: np.ndarray, acceleration: np.ndarray):
+        self.joint_names = list(joint_names)
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        self.velocity = np.asarray(velocity, dtype=float)
+        self.acceleration = np.asarray(acceleration, dtype=float)
+
+    @classmethod
+    def from_urdf(cls, urdf_path: str = LIMS_EX_URDF_PATH, joint_names: list = None,
+                  acceleration: float = LIMS_EX_MAX_JOINT_ACCELERATION) -> "JointLimits":
+        """URDF <limit>에서 읽기 (값이 없으면 무제한). URDF에 없는 가속도 limit은 acceleration 사용"""
+        if joint_names is None:
+            joint_names = LIMS_EX_JOINT_NAMES
+        _, joints = parse_urdf(urdf_path)
+        by_name = {joint.name: joint for joint in joints}
+
+        def _value(joint, attr, default):
+            value = getattr(joint, attr)
+            return default if value is None else value
+
+        selected = [by_name[name] for name in joint_names]
+        return cls(
+            joint_names,
+            [_value(j, "lower", -np.inf) for j in selected],
+            [_value(j, "upper", np.inf) for j in selected],
+            [_value(j, "velocity", np.inf) for j in selected],
+            np.full(len(selected), acceleration),
+        )
+
+
+class ValidationReport:
+    """궤적 검증 결과 (peak ratio > 1 이면 limit 초과)"""
+
+    def __init__(self, joint_names, position_ratio, velocity_ratio, acceleration_ratio,
+                 first_violation_time=None, first_violation_joint=None, first_violation_kind=None):
+        self.joint_names = list(joint_names)
+        self.position_ratio = position_ratio
+        self.velocity_ratio = velocity_ratio
+        self.acceleration_ratio = acceleration_ratio
+        self.first_violation_time = first_violation_time
+        self.first_violation_joint = first_violation_joint
+        self.first_violation_kind = first_violation_kind
+
+    @property
+    def ok(self) -> bool:
+        return self.first_violation_time is None
+
+    def summary(self) -> str:
+        if self.ok:
+            return (f"✅ 궤적 검증 통과 (peak vel {np.max(self.velocity_ratio):.0%}, "
+                    f"acc {np.max(self.acceleration_ratio):.0%} of limit)")
+        lines = [f"⚠️ 궤적 limit 초과: t={self.first_violation_time:.3f}s "
+                 f"{self.first_violation_joint} {self.first_violation_kind}"]
+        for i, name in enumerate(self.joint_names):
+            if max(self.position_ratio[i], self.velocity_ratio[i], self.acceleration_ratio[i]) > 1.0:
+                lines.append(f"   {name}: pos {self.position_ratio[i]:.2f}, vel {self.velocity_ratio[i]:.2f}, "
+                             f"acc {self.acceleration_ratio[i]:.2f}")
+        return "\n".join(lines)
+
+
+class TrajectoryValidator:
+    """궤적을 촘촘히 샘플링해 URDF limit을 벡터 연산으로 한 번에 검사"""
+
+    # 한 번에 평가하는 최대 샘플 수 (메모리 상한)
+    CHUNK_SIZE = 100000
+
+    def __init__(self, limits: JointLimits = None, sample_dt: float = 0.005):
+        """
+        Args:
+            limits: 조인트 limit (기본: LIMS_EX.urdf)
+            sample_dt: 샘플링 간격 [s]
+        """
+        self.limits = JointLimits.from_urdf() if limits is None else limits
+        self.sample_dt = sample_dt
+
+    def validate(self, trajectory: PiecewiseHermiteSpline) -> ValidationReport:
+        limits = self.limits
+        n_joints = len(limits.joint_names)
+        center = 0.5 * (limits.upper + limits.lower)
+        half_range = 0.5 * (limits.upper - limits.lower)
+
+        # 균일 샘플 + knot 시간 (구간 경계 값 포함)
+        times = np.union1d(np.arange(0.0, trajectory.duration, self.sample_dt), trajectory.knot_times)
+
+        peaks = np.zeros((3, n_joints))
+        first = None
+        for start in range(0, len(times), self.CHUNK_SIZE):
+            t = times[start:start + self.CHUNK_SIZE]
+            pos, vel, acc = trajectory.evaluate_batch(t, with_acceleration=True)
+            # (3, N, joints) 비율
+            ratios = np.stack((
+                np.abs(pos[:, :n_joints] - center) / half_range,
+                np.abs(vel[:, :n_joints]) / limits.velocity,
+                np.abs(acc[:, :n_joints]) / limits.acceleration,
+            ))
+            np.maximum(peaks, ratios.max(axis=1), out=peaks)
+
+            if first is None:
+                violated = ratios > 1.0 + 1e-9
+                hits = np.flatnonzero(violated.any(axis=(0, 2)))
+                if hits.size:
+                    sample = hits[0]
+                    kind, joint = np.argwhere(violated[:, sample])[0]
+                    first = (float(t[sample]), limits.joint_names[joint], ("position", "velocity", "acceleration")[kind])
+
+        if first is None:
+            first = (None, None, None)
+        return ValidationReport(limits.joint_names, peaks[0], peaks[1], peaks[2], *first)
+
+    def validate_via_points(self, start_positions: np.ndarray, p2p_data: list,
+                            stop_at_via_points: bool = True) -> ValidationReport:
+        """시작 위치 + [(duration, positions), ...]로 만든 재생 궤적 검증"""
+        trajectory = PiecewiseHermiteSpline.from_via_points(
+            start_positions, p2p_data, stop_at_via_points=stop_at_via_points
+        )
+        return self.validate(trajectory)
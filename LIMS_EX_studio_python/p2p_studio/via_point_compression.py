@@ -0,0 +1,208 @@
+import numpy as np
+from .piecewise_spline import PiecewiseHermiteSpline
+from .retiming import DEFAULT_APPROACH_DURATION
+from .trajectory_io import CSV_DECIMALS, write_via_point_csv
+
+# 한 번에 평가하는 샘플 수 (구간 계수 gather 임시 배열 크기 제한)
+_EVAL_CHUNK = 1 << 14
+# 한꺼번에 지워 보는 knot 간격. knot 하나를 지우면 양옆 knot 탄젠트까지 바뀌므로 4칸 떨어진 knot끼리는 서로 영향이 없음
+_PRUNE_STRIDE = 4
+_PRUNE_MIN_GAIN = 0.01
+
+
+def compress_trajectory(times, positions, tolerance, stop_at_via_points: bool = False, prune: bool = True,
+                        max_iterations: int = 1000) -> tuple:
+    """
+    dense 궤적을 재생 스플라인 (PiecewiseHermiteSpline, IRIM 탄젠트 규칙)으로 복원했을 때
+    모든 샘플에서 조인트별 오차가 tolerance 이하가 되도록 최소한의 샘플을 via point(knot)로 선택.
+      1) 양 끝 샘플에서 시작해, tolerance를 넘는 구간마다 오차가 가장 큰 샘플을 knot으로 추가 (바뀐 구간만 다시 평가)
+      2) prune면 _PRUNE_STRIDE 간격 knot을 한꺼번에 지워 보고 tolerance를 지키는 것만 삭제 (더 지울 게 없을 때까지)
+    knot 값은 CSV 저장 정밀도로 반올림한 값으로 평가하므로 저장한 그룹도 같은 오차 안에 듬.
+    첫 / 마지막 knot 탄젠트는 0 (재생 시작 위치가 첫 샘플과 같을 때의 재생 궤적과 일치).
+    Args:
+        times: (N,) 증가하는 샘플 시간 [s]
+        positions: (N, dim) [rad]
+        tolerance: 조인트별 허용 오차 [rad] (scalar 또는 (dim,))
+    Returns:
+        (knot 샘플 인덱스 (K,), 조인트별 최대 오차 (dim,) [rad])
+    """
+    times = np.ascontiguousarray(times, dtype=float).reshape(-1)
+    # 샘플 행 단위로 gather하므로 C 순서로 (기록의 열 선택 결과는 Fortran 순서일 수 있음)
+    positions = np.ascontiguousarray(positions, dtype=float)
+    n_samples, dim = positions.shape
+    if times.shape[0] != n_samples:
+        raise ValueError("times and positions must have the same number of samples")
+    if n_samples < 2:
+        return np.arange(n_samples), np.zeros(dim)
+    if np.any(np.diff(times) <= 0.0):
+        raise ValueError("sample times must be strictly increasing")
+    tolerance = np.broadcast_to(np.asarray(tolerance, dtype=float), (dim,))
+    resolution = np.radians(10.0 ** -CSV_DECIMALS)
+    if np.any(tolerance < resolution):
+        raise ValueError(f"tolerance must be at least the CSV resolution ({resolution:.2e} rad)")
+
+    compressor = _Compressor(times, positions, tolerance, stop_at_via_points)
+    knots = compressor.refine(np.array([0, n_samples - 1]), max_iterations)
+    if prune:
+        knots = compressor.prune(knots)
+    error = compressor.max_error(knots)
+    return knots, error
+
+
+def compress_to_group(csv_path: str, times, positions, tolerance, joint_names: list,
+                      stop_at_via_points: bool = False, approach_duration: float = DEFAULT_APPROACH_DURATION) -> tuple:
+    """
+    compress_trajectory 결과를 via point 그룹 CSV (+ 바이너리)로 저장.
+    첫 행은 첫 샘플 위치 (duration = approach_duration), 이후 행은 knot 사이 시간을 duration으로 사용.
+    Returns:
+        (ViaPointTrajectory, 조인트별 최대 오차 (dim,) [rad])
+    """
+    times = np.asarray(times, dtype=float).reshape(-1)
+    positions = np.asarray(positions, dtype=float)
+    knots, error = compress_trajectory(times, positions, tolerance, stop_at_via_points)
+    durations = np.empty(knots.shape[0])
+    durations[0] = approach_duration
+    durations[1:] = np.diff(times[knots])
+    trajectory = write_via_point_csv(csv_path, durations, np.degrees(positions[knots]), joint_names)
+    return trajectory, error
+
+
+def compress_recording(log, csv_path: str, tolerance, joint_names: list, field: str = "position",
+                       start: int = 0, stop: int = None, stop_at_via_points: bool = False) -> tuple:
+    """
+    joint state 기록 (JointStateLog)의 [start, stop) record를 via point 그룹으로 압축.
+    Args:
+        field: 압축할 값 ("position" = 측정 위치, "target" = 적용된 목표)
+        joint_names: 그룹에 저장할 조인트 (기록의 joint_names 중에서 선택)
+    Returns:
+        compress_to_group과 같음
+    """
+    stop = len(log) if stop is None else min(stop, len(log))
+    if stop - start < 2:
+        raise ValueError(f"{log.path}: 압축할 record가 부족합니다.")
+    columns = [log.joint_names.index(name) for name in joint_names]
+    records = log.records[start:stop]
+    times = np.array(records["time"])
+    positions = np.array(records[field][:, columns])
+    return compress_to_group(csv_path, times, positions, tolerance, joint_names, stop_at_via_points)
+
+
+class _Compressor:
+    """compress_trajectory 내부 상태 (샘플, CSV 반올림 knot 값, 샘플별 정규화 오차)"""
+
+    def __init__(self, times: np.ndarray, positions: np.ndarray, tolerance: np.ndarray, stop_at_via_points: bool):
+        self.times = times
+        self.positions = positions
+        self.values = np.radians(np.round(np.degrees(positions), CSV_DECIMALS))
+        self.inv_tolerance = 1.0 / tolerance
+        self.stop_at_via_points = stop_at_via_points
+        self.n_samples = positions.shape[0]
+
+    def refine(self, knots: np.ndarray, max_iterations: int) -> np.ndarray:
+        error = np.empty(self.n_samples)
+        dirty = np.arange(self.n_samples)
+        for _ in range(max_iterations):
+            spline = self._spline(knots)
+            error[dirty] = self._errors(spline, dirty)
+
+            seg_max = np.maximum.reduceat(error, knots[:-1])
+            bad = np.flatnonzero(seg_max > 1.0)
+            if bad.size == 0:
+                break
+            # 위반 구간의 오차 최대 샘플 (knot 샘플은 반올림 오차뿐이므로 항상 구간 내부)
+            new = self._segment_argmax(error, knots, bad, seg_max[bad])
+            knots = np.sort(np.concatenate((knots, new)))
+            # 새 knot 양옆 2칸: 탄젠트가 바뀌는 knot (i-1, i, i+1)에 닿는 구간
+            index = np.searchsorted(knots, new)
+            dirty = self._union_ranges(knots[np.maximum(index - 2, 0)], knots[np.minimum(index + 2, knots.shape[0] - 1)])
+        else:
+            print(f"⚠️ 압축 반복 횟수 초과 ({max_iterations}회), knot {knots.shape[0]}개로 중단")
+        return knots
+
+    def prune(self, knots: np.ndarray) -> np.ndarray:
+        # 한 바퀴 (phase 전체)에 지운 knot이 _PRUNE_MIN_GAIN 비율 미만이 될 때까지 반복 (이후는 거의 줄지 않음)
+        removed = knots.shape[0]
+        while removed > _PRUNE_MIN_GAIN * knots.shape[0]:
+            removed = 0
+            for phase in range(_PRUNE_STRIDE):
+                candidates = np.arange(1 + phase, knots.shape[0] - 1, _PRUNE_STRIDE)
+                if candidates.size == 0:
+                    continue
+                trial = np.delete(knots, candidates)
+                # 후보별 영향 범위: knot c-2 ~ c+2 (이웃 후보와는 끝 샘플만 공유)
+                lo = knots[np.maximum(candidates - 2, 0)]
+                hi = knots[np.minimum(candidates + 2, knots.shape[0] - 1)]
+                lengths = hi - lo + 1
+                offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+                samples = np.arange(lengths.sum()) - np.repeat(offsets - lo, lengths)
+                error = self._errors(self._spline(trial), samples)
+                keep = np.maximum.reduceat(error, offsets) > 1.0
+                if not keep.all():
+                    knots = np.delete(knots, candidates[~keep])
+                    removed += int(np.count_nonzero(~keep))
+        return knots
+
+    def max_error(self, knots: np.ndarray) -> np.ndarray:
+        """조인트별 최대 오차 [rad]"""
+        spline = self._spline(knots)
+        error = np.zeros(self.positions.shape[1])
+        for begin in range(0, self.n_samples, _EVAL_CHUNK):
+            samples = np.arange(begin, min(begin + _EVAL_CHUNK, self.n_samples))
+            deviation = self._deviation(spline, samples)
+            np.maximum(error, deviation.max(axis=0), out=error)
+        return error
+
+    def _spline(self, knots: np.ndarray) -> tuple:
+        """(knot 샘플, 구간 시작 시간, 1/duration, 계수 (c3, c2, c1, c0) 각각 연속 (S, dim) 배열)"""
+        times = self.times[knots]
+        spline = PiecewiseHermiteSpline(np.diff(times), self.values[knots], self.stop_at_via_points)
+        # 구간 시작 시간은 누적합(spline.knot_times) 대신 샘플 시간을 그대로 사용 (긴 기록에서 반올림 누적 없음)
+        coeffs = tuple(np.ascontiguousarray(spline.pos_coeffs[:, k]) for k in range(4))
+        return knots, times[:-1], 1.0 / spline.durations, coeffs
+
+    def _deviation(self, spline: tuple, samples: np.ndarray) -> np.ndarray:
+        """샘플별 |복원 위치 - 샘플 위치| (len(samples), dim)"""
+        knots, start_times, inv_durations, (c3, c2, c1, c0) = spline
+        seg = np.minimum(np.searchsorted(knots, samples, side="right") - 1, knots.shape[0] - 2)
+        u = ((self.times[samples] - start_times[seg]) * inv_durations[seg])[:, None]
+        # Horner (gather 결과 배열 하나에 in-place)
+        pose = np.take(c3, seg, axis=0)
+        pose *= u
+        pose += np.take(c2, seg, axis=0)
+        pose *= u
+        pose += np.take(c1, seg, axis=0)
+        pose *= u
+        pose += np.take(c0, seg, axis=0)
+        pose -= np.take(self.positions, samples, axis=0)
+        return np.abs(pose, out=pose)
+
+    def _errors(self, spline: tuple, samples: np.ndarray) -> np.ndarray:
+        """샘플별 max_j |오차_j| / tolerance_j"""
+        error = np.empty(samples.shape[0])
+        for begin in range(0, samples.shape[0], _EVAL_CHUNK):
+            deviation = self._deviation(spline, samples[begin:begin + _EVAL_CHUNK])
+            deviation *= self.inv_tolerance
+            # 짧은 축(dim)에 대한 max(axis=1)보다 열 단위 maximum이 빠름
+            out = error[begin:begin + deviation.shape[0]]
+            np.copyto(out, deviation[:, 0])
+            for column in deviation.T[1:]:
+                np.maximum(out, column, out=out)
+        return error
+
+    def _segment_argmax(self, error: np.ndarray, knots: np.ndarray, segments: np.ndarray,
+                        seg_max: np.ndarray) -> np.ndarray:
+        """segments 구간마다 오차가 최대인 첫 샘플 인덱스"""
+        lengths = knots[segments + 1] - knots[segments]
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        samples = np.arange(lengths.sum()) - np.repeat(offsets - knots[segments], lengths)
+        owner = np.repeat(np.arange(segments.shape[0]), lengths)
+        hits = np.flatnonzero(error[samples] == seg_max[owner])
+        _, first = np.unique(owner[hits], return_index=True)
+        return samples[hits[first]]
+
+    def _union_ranges(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """[lo_k, hi_k] 구간들의 합집합 샘플 인덱스"""
+        marks = np.zeros(self.n_samples + 1, dtype=np.int64)
+        np.add.at(marks, lo, 1)
+        np.add.at(marks, hi + 1, -1)
+        return np.flatnonzero(np.cumsum(marks[:-1]) > 0)
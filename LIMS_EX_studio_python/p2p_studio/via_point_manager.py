@@ -5,6 +5,24 @@ import csv
 import numpy as np
 
 
+def hermite_tangents(s_prev: np.ndarray, s_next: np.ndarray) -> np.ndarray:
+    """인접 구간 기울기에서 via point 탄젠트 계산 (C++와 동일: 부호가 같을 때만 평균, 아니면 0)"""
+    return np.where(s_prev * s_next > 0, 0.5 * (s_prev + s_next), 0.0)
+
+
+def hermite_coefficients(P1: np.ndarray, P2: np.ndarray, T1: np.ndarray, T2: np.ndarray) -> np.ndarray:
+    """
+    Hermite 구간을 u(0~1)에 대한 3차 다항식 계수로 변환.
+    Returns:
+        (4, ...) 배열 [c3, c2, c1, c0] - p(u) = ((c3*u + c2)*u + c1)*u + c0
+    """
+    return np.stack((
+        2 * P1 + T1 - 2 * P2 + T2,
+        -3 * P1 - 2 * T1 + 3 * P2 - T2,
+        T1,
+        P1,
+    ))
+
 
 class IRIMCubicHermiteSpline:
     """Cubic Hermite Spline - C++ 코드와 100% 동일한 구현"""
@@ -17,19 +35,16 @@ class IRIMCubicHermiteSpline:
         self.BUFFER_SIZE = 4
         self.EPS = 1e-6  # small epsilon for denom checks
         
-        # Ring buffer for via points
-        self.buffer = [None] * self.BUFFER_SIZE  # SViaPoint objects
+        # Ring buffer for via points (연속 메모리: durations (4,), positions (4, dim))
+        self.durations = np.zeros(self.BUFFER_SIZE)
+        self.positions = np.zeros((self.BUFFER_SIZE, dim))
         self.valid = [False] * self.BUFFER_SIZE  # flags for filled slots
         self.head = 0      # index of current segment start (p0)
         self.filled = 0    # number of valid points in buffer
         self.dim = dim     # dimension of positions
-        
-        # Initialize buffer
-        for i in range(self.BUFFER_SIZE):
-            self.buffer[i] = {
-                'duration_s': 0.0,
-                'positions': [0.0] * dim  # numpy 대신 리스트 사용
-            }
+
+        # 현재 구간의 다항식 계수 캐시 (버퍼가 바뀔 때만 다시 계산)
+        self._segment_cache = None
     
     def add_back_via_point(self, duration_s: float, positions: np.ndarray):
         """새로운 via point를 ring buffer 뒤쪽에 추가"""
@@ -38,17 +53,19 @@ class IRIMCubicHermiteSpline:
         
         if self.filled < self.BUFFER_SIZE:
             # 아직 공간이 있을 때
-            self.buffer[tail_idx]['duration_s'] = duration_s
-            self.buffer[tail_idx]['positions'] = positions.copy()
+            self.durations[tail_idx] = duration_s
+            self.positions[tail_idx] = positions
             self.valid[tail_idx] = True
             self.filled += 1
+            self._segment_cache = None
         else:
             # 가득 찼을 때: 가장 오래된 것을 버리고 head_ 이동 → 새 tail에 덮어쓰기
             self.head = (self.head + 1) % self.BUFFER_SIZE
             tail_idx = (self.head + self.filled - 1) % self.BUFFER_SIZE
-            self.buffer[tail_idx]['duration_s'] = duration_s
-            self.buffer[tail_idx]['positions'] = positions.copy()
+            self.durations[tail_idx] = duration_s
+            self.positions[tail_idx] = positions
             self.valid[tail_idx] = True
+            self._segment_cache = None
     
     def add_front_via_point(self, duration_s: float, positions: np.ndarray):
         """새로운 via point를 ring buffer 앞쪽에 추가"""
@@ -58,13 +75,14 @@ class IRIMCubicHermiteSpline:
         
         # 1) head 한 칸 뒤로 이동 → 자연스럽게 꼬리 하나는 drop
         self.head = (self.head - 1 + self.BUFFER_SIZE) % self.BUFFER_SIZE
-        self.buffer[self.head]['duration_s'] = max(duration_s, self.EPS)
-        self.buffer[self.head]['positions'] = positions.copy()
+        self.durations[self.head] = max(duration_s, self.EPS)
+        self.positions[self.head] = positions
         self.valid[self.head] = True
         
         # 2) 빈 공간이 있으면 filled_ 증가, 꽉 찼으면 그대로
         if self.filled < self.BUFFER_SIZE:
             self.filled += 1
+        self._segment_cache = None
     
     def override_via_point_idx(self, duration_s: float, positions: np.ndarray, idx: int):
         """특정 인덱스의 via point를 덮어쓰기"""
@@ -77,11 +95,12 @@ class IRIMCubicHermiteSpline:
         buf_idx = (self.head + idx) % self.BUFFER_SIZE
         
         # 3) duration과 positions 덮어쓰기
-        self.buffer[buf_idx]['duration_s'] = max(duration_s, self.EPS)
-        self.buffer[buf_idx]['positions'] = positions.copy()
+        self.durations[buf_idx] = max(duration_s, self.EPS)
+        self.positions[buf_idx] = positions
         
         # 4) 해당 슬롯을 valid로 표시
         self.valid[buf_idx] = True
+        self._segment_cache = None
     
     def get_target(self, t_ms: float) -> tuple:
         """
@@ -92,13 +111,70 @@ class IRIMCubicHermiteSpline:
             - pose_out: 위치 배열
             - vel_out: 속도 배열
         """
-        # 1) 최소 4개 포인트 필요
-        if self.filled < 4:
-            return 404, None, None
+        status, segment = self._active_segment()
+        if segment is None:
+            return status, None, None
+        seg_dur, pos_coeffs, vel_coeffs = segment
 
         # 2) 시간을 초로 변환
         time_s = t_ms * 0.001
 
+        # 6) 구간 경계 체크
+        if time_s > seg_dur:
+            return 1, None, None
+        if time_s < 0:
+            return -1, None, None
+
+        # 7) 캐시된 계수로 Horner 보간
+        u_norm = time_s / seg_dur  # ✅ time_s 사용
+        return 0, *self._horner(u_norm, pos_coeffs, vel_coeffs)
+
+    def get_targets(self, t_ms: np.ndarray) -> tuple:
+        """
+        get_target의 배치 버전. N개의 시간을 한 번에 보간 (scalar 경로와 같은 계수/연산 순서라 bit 단위로 동일한 결과).
+        Args:
+            t_ms: (N,) 시간 배열 [ms]
+        Returns:
+            (success, pose_out, vel_out)
+            - success: (N,) 샘플별 코드 (0/-1/+1), 버퍼 자체가 오류면 scalar 404
+            - pose_out: (N, dim) 위치 배열 (구간 밖 샘플은 NaN)
+            - vel_out: (N, dim) 속도 배열 (구간 밖 샘플은 NaN)
+        """
+        status, segment = self._active_segment()
+        if segment is None:
+            return status, None, None
+        seg_dur, pos_coeffs, vel_coeffs = segment
+
+        time_s = np.asarray(t_ms, dtype=float).reshape(-1) * 0.001
+        success = np.zeros(time_s.shape[0], dtype=int)
+        success[time_s > seg_dur] = 1
+        success[time_s < 0] = -1
+
+        u_norm = (time_s / seg_dur)[:, None]
+        pose_out, vel_out = self._horner(u_norm, pos_coeffs, vel_coeffs)
+        out_of_range = success != 0
+        pose_out[out_of_range] = np.nan
+        vel_out[out_of_range] = np.nan
+        return success, pose_out, vel_out
+
+    def _active_segment(self) -> tuple:
+        """
+        현재 구간(P1 -> P2)의 다항식 계수를 반환. 버퍼가 바뀐 뒤 처음 호출될 때만 계산하고 캐시.
+        Returns:
+            (status, segment)
+            - segment: (seg_dur, pos_coeffs, vel_coeffs), 실패 시 None
+              pos_coeffs: (4, dim) u에 대한 위치 계수, vel_coeffs: (3, dim) u에 대한 속도 계수 (1/seg_dur 포함)
+        """
+        if self._segment_cache is None:
+            self._segment_cache = self._compute_segment()
+        return self._segment_cache
+
+    def _compute_segment(self) -> tuple:
+        """_active_segment의 실제 계산 (C++ getTarget의 기울기/탄젠트 단계)"""
+        # 1) 최소 4개 포인트 필요
+        if self.filled < 4:
+            return 404, None
+
         # 3) C++와 동일한 인덱스 계산
         i0 = self.head
         i1 = (i0 + 1) % self.BUFFER_SIZE
@@ -107,66 +183,44 @@ class IRIMCubicHermiteSpline:
 
         # 4) valid 체크 추가
         if not (self.valid[i0] and self.valid[i1] and self.valid[i2] and self.valid[i3]):
-            return 404, None, None
+            return 404, None
 
         # 5) duration
-        seg_dur = self.buffer[i2]['duration_s']
+        seg_dur = float(self.durations[i2])
         if seg_dur < self.EPS:
             print("[Spline] ERROR: segDur<EPS")
-            return 1, None, None
+            return 1, None
 
-        # 6) 구간 경계 체크
-        if time_s > seg_dur:
-            return 1, None, None
-        if time_s < 0:
-            return -1, None, None
-
-        # 7) Hermite Spline 보간
-        u_norm = time_s / seg_dur  # ✅ time_s 사용
-        pose_out = np.zeros(self.dim)
-        vel_out = np.zeros(self.dim)
-
-
-        for d in range(self.dim):
-            P0 = self.buffer[i0]['positions'][d]
-            P1 = self.buffer[i1]['positions'][d]
-            P2 = self.buffer[i2]['positions'][d]
-            P3 = self.buffer[i3]['positions'][d]
+        P0 = self.positions[i0]
+        P1 = self.positions[i1]
+        P2 = self.positions[i2]
+        P3 = self.positions[i3]
 
-            # 기울기 계산 (C++와 동일)
-            s01 = 0.0
-            s12 = (P2 - P1) / self.buffer[i2]['duration_s']
-            s23 = 0.0
-            if self.buffer[i1]['duration_s'] > self.EPS:
-                s01 = (P1 - P0) / self.buffer[i1]['duration_s']
-            if self.buffer[i3]['duration_s'] > self.EPS:
-                s23 = (P3 - P2) / self.buffer[i3]['duration_s']
+        # 기울기 계산 (C++와 동일)
+        s01 = np.zeros(self.dim)
+        s12 = (P2 - P1) / seg_dur
+        s23 = np.zeros(self.dim)
+        if self.durations[i1] > self.EPS:
+            s01 = (P1 - P0) / self.durations[i1]
+        if self.durations[i3] > self.EPS:
+            s23 = (P3 - P2) / self.durations[i3]
 
-            # 탄젠트 계산
-            m1 = 0.0
-            if s01 * s12 > 0:
-                m1 = 0.5 * (s01 + s12)
-            m2 = 0.0
-            if s12 * s23 > 0:
-                m2 = 0.5 * (s12 + s23)
+        # 탄젠트 계산
+        T1 = hermite_tangents(s01, s12) * seg_dur
+        T2 = hermite_tangents(s12, s23) * seg_dur
 
-            T1 = m1 * seg_dur
-            T2 = m2 * seg_dur
+        pos_coeffs = hermite_coefficients(P1, P2, T1, T2)
+        vel_coeffs = np.stack((3 * pos_coeffs[0], 2 * pos_coeffs[1], pos_coeffs[2])) / seg_dur
+        return 0, (seg_dur, pos_coeffs, vel_coeffs)
 
-            pose_out[d] = (
-                self._h00(u_norm) * P1 +
-                self._h10(u_norm) * T1 +
-                self._h01(u_norm) * P2 +
-                self._h11(u_norm) * T2
-            )
-            vel_out[d] = (
-                (self._h00p(u_norm) * P1 +
-                self._h10p(u_norm) * T1 +
-                self._h01p(u_norm) * P2 +
-                self._h11p(u_norm) * T2) / seg_dur
-            )
-
-        return 0, pose_out, vel_out
+    @staticmethod
+    def _horner(u_norm, pos_coeffs: np.ndarray, vel_coeffs: np.ndarray) -> tuple:
+        """정규화 시간 u_norm(scalar 또는 (N, 1))에서 Horner 방식으로 위치/속도 계산"""
+        c3, c2, c1, c0 = pos_coeffs
+        v2, v1, v0 = vel_coeffs
+        pose_out = ((c3 * u_norm + c2) * u_norm + c1) * u_norm + c0
+        vel_out = (v2 * u_norm + v1) * u_norm + v0
+        return pose_out, vel_out
     
     def _compute_knots(self, idx0: int) -> np.ndarray:
         """knot parameters 계산"""
@@ -176,9 +230,9 @@ class IRIMCubicHermiteSpline:
         i3 = (i2 + 1) % self.BUFFER_SIZE
         
         # 2) duration_s 끌어오기
-        d01 = self.buffer[i1]['duration_s']
-        d12 = self.buffer[i2]['duration_s']
-        d23 = self.buffer[i3]['duration_s']
+        d01 = self.durations[i1]
+        d12 = self.durations[i2]
+        d23 = self.durations[i3]
         
         # 3) 누적해서 t 설정
         t = np.zeros(4)
@@ -203,8 +257,9 @@ class IRIMCubicHermiteSpline:
         idx2 = (self.head + 2) % self.BUFFER_SIZE
         
         # 둘 중 큰걸로 하자~ -> 더 보수적으로.
-        if self.buffer[idx2]['duration_s'] < sec:
-            self.buffer[idx2]['duration_s'] = sec
+        if self.durations[idx2] < sec:
+            self.durations[idx2] = sec
+            self._segment_cache = None
     
     def print_buffer(self):
         """버퍼 상태 출력 (디버깅용)"""
@@ -215,11 +270,11 @@ class IRIMCubicHermiteSpline:
                 print(f"[{i}] invalid")
                 continue
             
-            print(f"[{i}] duration_s: {self.buffer[i]['duration_s']}, positions: {self.buffer[i]['positions']}")
+            print(f"[{i}] duration_s: {self.durations[i]}, positions: {self.positions[i]}")
         print("================================")
     
     # ========================================
-    # Hermite Basis Functions (C++와 동일)
+    # Hermite Basis Functions (C++와 동일, 참조용 - 캐시 계수는 hermite_coefficients)
     # ========================================
     @staticmethod
     def _h00(u: float) -> float:
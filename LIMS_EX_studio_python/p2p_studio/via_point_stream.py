@@ -0,0 +1,204 @@
+import time
+import queue
+import socket
+import struct
+import threading
+import numpy as np
+
+# 프레임: header (magic, kind, dim, duration [s]) + positions (dim개 float64, rad), little endian
+# 흐름 제어: receiver가 queue 자리가 날 때마다 credit 1 byte를 보내고, publisher는 credit 하나당 프레임 하나만 보냄
+STREAM_MAGIC = b"LXVP"
+STREAM_HEADER = struct.Struct("<4sBBd")
+FRAME_VIA_POINT = 0
+FRAME_END = 1  # publisher가 더 보낼 via point가 없음 (남은 점을 재생하고 종료)
+
+STREAM_CREDIT = b"\x01"
+
+# accept / queue 자리 대기 중 stop 요청을 확인하는 주기 [s]
+_POLL_INTERVAL = 0.1
+
+
+def encode_via_point(duration: float, positions) -> bytes:
+    positions = np.ascontiguousarray(positions, dtype="<f8")
+    return STREAM_HEADER.pack(STREAM_MAGIC, FRAME_VIA_POINT, positions.shape[0], duration) + positions.tobytes()
+
+
+def encode_end() -> bytes:
+    return STREAM_HEADER.pack(STREAM_MAGIC, FRAME_END, 0, 0.0)
+
+
+class ViaPointStreamServer:
+    """
+    localhost TCP로 via point 프레임을 받아 queue에 넣는 reader thread.
+    physics callback은 poll()로 queue에서 꺼내기만 하므로 socket I/O에 막히지 않음.
+    queue 자리(slot)마다 credit을 하나씩 보내므로 publisher가 보냈지만 재생되지 않은 점은 항상 queue_size개 이하
+    (socket 버퍼에 쌓이는 점 없음) -> 수신부터 재생까지 지연 상한 = (queue_size + 1) × duration.
+    """
+
+    def __init__(self, dim: int, host: str = "127.0.0.1", port: int = 0, queue_size: int = 8):
+        """
+        Args:
+            dim: via point 차원 (다른 dim의 프레임은 버림)
+            port: 0이면 OS가 빈 포트 지정 (address로 확인)
+            queue_size: 재생 대기 via point 최대 개수
+        """
+        self.dim = dim
+        self._host = host
+        self._port = port
+        self._queue = queue.SimpleQueue()
+        self._queue_size = queue_size
+        self._slots = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._listener = None
+        self.connected = False
+        self.ended = False
+        self.received = 0
+        self.rejected = 0
+
+    @property
+    def address(self) -> tuple:
+        return self._listener.getsockname() if self._listener is not None else (self._host, self._port)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._listener = socket.create_server((self._host, self._port))
+        self._listener.settimeout(_POLL_INTERVAL)
+        self._slots = threading.Semaphore(self._queue_size)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="via_point_stream", daemon=True)
+        self._thread.start()
+
+    def request_stop(self):
+        """reader thread에 종료만 알림 (기다리지 않으므로 physics callback에서 호출 가능, join은 stop()에서)"""
+        self._stop.set()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+    def poll(self):
+        """
+        다음 via point를 꺼냄 (기다리지 않음)
+        Returns:
+            (duration [s], positions (dim,), 수신 시각 perf_counter_ns) 또는 None
+        """
+        try:
+            item = self._queue.get_nowait()
+        except queue.Empty:
+            return None
+        # 자리가 났으므로 reader가 다음 credit을 보낼 수 있음 (Semaphore.release는 기다리지 않음)
+        self._slots.release()
+        return item
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                connection, _ = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            with connection:
+                connection.settimeout(_POLL_INTERVAL)
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                self.connected = True
+                self.ended = False
+                try:
+                    self._read_frames(connection)
+                except (ConnectionError, OSError) as e:
+                    print(f"⚠️ Stream 연결 끊김: {e}")
+                self.connected = False
+
+    def _read_frames(self, connection: socket.socket):
+        header = bytearray(STREAM_HEADER.size)
+        payload = bytearray(8 * self.dim)
+        while not self._stop.is_set():
+            # queue 자리를 하나 확보한 뒤에만 credit을 보내고 프레임 하나를 읽음
+            if not self._slots.acquire(timeout=_POLL_INTERVAL):
+                continue
+            queued = False
+            try:
+                connection.sendall(STREAM_CREDIT)
+                if not self._recv_exact(connection, header):
+                    return
+                magic, kind, dim, duration = STREAM_HEADER.unpack(header)
+                if magic != STREAM_MAGIC:
+                    raise ConnectionError("잘못된 프레임 (magic 불일치)")
+                if kind == FRAME_END:
+                    self.ended = True
+                    continue
+
+                data = payload if dim == self.dim else bytearray(8 * dim)
+                if not self._recv_exact(connection, data):
+                    return
+                if dim != self.dim or not duration > 0.0:
+                    self.rejected += 1
+                    continue
+                self._queue.put((duration, np.frombuffer(data, dtype="<f8").copy(), time.perf_counter_ns()))
+                self.received += 1
+                queued = True
+            finally:
+                # queue에 넣지 않은 프레임의 자리는 바로 반환
+                if not queued:
+                    self._slots.release()
+
+    def _recv_exact(self, connection: socket.socket, buffer: bytearray) -> bool:
+        """buffer를 가득 채울 때까지 수신. 연결이 닫히거나 stop이면 False"""
+        view = memoryview(buffer)
+        received = 0
+        while received < len(buffer):
+            if self._stop.is_set():
+                return False
+            try:
+                n = connection.recv_into(view[received:])
+            except socket.timeout:
+                continue
+            if n == 0:
+                return False
+            received += n
+        return True
+
+
+class ViaPointStreamPublisher:
+    """스트림 프로토콜 송신 측 (외부 프로세스 / 테스트용 stand-in publisher)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, timeout: float = 5.0):
+        self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._socket.settimeout(None)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._credits = 0
+
+    def send(self, duration: float, positions):
+        """via point 하나 전송 (receiver queue에 자리가 날 때까지 막힘)"""
+        self._wait_credit()
+        self._socket.sendall(encode_via_point(duration, positions))
+
+    def end(self):
+        self._wait_credit()
+        self._socket.sendall(encode_end())
+
+    def _wait_credit(self):
+        while self._credits == 0:
+            credits = self._socket.recv(64)
+            if not credits:
+                raise ConnectionError("receiver closed the stream")
+            self._credits += len(credits)
+        self._credits -= 1
+
+    def close(self):
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
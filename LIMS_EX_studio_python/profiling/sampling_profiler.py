@@ -0,0 +1,139 @@
+import os
+import sys
+import time
+import threading
+from collections import Counter
+
+# 샘플링 간격 [s]
+DEFAULT_SAMPLE_INTERVAL = 0.001
+# step 수를 세는 기준 callback (CallbackTimer 이름)
+DEFAULT_STEP_CALLBACK = "Extension._on_physics_step"
+# 이 시간 [s] 동안 step이 하나도 끝나지 않으면 (timeline 정지 등) 스스로 분리
+DEFAULT_IDLE_TIMEOUT = 10.0
+
+
+class StepSamplingProfiler:
+    """
+    CallbackTimer로 감싼 callback이 실행되는 동안에만 백그라운드 thread가 sys._current_frames()로
+    callback thread의 stack을 주기적으로 샘플링. n_steps 만큼 step이 끝나면 스스로 분리되고,
+    folded stack (flamegraph.pl / speedscope 호환)과 top-N hotspot 요약을 output_dir에 저장.
+    idle_timeout 동안 step이 없거나 detach(reason)로 취소되면 그때까지 모은 샘플만 저장.
+    """
+
+    def __init__(self, n_steps: int, output_dir: str, interval: float = DEFAULT_SAMPLE_INTERVAL,
+                 step_callback: str = DEFAULT_STEP_CALLBACK, top_n: int = 30,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.n_steps = n_steps
+        self.output_dir = output_dir
+        self.interval = interval
+        self.step_callback = step_callback
+        self.top_n = top_n
+        self.idle_timeout = idle_timeout
+
+        self.completed_steps = 0
+        self.n_samples = 0
+        self.output_paths = None
+        # detach(reason)으로 중단된 이유 (n_steps를 다 채우면 None)
+        self.cancel_reason = None
+        self._stacks = Counter()  # (code, ...) root -> leaf -> 샘플 수
+        self._depth = 0
+        self._thread_id = None
+        self._timer = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None and not self._stop.is_set()
+
+    def attach(self, timer):
+        """timer(CallbackTimer)에 연결하고 샘플링 thread 시작"""
+        self._timer = timer
+        timer.profiler = self
+        self._thread = threading.Thread(target=self._run, name="StepSamplingProfiler", daemon=True)
+        self._thread.start()
+
+    def detach(self, reason: str = None):
+        """timer에서 분리하고 샘플링 종료 (reason: 중단 이유, n_steps 전에 멈출 때). 기다리지 않음"""
+        if self._timer is not None and self._timer.profiler is self:
+            self._timer.profiler = None
+        if reason is not None and not self._stop.is_set():
+            self.cancel_reason = reason
+        self._stop.set()
+
+    # ========================================
+    # CallbackTimer에서 호출 (callback thread)
+    # ========================================
+    def enter(self, name: str):
+        self._thread_id = threading.get_ident()
+        self._depth += 1
+
+    def exit(self, name: str):
+        self._depth -= 1
+        if name == self.step_callback:
+            self.completed_steps += 1
+            if self.completed_steps >= self.n_steps:
+                self.detach()
+
+    # ========================================
+    # 샘플링 thread
+    # ========================================
+    def _run(self):
+        last_steps, last_progress = 0, time.monotonic()
+        while not self._stop.wait(self.interval):
+            # step이 멈춘 채로 (timeline 정지, 종료 등) 무한정 기다리지 않음
+            if self.completed_steps != last_steps:
+                last_steps, last_progress = self.completed_steps, time.monotonic()
+            elif time.monotonic() - last_progress > self.idle_timeout:
+                self.detach(f"{self.idle_timeout:g} s 동안 physics step 없음")
+                break
+            if self._depth <= 0:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            if stack:
+                self._stacks[tuple(reversed(stack))] += 1
+                self.n_samples += 1
+        if self.cancel_reason is not None:
+            print(f"⚠️ Profile 중단 ({self.cancel_reason}): {self.completed_steps}/{self.n_steps} steps")
+            if self.n_samples == 0:
+                return
+        # 파일 저장은 physics step 밖(이 thread)에서
+        try:
+            self.output_paths = self._write()
+            print(f"✅ Profile 저장 완료 ({self.completed_steps} steps, {self.n_samples} samples): {self.output_paths[0]}")
+        except OSError as e:
+            print(f"❌ Profile 저장 실패: {e}")
+
+    @staticmethod
+    def _frame_name(code) -> str:
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _write(self) -> tuple:
+        os.makedirs(self.output_dir, exist_ok=True)
+        prefix = os.path.join(self.output_dir, f"profile_{time.strftime('%Y%m%d_%H%M%S')}")
+        folded_path = prefix + ".folded"
+        summary_path = prefix + "_top.txt"
+
+        self_counts, total_counts = Counter(), Counter()
+        with open(folded_path, "w") as f:
+            for stack, count in self._stacks.most_common():
+                names = [self._frame_name(code) for code in stack]
+                f.write(";".join(names) + f" {count}\n")
+                self_counts[names[-1]] += count
+                for name in set(names):
+                    total_counts[name] += count
+
+        n = max(self.n_samples, 1)
+        lines = [f"{self.completed_steps} steps, {self.n_samples} samples, interval {self.interval * 1000:.1f} ms", ""]
+        for title, counts in (("self", self_counts), ("total", total_counts)):
+            lines.append(f"Top {self.top_n} by {title} samples")
+            for name, count in counts.most_common(self.top_n):
+                lines.append(f"{count:8d} {100.0 * count / n:6.1f}%  {name}")
+            lines.append("")
+        with open(summary_path, "w") as f:
+            f.write("\n".join(lines))
+        return folded_path, summary_path
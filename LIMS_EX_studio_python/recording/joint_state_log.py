@@ -0,0 +1,88 @@
+import json
+import os
+import struct
+import numpy as np
+
+# 파일 구조: prefix (magic, version, header 크기) + JSON header (0으로 채워 RECORD_ALIGNMENT 배수) + record 배열
+# record 수는 파일 크기로 계산하므로 header를 다시 쓰지 않고 뒤에 계속 이어 쓸 수 있음 (중간에 끊긴 마지막 record는 무시)
+JOINT_STATE_LOG_MAGIC = b"LXJS"
+JOINT_STATE_LOG_VERSION = 1
+JOINT_STATE_LOG_EXTENSION = ".lxjs"
+_PREFIX = struct.Struct("<4sHI")
+RECORD_ALIGNMENT = 64
+
+# 기본 chunk 크기 [records]
+DEFAULT_CHUNK_RECORDS = 65536
+
+
+def record_dtype(n_dof: int) -> np.dtype:
+    """
+    physics step 하나의 기록
+        time: 기록 시작 후 sim 시간 [s]
+        playback_time: 재생 중인 궤적의 clock 시간 [s] (재생 중이 아니면 NaN)
+        position / velocity: 측정 조인트 상태 [rad], [rad/s]
+        target: articulation에 적용된 목표 위치 [rad] (없으면 NaN)
+    """
+    return np.dtype([
+        ("time", "<f8"),
+        ("playback_time", "<f8"),
+        ("position", "<f8", (n_dof,)),
+        ("velocity", "<f8", (n_dof,)),
+        ("target", "<f8", (n_dof,)),
+    ])
+
+
+def encode_header(joint_names: list, metadata: dict = None) -> bytes:
+    """prefix + JSON header (record가 RECORD_ALIGNMENT 경계에서 시작하도록 padding)"""
+    body = json.dumps({"joint_names": list(joint_names), "metadata": metadata or {}}).encode("utf-8")
+    size = _PREFIX.size + len(body)
+    size += -size % RECORD_ALIGNMENT
+    return _PREFIX.pack(JOINT_STATE_LOG_MAGIC, JOINT_STATE_LOG_VERSION, size) + body.ljust(size - _PREFIX.size, b"\0")
+
+
+def read_header(path: str):
+    """Returns: (header 크기 [bytes], joint_names, metadata)"""
+    with open(path, "rb") as f:
+        magic, version, size = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != JOINT_STATE_LOG_MAGIC:
+            raise ValueError(f"{path}: joint state log가 아닙니다.")
+        if version != JOINT_STATE_LOG_VERSION:
+            raise ValueError(f"{path}: 지원하지 않는 버전 {version}")
+        header = json.loads(f.read(size - _PREFIX.size).rstrip(b"\0"))
+    return size, header["joint_names"], header["metadata"]
+
+
+class JointStateLog:
+    """기록된 joint state 파일 읽기 (memory-map, 읽는 chunk만 메모리에 올라옴)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.header_size, self.joint_names, self.metadata = read_header(path)
+        self.dtype = record_dtype(len(self.joint_names))
+        self.records = None
+        self.refresh()
+
+    @property
+    def n_dof(self) -> int:
+        return len(self.joint_names)
+
+    def __len__(self) -> int:
+        return 0 if self.records is None else self.records.shape[0]
+
+    def refresh(self):
+        """기록 중인 파일이면 그 사이 추가된 record까지 다시 map"""
+        count = (os.path.getsize(self.path) - self.header_size) // self.dtype.itemsize
+        # 크기 0인 memmap은 만들 수 없음
+        self.records = (np.memmap(self.path, dtype=self.dtype, mode="r", offset=self.header_size, shape=(count,))
+                        if count > 0 else None)
+
+    def chunks(self, chunk_records: int = DEFAULT_CHUNK_RECORDS, start: int = 0, stop: int = None):
+        """
+        [start, stop) record를 chunk_records개씩 반환.
+        chunk마다 그 구간만 따로 memory-map하므로, 다 쓴 chunk를 버리면 unmap되어 파일 크기와 관계없이 메모리가 일정함
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        for begin in range(start, stop, chunk_records):
+            count = min(chunk_records, stop - begin)
+            yield np.memmap(self.path, dtype=self.dtype, mode="r",
+                            offset=self.header_size + begin * self.dtype.itemsize, shape=(count,))
@@ -0,0 +1,147 @@
+import os
+import threading
+import numpy as np
+from .joint_state_log import encode_header, read_header, record_dtype
+
+# ring buffer 크기 [records] (60 Hz 기준 약 4.5분, flush thread가 이만큼 밀리기 전까지는 기록이 버려지지 않음)
+DEFAULT_RING_RECORDS = 16384
+# 이 개수가 쌓이면 flush thread를 깨움
+DEFAULT_FLUSH_RECORDS = 1024
+# 쌓인 양과 관계없이 파일에 쓰는 주기 [s]
+DEFAULT_FLUSH_INTERVAL = 0.5
+
+
+class JointStateRecorder:
+    """
+    physics step마다 joint state를 미리 할당한 ring buffer에 기록하고, 백그라운드 thread가 chunk 단위로 파일 끝에 이어 씀.
+    physics thread는 ring slot에 값을 복사하기만 하고 (할당 / I/O / lock 없음), 메모리는 ring 크기로 고정.
+    flush가 밀려 ring이 가득 차면 기다리지 않고 그 step의 기록을 버리고 dropped로 셈.
+    """
+
+    def __init__(self, path: str, joint_names: list, ring_records: int = DEFAULT_RING_RECORDS,
+                 flush_records: int = DEFAULT_FLUSH_RECORDS, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 metadata: dict = None):
+        """
+        Args:
+            path: 기록 파일 (이미 같은 조인트 구성의 기록이 있으면 뒤에 이어 씀)
+            joint_names: 기록할 DOF 이름 (articulation.dof_names 순서)
+            metadata: header에 저장할 정보 (그룹 이름, physics dt 등)
+        """
+        self.path = path
+        self.joint_names = list(joint_names)
+        self.metadata = dict(metadata or {})
+        self._capacity = ring_records
+        self._flush_records = flush_records
+        self._flush_interval = flush_interval
+
+        self._ring = np.zeros(ring_records, dtype=record_dtype(len(self.joint_names)))
+        # 필드 view는 한 번만 만들어 둠 (매 step ring["position"] 인덱싱은 view를 새로 만듦)
+        self._time = self._ring["time"]
+        self._playback_time = self._ring["playback_time"]
+        self._position = self._ring["position"]
+        self._velocity = self._ring["velocity"]
+        self._target = self._ring["target"]
+
+        # _written은 physics thread만, _flushed는 flush thread만 갱신
+        self._written = 0
+        self._flushed = 0
+        self.dropped = 0
+        self.appended_to = 0  # 이어 쓰기 시작한 시점의 기존 record 수
+        self.error = None
+        self._file = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def recording(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def recorded(self) -> int:
+        """이번 기록에서 ring에 들어간 record 수"""
+        return self._written
+
+    @property
+    def flushed(self) -> int:
+        return self._flushed
+
+    def start(self):
+        self._file = self._open()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="joint_state_recorder", daemon=True)
+        self._thread.start()
+
+    def record(self, time: float, playback_time: float, positions, velocities, targets) -> bool:
+        """physics callback에서 호출. targets가 None이면 NaN. Returns: ring이 가득 차 버렸으면 False"""
+        written = self._written
+        if written - self._flushed >= self._capacity:
+            self.dropped += 1
+            return False
+        slot = written % self._capacity
+        self._time[slot] = time
+        self._playback_time[slot] = playback_time
+        self._position[slot] = positions
+        self._velocity[slot] = velocities
+        if targets is None:
+            self._target[slot] = np.nan
+        else:
+            self._target[slot] = targets
+        # slot을 다 쓴 뒤에 공개
+        self._written = written + 1
+        if self._written % self._flush_records == 0:
+            self._wake.set()
+        return True
+
+    def stop(self):
+        """남은 record를 모두 쓰고 파일을 닫음 (record()를 부르는 callback을 먼저 제거해야 함)"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        self._file.close()
+        self._file = None
+
+    def _open(self):
+        """새 파일이면 header를 쓰고, 기존 기록이면 끊긴 마지막 record를 잘라낸 뒤 이어 쓰도록 열기"""
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            header_size, joint_names, _ = read_header(self.path)
+            if joint_names != self.joint_names:
+                raise ValueError(f"{self.path}: 조인트 구성이 다른 기록에는 이어 쓸 수 없습니다.")
+            itemsize = self._ring.dtype.itemsize
+            self.appended_to = (os.path.getsize(self.path) - header_size) // itemsize
+            f = open(self.path, "r+b")
+            f.truncate(header_size + self.appended_to * itemsize)
+            f.seek(0, os.SEEK_END)
+            return f
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        f = open(self.path, "wb")
+        f.write(encode_header(self.joint_names, self.metadata))
+        return f
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                self._wake.wait(self._flush_interval)
+                self._wake.clear()
+                self._flush()
+            self._flush()
+        except OSError as e:
+            # 더 이상 비우지 않으므로 ring이 차면 physics 쪽 기록은 dropped로 셈
+            self.error = e
+            print(f"❌ Joint state 기록 저장 실패: {e}")
+
+    def _flush(self):
+        end = self._written
+        begin = self._flushed
+        while begin < end:
+            slot = begin % self._capacity
+            count = min(end - begin, self._capacity - slot)
+            # 연속 구간을 그대로 파일에 씀 (write 중에는 GIL을 놓음)
+            self._file.write(self._ring[slot:slot + count].data)
+            begin += count
+            self._flushed = begin
+        self._file.flush()
@@ -0,0 +1,240 @@
+import csv
+import numpy as np
+from .joint_state_log import DEFAULT_CHUNK_RECORDS
+from ..p2p_studio.piecewise_spline import PiecewiseHermiteSpline
+
+# 이 속도 [rad/s] 미만이면 via point에서 멈추는 / 방향이 바뀌는 조인트로 보고 overshoot를 계산
+OVERSHOOT_VELOCITY_EPS = 1e-6
+
+
+class TrackingErrorAnalyzer:
+    """
+    기준 궤적 (재생한 PiecewiseHermiteSpline) 대비 측정 위치의 tracking error를 chunk 단위로 누적.
+    chunk마다 기준 궤적을 한 번에 평가하고, 조인트별 / 구간별 합계와 최대값만 갱신하므로
+    메모리는 chunk 크기와 구간 수에만 비례 (기록 길이와 무관).
+      - RMS / peak: e = q - q_ref
+      - lag τ: e ≈ -τ·v_ref 의 최소제곱 해 τ = -Σ(e·v_ref) / Σ(v_ref²) (양수면 측정이 기준보다 늦음)
+      - overshoot (CSV 행 s = via point positions[s+1]): 구간 s, s+1 샘플에서 구간 s 진행 방향으로 측정 위치가
+        기준 궤적보다 더 나간 거리 (max d·(q - via) - max d·(q_ref - via), 0 이상).
+        스플라인 자체도 via point를 지나칠 수 있으므로 기준 궤적의 도달점을 뺌.
+        기준 속도가 그 via point에서 0인 (멈추거나 되돌아가는) 조인트만 계산, 나머지는 NaN
+    add_chunk에 reference_positions (기록된 명령 위치)를 주면 q_ref 대신 사용하고 v_ref만 스플라인에서 계산.
+    """
+
+    def __init__(self, reference: PiecewiseHermiteSpline, joint_names: list):
+        self.reference = reference
+        self.joint_names = list(joint_names)
+        n_segments, dim = reference.n_segments, reference.positions.shape[1]
+        if len(self.joint_names) != dim:
+            raise ValueError(f"joint_names ({len(self.joint_names)}) and reference dim ({dim}) differ")
+
+        self.count = 0
+        self.sum_sq = np.zeros(dim)
+        self.sum_ev = np.zeros(dim)
+        self.sum_vv = np.zeros(dim)
+        self.peak = np.zeros(dim)
+        self.peak_time = np.full(dim, np.nan)
+
+        self.segment_count = np.zeros(n_segments, dtype=np.int64)
+        self.segment_sum_sq = np.zeros((n_segments, dim))
+        self.segment_sum_ev = np.zeros((n_segments, dim))
+        self.segment_sum_vv = np.zeros((n_segments, dim))
+        self.segment_peak = np.zeros((n_segments, dim))
+        # via point별 진행 방향 최대 도달 거리 (측정 / 기준)
+        self.reach = np.full((n_segments, dim), -np.inf)
+        self.reference_reach = np.full((n_segments, dim), -np.inf)
+
+        # via point s (구간 s의 끝)의 목표 위치와 구간 s 진행 방향
+        positions = reference.positions
+        self._via = positions[1:]
+        self._direction = np.sign(positions[1:] - positions[:-1])
+        _, end_velocity = reference.evaluate_batch(reference.knot_times[1:])
+        self._turning = (np.abs(end_velocity) < OVERSHOOT_VELOCITY_EPS) & (self._direction != 0)
+
+    def add_chunk(self, t: np.ndarray, positions: np.ndarray, reference_positions: np.ndarray = None):
+        """
+        Args:
+            t: (M,) 기준 궤적 시간 [s]
+            positions: (M, dim) 측정 위치 [rad]
+            reference_positions: (M, dim) 기준 위치 [rad] (없으면 기준 궤적을 t에서 평가)
+        """
+        t = np.asarray(t, dtype=float).reshape(-1)
+        if t.shape[0] == 0:
+            return
+        reference = self.reference
+        n_segments, dim = self.segment_count.shape[0], self.sum_sq.shape[0]
+        ref_pos, ref_vel = reference.evaluate_batch(t)
+        if reference_positions is not None:
+            ref_pos = reference_positions
+        error = positions - ref_pos
+        error_sq = error * error
+        error_vel = error * ref_vel
+        vel_sq = ref_vel * ref_vel
+        abs_error = np.abs(error)
+
+        self.count += t.shape[0]
+        self.sum_sq += error_sq.sum(axis=0)
+        self.sum_ev += error_vel.sum(axis=0)
+        self.sum_vv += vel_sq.sum(axis=0)
+        index = abs_error.argmax(axis=0)
+        chunk_peak = abs_error[index, np.arange(dim)]
+        better = chunk_peak > self.peak
+        self.peak[better] = chunk_peak[better]
+        self.peak_time[better] = t[index[better]]
+
+        # 구간별 합계: (구간, 조인트) 평탄 인덱스 하나로 bincount
+        seg = np.clip(np.searchsorted(reference.knot_times, t, side="right") - 1, 0, n_segments - 1)
+        flat = (seg[:, None] * dim + np.arange(dim)).reshape(-1)
+        size = n_segments * dim
+        self.segment_count += np.bincount(seg, minlength=n_segments)
+        self.segment_sum_sq += np.bincount(flat, error_sq.reshape(-1), size).reshape(n_segments, dim)
+        self.segment_sum_ev += np.bincount(flat, error_vel.reshape(-1), size).reshape(n_segments, dim)
+        self.segment_sum_vv += np.bincount(flat, vel_sq.reshape(-1), size).reshape(n_segments, dim)
+        _segment_maximum(self.segment_peak, seg, abs_error)
+
+        # via point seg (현재 구간의 끝)와 seg-1 (현재 구간의 시작) 기준 도달 거리
+        after = seg > 0
+        previous = seg[after] - 1
+        for reach, pose in ((self.reach, positions), (self.reference_reach, ref_pos)):
+            _segment_maximum(reach, seg, (pose - self._via[seg]) * self._direction[seg])
+            _segment_maximum(reach, previous, (pose[after] - self._via[previous]) * self._direction[previous])
+
+    def report(self) -> "TrackingReport":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            count = np.maximum(self.segment_count, 1)[:, None]
+            overshoot = np.where(self._turning & np.isfinite(self.reach),
+                                 np.maximum(self.reach - self.reference_reach, 0.0), np.nan)
+            return TrackingReport(
+                joint_names=self.joint_names,
+                n_samples=self.count,
+                rms=np.sqrt(self.sum_sq / max(self.count, 1)),
+                peak=self.peak.copy(),
+                peak_time=self.peak_time.copy(),
+                lag=-self.sum_ev / self.sum_vv,
+                pooled_lag=-self.sum_ev.sum() / self.sum_vv.sum(),
+                segment_durations=self.reference.durations.copy(),
+                segment_samples=self.segment_count.copy(),
+                segment_rms=np.where(self.segment_count[:, None] > 0, np.sqrt(self.segment_sum_sq / count), np.nan),
+                segment_peak=np.where(self.segment_count[:, None] > 0, self.segment_peak, np.nan),
+                segment_lag=-self.segment_sum_ev.sum(axis=1) / self.segment_sum_vv.sum(axis=1),
+                overshoot=overshoot,
+            )
+
+
+class TrackingReport:
+    """tracking error 분석 결과 (각도 [rad], 시간 [s]). 구간 배열의 행 s = via point CSV 행 s"""
+
+    def __init__(self, joint_names, n_samples, rms, peak, peak_time, lag, pooled_lag, segment_durations,
+                 segment_samples, segment_rms, segment_peak, segment_lag, overshoot):
+        self.joint_names = joint_names
+        self.n_samples = n_samples
+        self.rms = rms
+        self.peak = peak
+        self.peak_time = peak_time
+        self.lag = lag                              # (dim,) 조인트별 lag [s] (기준 속도가 0이면 NaN)
+        self.pooled_lag = pooled_lag                # 전체 조인트 공통 lag [s]
+        self.segment_durations = segment_durations  # (S,)
+        self.segment_samples = segment_samples      # (S,)
+        self.segment_rms = segment_rms              # (S, dim) (샘플 없는 구간은 NaN)
+        self.segment_peak = segment_peak            # (S, dim)
+        self.segment_lag = segment_lag              # (S,) 구간 내 전체 조인트 공통 lag
+        self.overshoot = overshoot                  # (S, dim) (해당 없는 조인트 NaN)
+
+    def summary(self, worst_rows: int = 3) -> str:
+        lines = [f"📊 Tracking error: {self.n_samples} samples, lag {self.pooled_lag * 1e3:.1f} ms"]
+        for j, name in enumerate(self.joint_names):
+            overshoot = self.overshoot[:, j]
+            overshoot_text = (f"{np.degrees(np.nanmax(overshoot)):.3f} deg"
+                              if np.isfinite(overshoot).any() else "-")
+            lines.append(f"   {name}: rms {np.degrees(self.rms[j]):.3f} deg, peak {np.degrees(self.peak[j]):.3f} deg "
+                         f"(t={self.peak_time[j]:.3f} s), lag {self.lag[j] * 1e3:.1f} ms, overshoot {overshoot_text}")
+        peak = np.nan_to_num(self.segment_peak, nan=-1.0).max(axis=1)
+        for row in np.argsort(-peak, kind="stable")[:worst_rows]:
+            if peak[row] < 0.0:
+                break
+            j = int(np.nanargmax(self.segment_peak[row]))
+            lines.append(f"   ⚠️ 행 {row}: peak {np.degrees(peak[row]):.3f} deg ({self.joint_names[j]}), "
+                         f"rms {np.degrees(np.nanmax(self.segment_rms[row])):.3f} deg")
+        return "\n".join(lines)
+
+    def write_csv(self, path: str):
+        """CSV 행별 보고서 (각도 [deg], lag [s])"""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["row", "duration", "samples", "lag"]
+                            + [f"rms_{name}" for name in self.joint_names]
+                            + [f"peak_{name}" for name in self.joint_names]
+                            + [f"overshoot_{name}" for name in self.joint_names])
+            rms, peak, overshoot = (np.degrees(a) for a in (self.segment_rms, self.segment_peak, self.overshoot))
+            for row in range(self.segment_samples.shape[0]):
+                writer.writerow([row, f"{self.segment_durations[row]:.6f}", int(self.segment_samples[row]),
+                                 _format(self.segment_lag[row], 6)]
+                                + [_format(v, 4) for v in rms[row]]
+                                + [_format(v, 4) for v in peak[row]]
+                                + [_format(v, 4) for v in overshoot[row]])
+
+
+def analyze_recording(log, p2p_data: list, joint_names: list, stop_at_via_points: bool = False,
+                      start_positions=None, time_offset: float = None, use_targets: bool = False,
+                      chunk_records: int = DEFAULT_CHUNK_RECORDS, start: int = 0, stop: int = None) -> TrackingReport:
+    """
+    joint state 기록 (JointStateLog)을 chunk_records씩 읽으며 via point 그룹 재생 궤적과 비교.
+    Args:
+        p2p_data: [(duration, target_pos [rad]), ...] (CSV 행 순서)
+        joint_names: 비교할 조인트 (기록의 joint_names 중에서 선택, p2p_data 열 순서)
+        start_positions: 재생 시작 위치 [rad] (기본: 재생 시간이 처음 기록된 record 직전의 측정 위치)
+        time_offset: 주면 기준 궤적 시간 = record time - time_offset (playback_time이 없는 기록용),
+                     없으면 기록된 playback_time을 사용 (NaN record는 제외)
+        use_targets: 기록된 target (실제 명령 위치)을 기준 위치로 사용. live 모드는 구간마다 측정 위치에서 다시
+                     출발하므로 via point만으로 만든 스플라인이 명령과 다름 (구간 / lag 기준 속도는 스플라인 그대로)
+    """
+    columns = [log.joint_names.index(name) for name in joint_names]
+    analyzer = None
+    previous = None
+    for chunk in log.chunks(chunk_records, start, stop):
+        if time_offset is None:
+            t = np.array(chunk["playback_time"])
+            valid = np.isfinite(t)
+        else:
+            t = chunk["time"] - time_offset
+            valid = t >= 0.0
+        positions = np.array(chunk["position"][:, columns])
+        targets = None
+        if use_targets:
+            targets = np.array(chunk["target"][:, columns])
+            valid &= np.isfinite(targets).all(axis=1)
+        del chunk
+
+        if analyzer is None:
+            first = np.flatnonzero(valid)
+            if first.size == 0:
+                previous = positions[-1]
+                continue
+            if start_positions is None:
+                i = first[0]
+                start_positions = positions[i - 1] if i > 0 else (previous if previous is not None else positions[i])
+            reference = PiecewiseHermiteSpline.from_via_points(start_positions, p2p_data,
+                                                               stop_at_via_points=stop_at_via_points)
+            analyzer = TrackingErrorAnalyzer(reference, joint_names)
+        analyzer.add_chunk(t[valid], positions[valid], targets[valid] if targets is not None else None)
+
+    if analyzer is None:
+        raise ValueError(f"{log.path}: 재생 시간이 기록된 record가 없습니다 (time_offset을 지정하세요).")
+    return analyzer.report()
+
+
+def _segment_maximum(target: np.ndarray, seg: np.ndarray, values: np.ndarray):
+    """target[seg[i]] = max(target[seg[i]], values[i]) (np.maximum.at보다 빠르게 구간별 연속 구간 reduceat)"""
+    if seg.shape[0] == 0:
+        return
+    # 보통 재생 시간 순서라 이미 정렬되어 있음 (seek / reverse 재생만 정렬)
+    if np.any(seg[1:] < seg[:-1]):
+        order = np.argsort(seg, kind="stable")
+        seg, values = seg[order], values[order]
+    starts = np.flatnonzero(np.concatenate(([True], seg[1:] != seg[:-1])))
+    rows = seg[starts]
+    target[rows] = np.maximum(target[rows], np.maximum.reduceat(values, starts, axis=0))
+
+
+def _format(value: float, decimals: int) -> str:
+    return f"{value:.{decimals}f}" if np.isfinite(value) else ""
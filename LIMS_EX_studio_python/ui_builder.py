@@ -7,13 +7,17 @@
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 #
 
+import os
+import time
 import numpy as np
+import omni.kit.app
 import omni.timeline
 import omni.ui as ui
 from isaacsim.core.api.objects.cuboid import FixedCuboid
 from isaacsim.core.api.world import World
-from isaacsim.core.prims import SingleArticulation, XFormPrim
-from isaacsim.core.utils.prims import is_prim_path_valid
+from isaacsim.core.cloner import Cloner
+from isaacsim.core.prims import Articulation, SingleArticulation, XFormPrim
+from isaacsim.core.utils.prims import delete_prim, is_prim_path_valid
 from isaacsim.core.utils.stage import add_reference_to_stage, create_new_stage, get_current_stage
 from isaacsim.examples.extension.core_connectors import LoadButton, ResetButton
 from isaacsim.gui.components.element_wrappers import CollapsableFrame, StateButton
@@ -26,6 +30,8 @@ from .global_variables import *
 from .scenario import ExampleScenario
 from .p2p_studio.via_point_manager import ViaPointManager
 from .p2p_studio.p2p_studio import P2PStudio 
+from .profiling.callback_timer import CallbackTimer
+from .profiling.sampling_profiler import StepSamplingProfiler
 
 
 class UIBuilder:
@@ -34,6 +40,8 @@ class UIBuilder:
         self.frames = []
         # UI elements created using a UIElementWrapper instance
         self.wrapped_ui_elements = []
+        # build_ui에서 생성
+        self.p2p_studio = None
 
         # Get access to the timeline to control stop/pause/play programmatically
         self._timeline = omni.timeline.get_timeline_interface()
@@ -66,6 +74,7 @@ class UIBuilder:
             # button instead of using the Load/Reset/Run buttons provided.
             self._scenario_state_btn.reset()
             self._scenario_state_btn.enabled = False
+            self._cancel_profile("timeline 정지")
 
     def on_physics_step(self, step: float):
         """Callback for Physics Step.
@@ -94,6 +103,10 @@ class UIBuilder:
         """
         for ui_elem in self.wrapped_ui_elements:
             ui_elem.cleanup()
+        self._step_timing_sub = None
+        self._cancel_profile("extension 종료")
+        if self.p2p_studio is not None:
+            self.p2p_studio.cleanup()
 
     def build_ui(self):
         """
@@ -126,7 +139,7 @@ class UIBuilder:
                     "STOP",
                     on_a_click_fn=self._on_run_scenario_a_text,
                     on_b_click_fn=self._on_run_scenario_b_text,
-                    physics_callback_fn=self._update_scenario,
+                    physics_callback_fn=CallbackTimer.instance().wrap("UIBuilder._update_scenario", self._update_scenario),
                 )
                 self._scenario_state_btn.enabled = False
                 self.wrapped_ui_elements.append(self._scenario_state_btn)
@@ -145,6 +158,8 @@ class UIBuilder:
                         traj_dir=TRAJECTORY_DIR,
                         p2p_name_field=self._p2p_name_field,
                     )
+                    # 입력한 그룹은 Play를 누르기 전에 미리 로드
+                    self._p2p_name_field.model.add_end_edit_fn(lambda model: self.p2p_studio.on_group_field_changed())
 
                 with ui.HStack(height=UILayout.BUTTON_HEIGHT_LARGE):
                     UIComponentFactory.create_styled_button(
@@ -152,6 +167,78 @@ class UIBuilder:
                         callback=self.p2p_studio.on_p2p_play_clicked,
                         color_scheme='blue'
                     )
+                    UIComponentFactory.create_styled_button(
+                        "Playlist",
+                        callback=self.p2p_studio.on_playlist_play_clicked,
+                        color_scheme='blue'
+                    )
+                    UIComponentFactory.create_styled_button(
+                        "Library",
+                        callback=self.p2p_studio.on_library_clicked,
+                        color_scheme='blue'
+                    )
+                    ui.Label("Loop", width=UILayout.LABEL_WIDTH_SMALL)
+                    playlist_loop_checkbox = ui.CheckBox(width=UILayout.LABEL_WIDTH_SMALL)
+                    playlist_loop_checkbox.model.add_value_changed_fn(
+                        lambda model: setattr(self.p2p_studio, "playlist_loop", model.get_value_as_bool())
+                    )
+
+                with ui.HStack(height=UILayout.BUTTON_HEIGHT_LARGE):
+                    ui.Label("Fleet:", width=UILayout.LABEL_WIDTH_SMALL)
+                    self._fleet_size_field = ui.IntField(height=UILayout.BUTTON_HEIGHT)
+                    self._fleet_size_field.model.set_value(4)
+                    UIComponentFactory.create_styled_button(
+                        "Fleet Setup",
+                        callback=self._on_fleet_setup_clicked,
+                        color_scheme='yellow'
+                    )
+                    UIComponentFactory.create_styled_button(
+                        "Fleet Play",
+                        callback=self.p2p_studio.on_fleet_play_clicked,
+                        color_scheme='blue'
+                    )
+
+                with ui.HStack(height=UILayout.BUTTON_HEIGHT_LARGE):
+                    ui.Label("Stream Port:", width=UILayout.LABEL_WIDTH_MEDIUM)
+                    stream_port_field = ui.IntField(height=UILayout.BUTTON_HEIGHT)
+                    stream_port_field.model.set_value(VIA_POINT_STREAM_PORT)
+                    stream_port_field.model.add_end_edit_fn(
+                        lambda model: setattr(self.p2p_studio, "stream_port", model.get_value_as_int())
+                    )
+                    UIComponentFactory.create_styled_button(
+                        "Stream",
+                        callback=self.p2p_studio.on_stream_clicked,
+                        color_scheme='blue'
+                    )
+
+                with ui.HStack(height=UILayout.BUTTON_HEIGHT_LARGE):
+                    ui.Label("Playback Mode:", width=UILayout.LABEL_WIDTH_MEDIUM)
+                    playback_mode_combo = ui.ComboBox(0, *P2PStudio.PLAYBACK_MODES, height=UILayout.BUTTON_HEIGHT)
+                    playback_mode_combo.model.add_item_changed_fn(
+                        lambda model, item: self.p2p_studio.set_playback_mode(
+                            P2PStudio.PLAYBACK_MODES[model.get_item_value_model().as_int]
+                        )
+                    )
+
+                with ui.HStack(height=UILayout.BUTTON_HEIGHT_LARGE):
+                    ui.Label("Speed:", width=UILayout.LABEL_WIDTH_SMALL)
+                    playback_speed_field = ui.FloatField(height=UILayout.BUTTON_HEIGHT)
+                    playback_speed_field.model.set_value(1.0)
+                    playback_speed_field.model.add_end_edit_fn(
+                        lambda model: self.p2p_studio.set_playback_speed(model.get_value_as_float())
+                    )
+                    UIComponentFactory.create_styled_button(
+                        "Reverse",
+                        callback=self.p2p_studio.on_reverse_clicked,
+                        color_scheme='yellow'
+                    )
+
+                with ui.HStack(height=UILayout.BUTTON_HEIGHT_LARGE):
+                    ui.Label("Seek:", width=UILayout.LABEL_WIDTH_SMALL)
+                    seek_slider = ui.FloatSlider(min=0.0, max=1.0, height=UILayout.BUTTON_HEIGHT)
+                    seek_slider.model.add_value_changed_fn(
+                        lambda model: self.p2p_studio.seek_fraction(model.get_value_as_float())
+                    )
 
                 with ui.HStack(height=UILayout.BUTTON_HEIGHT_LARGE):
                     UIComponentFactory.create_styled_button(
@@ -164,6 +251,16 @@ class UIBuilder:
                         callback=self.p2p_studio.on_via_point_clicked,
                         color_scheme='yellow'
                     )
+                    UIComponentFactory.create_styled_button(
+                        "Retime",
+                        callback=self.p2p_studio.on_retime_clicked,
+                        color_scheme='green'
+                    )
+                    UIComponentFactory.create_styled_button(
+                        "Collision",
+                        callback=self.p2p_studio.on_collision_check_clicked,
+                        color_scheme='yellow'
+                    )
 
                 with ui.HStack(height=UILayout.BUTTON_HEIGHT_LARGE):
 
@@ -177,15 +274,150 @@ class UIBuilder:
                         callback=self.p2p_studio.on_remove_clicked,
                         color_scheme='red'
                     )
+                    UIComponentFactory.create_styled_button(
+                        "Record",
+                        callback=self.p2p_studio.on_record_clicked,
+                        color_scheme='green'
+                    )
+
+                with ui.HStack(height=UILayout.BUTTON_HEIGHT_LARGE):
+                    ui.Label("Tolerance [deg]:", width=UILayout.LABEL_WIDTH_MEDIUM)
+                    compression_tolerance_field = ui.FloatField(height=UILayout.BUTTON_HEIGHT)
+                    compression_tolerance_field.model.set_value(VIA_POINT_COMPRESSION_TOLERANCE_DEG)
+                    compression_tolerance_field.model.add_end_edit_fn(
+                        lambda model: setattr(self.p2p_studio, "compression_tolerance_deg", model.get_value_as_float())
+                    )
+                    UIComponentFactory.create_styled_button(
+                        "Compress",
+                        callback=self.p2p_studio.on_compress_clicked,
+                        color_scheme='green'
+                    )
+                    UIComponentFactory.create_styled_button(
+                        "Analyze",
+                        callback=self.p2p_studio.on_analyze_clicked,
+                        color_scheme='yellow'
+                    )
+
+        step_timing_frame = CollapsableFrame("Step Timing")
+
+        with step_timing_frame:
+            with ui.VStack(spacing=5):
+                self._step_timing_label = ui.Label("기록 없음", word_wrap=True, height=UILayout.LABEL_HEIGHT * 3)
+
+                with ui.HStack(height=UILayout.BUTTON_HEIGHT_LARGE):
+                    UIComponentFactory.create_styled_button(
+                        "Reset",
+                        callback=self._on_step_timing_reset_clicked,
+                        color_scheme='red'
+                    )
+                    UIComponentFactory.create_styled_button(
+                        "Export",
+                        callback=self._on_step_timing_export_clicked,
+                        color_scheme='green'
+                    )
+
+                with ui.HStack(height=UILayout.BUTTON_HEIGHT_LARGE):
+                    ui.Label("Profile Steps:", width=UILayout.LABEL_WIDTH_MEDIUM)
+                    self._profile_steps_field = ui.IntField(height=UILayout.BUTTON_HEIGHT)
+                    self._profile_steps_field.model.set_value(300)
+                    UIComponentFactory.create_styled_button(
+                        "Profile",
+                        callback=self._on_profile_clicked,
+                        color_scheme='yellow'
+                    )
+
+        # 통계 표시는 physics step이 아닌 app update에서 주기적으로 갱신 (측정값에 영향 없도록)
+        self._step_timing_refresh_time = 0.0
+        self._step_timing_sub = omni.kit.app.get_app().get_update_event_stream().create_subscription_to_pop(
+            self._on_step_timing_update
+        )
 
 
     ######################################################################################
     # Functions Below This Point Support The Provided Example And Can Be Deleted/Replaced
     ######################################################################################
 
+    def _on_step_timing_update(self, event):
+        now = time.monotonic()
+        if now - self._step_timing_refresh_time < STEP_TIMING_REFRESH_PERIOD:
+            return
+        self._step_timing_refresh_time = now
+        self._step_timing_label.text = CallbackTimer.instance().summary()
+
+    def _on_step_timing_reset_clicked(self):
+        CallbackTimer.instance().reset()
+        self._step_timing_label.text = CallbackTimer.instance().summary()
+
+    def _on_step_timing_export_clicked(self):
+        path = os.path.join(TRAJECTORY_DIR, f"step_timing_{time.strftime('%Y%m%d_%H%M%S')}.csv")
+        try:
+            CallbackTimer.instance().export(path)
+            print(f"✅ Step timing 저장 완료: {path}")
+        except OSError as e:
+            print(f"❌ Step timing 저장 실패: {e}")
+
+    def _on_profile_clicked(self):
+        """다음 N physics step 동안 callback 실행 구간만 샘플링 프로파일 (프로파일 중에 다시 누르면 취소)"""
+        timer = CallbackTimer.instance()
+        if self._cancel_profile("사용자 취소"):
+            return
+        n_steps = self._profile_steps_field.model.get_value_as_int()
+        if n_steps <= 0:
+            print("⚠️ Profile step 수는 1 이상이어야 합니다.")
+            return
+        StepSamplingProfiler(n_steps, TRAJECTORY_DIR).attach(timer)
+        print(f"▶️ 다음 {n_steps} physics step 프로파일 시작")
+
+    def _cancel_profile(self, reason: str) -> bool:
+        """진행 중인 프로파일을 분리 (모은 샘플은 저장). Returns: 취소한 프로파일이 있었는지"""
+        profiler = CallbackTimer.instance().profiler
+        if profiler is None or not profiler.active:
+            return False
+        profiler.detach(reason)
+        return True
+
+    def _on_fleet_setup_clicked(self):
+        n_robots = self._fleet_size_field.model.get_value_as_int()
+        if n_robots <= 0:
+            print("⚠️ Fleet 로봇 수는 1 이상이어야 합니다.")
+            return
+        if self._articulation is None:
+            print("❌ Load를 먼저 실행하세요.")
+            return
+        self._setup_fleet(n_robots)
+
+    def _setup_fleet(self, n_robots: int):
+        """
+        LIMS_EX를 FLEET_PRIM_ROOT 아래 n_robots개로 복제해 격자로 배치하고,
+        하나의 batched Articulation view로 묶어 World에 추가 (World reset 필요)
+        """
+        world = World.instance()
+        if world.scene.object_exists(FLEET_VIEW_NAME):
+            world.scene.remove_object(FLEET_VIEW_NAME)
+        if is_prim_path_valid(FLEET_PRIM_ROOT):
+            delete_prim(FLEET_PRIM_ROOT)
+        get_current_stage().DefinePrim(FLEET_PRIM_ROOT, "Xform")
+
+        cloner = Cloner()
+        prim_paths = cloner.generate_paths(f"{FLEET_PRIM_ROOT}/{LIMS_EX_PRIM_NAME}", n_robots)
+        # 원본 로봇(원점)과 겹치지 않도록 +y 방향부터 격자 배치
+        side = int(np.ceil(np.sqrt(n_robots)))
+        index = np.arange(n_robots)
+        positions = np.stack([index % side, index // side + 1, np.zeros(n_robots)], axis=1) * FLEET_SPACING
+        cloner.clone(source_prim_path=LIMS_EX_PRIM_PATH, prim_paths=prim_paths, positions=positions,
+                     copy_from_source=True)
+
+        self._fleet_view = Articulation(prim_paths_expr=f"{FLEET_PRIM_ROOT}/{LIMS_EX_PRIM_NAME}_.*",
+                                        name=FLEET_VIEW_NAME)
+        world.scene.add(self._fleet_view)
+        world.reset()
+        self._on_post_reset_btn()
+        print(f"✅ Fleet 준비 완료: {n_robots} robots ({FLEET_PRIM_ROOT})")
+
     def _on_init(self):
         self._articulation = None
         self._cuboid = None
+        self._fleet_view = None
         self._scenario = ExampleScenario()
 
     def _add_light_to_stage(self):
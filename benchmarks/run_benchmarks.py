@@ -0,0 +1,296 @@
+"""
+Omniverse 없이 돌아가는 hot path 벤치마크 (spline, CSV I/O, FK/IK, playback callback).
+baseline.json과 비교해 threshold를 넘으면 exit code 1.
+
+    python benchmarks/run_benchmarks.py                    # baseline과 비교
+    python benchmarks/run_benchmarks.py --filter csv       # 이름에 csv가 들어간 항목만
+    python benchmarks/run_benchmarks.py --update-baseline  # 현재 결과를 baseline으로 저장
+"""
+import os
+import sys
+import json
+import time
+import types
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = "LIMS_EX_studio_python"
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# extension __init__ (omni.ext import)을 실행하지 않고 패키지를 namespace로 등록
+if PACKAGE_NAME not in sys.modules:
+    _package = types.ModuleType(PACKAGE_NAME)
+    _package.__path__ = [os.path.join(REPO_ROOT, PACKAGE_NAME)]
+    sys.modules[PACKAGE_NAME] = _package
+
+from LIMS_EX_studio_python.headless.playback_benchmark import run_playback, write_synthetic_group  # noqa: E402
+from LIMS_EX_studio_python.p2p_studio.via_point_manager import IRIMCubicHermiteSpline  # noqa: E402
+from LIMS_EX_studio_python.p2p_studio.piecewise_spline import PiecewiseHermiteSpline  # noqa: E402
+from LIMS_EX_studio_python.p2p_studio import trajectory_io  # noqa: E402
+from LIMS_EX_studio_python.p2p_studio.via_point_compression import compress_trajectory  # noqa: E402
+from LIMS_EX_studio_python.ik_solver.urdf_kinematics import LIMSExForwardKinematics  # noqa: E402
+from LIMS_EX_studio_python.ik_solver.dls_ik_solver import LIMSExDLSKinematicsSolver  # noqa: E402
+from LIMS_EX_studio_python.global_variables import LIMS_EX_JOINT_NAMES  # noqa: E402
+
+VIA_POINT_SIZES = (10, 1000, 100000)
+PLAYBACK_SIZES = (10, 1000)
+# playback 한 번에 측정하는 최대 step 수
+PLAYBACK_MAX_STEPS = 20000
+# dense 기록 압축 샘플 수 (1 kHz 기록 200 s 분량)
+COMPRESSION_SAMPLES = 200000
+
+# 비율 threshold (현재 / baseline)와 노이즈 하한 (차이가 이보다 작으면 무시)
+DEFAULT_THRESHOLDS = {
+    "time_s": {"ratio": 1.75, "floor": 2e-4},
+    "peak_bytes": {"ratio": 1.3, "floor": 64 * 1024},
+    "p50_us": {"ratio": 1.5, "floor": 5.0},
+    "p99_us": {"ratio": 2.0, "floor": 20.0},
+}
+
+
+def synthetic_positions(n_points: int, seed: int = 0) -> np.ndarray:
+    """조인트 범위 안의 랜덤 via point (N, 9) [rad]"""
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-1.0, 1.0, size=(n_points, len(LIMS_EX_JOINT_NAMES)))
+
+
+def measure(fn, repeat: int = 5) -> dict:
+    """fn() 실행 시간 최솟값 (노이즈에 가장 덜 민감) + tracemalloc peak (별도 1회 실행)"""
+    fn()  # warm-up
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"time_s": float(np.min(times)), "peak_bytes": int(peak)}
+
+
+# ========================================
+# 벤치마크 정의: 이름 -> 결과 dict
+# ========================================
+def bench_irim_get_target() -> dict:
+    spline = IRIMCubicHermiteSpline(len(LIMS_EX_JOINT_NAMES))
+    positions = synthetic_positions(4)
+    for duration, position in zip((0.0, 0.0, 3.0, 0.0), positions):
+        spline.add_back_via_point(duration, position)
+    t_ms = np.linspace(0.0, 3000.0, 1000).tolist()
+
+    def run():
+        for t in t_ms:
+            spline.get_target(t)
+    return measure(run)
+
+
+def bench_piecewise(n_points: int) -> dict:
+    positions = synthetic_positions(n_points + 1)
+    durations = np.full(n_points, 0.5)
+    results = {}
+    results[f"piecewise_build_{n_points}"] = measure(lambda: PiecewiseHermiteSpline(durations, positions))
+
+    spline = PiecewiseHermiteSpline(durations, positions)
+    times = np.random.default_rng(1).uniform(0.0, spline.duration, 1000).tolist()
+
+    def evaluate_scalar():
+        for t in times:
+            spline.evaluate(t)
+    results[f"piecewise_evaluate_{n_points}"] = measure(evaluate_scalar)
+
+    batch = np.linspace(0.0, spline.duration, 100000)
+    results[f"piecewise_evaluate_batch_{n_points}"] = measure(lambda: spline.evaluate_batch(batch))
+    return results
+
+
+def bench_csv_io(n_points: int, work_dir: str) -> dict:
+    positions_deg = np.degrees(synthetic_positions(n_points))
+    durations = np.full(n_points, 0.5)
+    csv_path = os.path.join(work_dir, f"io_{n_points}.csv")
+    results = {}
+    results[f"csv_write_{n_points}"] = measure(
+        lambda: trajectory_io.write_via_point_csv(csv_path, durations, positions_deg, LIMS_EX_JOINT_NAMES), repeat=3
+    )
+    results[f"csv_parse_{n_points}"] = measure(lambda: trajectory_io.read_via_point_csv(csv_path), repeat=3)
+
+    def load_cold():
+        trajectory_io.clear_trajectory_cache()
+        return trajectory_io.load_via_points(csv_path).p2p_data
+    results[f"load_via_points_{n_points}"] = measure(load_cold, repeat=3)
+    return results
+
+
+def check_csv_round_trip(work_dir: str) -> dict:
+    """CSV -> 바이너리 -> 캐시 로드가 같은 값을 돌려주는지 확인 (빈 그룹 포함). 다르면 RuntimeError"""
+    for n_points in (0, 3):
+        positions_deg = np.round(np.degrees(synthetic_positions(n_points)), trajectory_io.CSV_DECIMALS)
+        durations = np.full(n_points, 0.5)
+        csv_path = os.path.join(work_dir, f"round_trip_{n_points}.csv")
+        trajectory_io.write_via_point_csv(csv_path, durations, positions_deg, LIMS_EX_JOINT_NAMES)
+        if os.path.exists(trajectory_io.binary_path_for(csv_path)):
+            os.remove(trajectory_io.binary_path_for(csv_path))
+        # 1) CSV 파싱 + 바이너리 저장, 2) 바이너리 memory-map
+        for source in ("csv", "binary"):
+            trajectory_io.clear_trajectory_cache()
+            trajectory = trajectory_io.load_via_points(csv_path)
+            if (trajectory.joint_names != list(LIMS_EX_JOINT_NAMES) or trajectory.positions.shape != positions_deg.shape
+                    or not np.array_equal(trajectory.durations, durations)
+                    or not np.allclose(np.degrees(trajectory.positions), positions_deg)):
+                raise RuntimeError(f"via point round trip mismatch ({source}, {n_points} points)")
+
+    # git checkout / cp -p처럼 바이너리보다 오래된 mtime, 같은 크기로 바뀐 CSV -> 바이너리 대신 CSV를 다시 읽어야 함
+    binary_stat = os.stat(trajectory_io.binary_path_for(csv_path))
+    with open(csv_path) as f:
+        text = f.read()
+    with open(csv_path, "w") as f:
+        f.write(text.replace("\n0.5,", "\n0.7,"))
+    os.utime(csv_path, ns=(binary_stat.st_mtime_ns - 10**9, binary_stat.st_mtime_ns - 10**9))
+    trajectory_io.clear_trajectory_cache()
+    if not np.array_equal(trajectory_io.load_via_points(csv_path).durations, np.full(n_points, 0.7)):
+        raise RuntimeError("stale via point binary used after the CSV changed")
+    return {}
+
+
+def bench_kinematics() -> dict:
+    fk = LIMSExForwardKinematics()
+    q = synthetic_positions(10000)
+    results = {"fk_batch_10000": measure(lambda: fk.compute_link_poses(q))}
+
+    solver = LIMSExDLSKinematicsSolver()
+    q_arm = 0.5 * synthetic_positions(1000, seed=2)[:, :len(solver.get_joint_names())]
+    _, targets = solver.compute_frame_poses(q_arm)
+    results["ik_solve_batch_1000"] = measure(lambda: solver.solve_batch(targets), repeat=3)
+    return results
+
+
+def bench_playback(n_points: int, work_dir: str) -> dict:
+    group = f"playback{n_points}"
+    if not os.path.isdir(os.path.join(work_dir, group + "_group")):
+        write_synthetic_group(work_dir, group, n_points)
+    results = {}
+    for mode in ("live", "compiled", "continuous", "inplace"):
+        result = run_playback(work_dir, group, mode, 1.0 / 60.0, max_steps=PLAYBACK_MAX_STEPS)
+        latency = result["latency_us"]
+        results[f"playback_{mode}_{n_points}"] = {"p50_us": latency["p50"], "p99_us": latency["p99"]}
+    return results
+
+
+def bench_compression(n_samples: int) -> dict:
+    positions = synthetic_positions(n_samples // 1000 + 1)
+    spline = PiecewiseHermiteSpline(np.full(positions.shape[0] - 1, 1.0), positions)
+    times = np.linspace(0.0, spline.duration, n_samples)
+    dense, _ = spline.evaluate_batch(times)
+    tolerance = np.radians(0.1)
+    return {f"compress_{n_samples}": measure(lambda: compress_trajectory(times, dense, tolerance), repeat=1)}
+
+
+def run_all(name_filter: str = None) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        suites = [("irim_get_target_1000", lambda: {"irim_get_target_1000": bench_irim_get_target()})]
+        for n in VIA_POINT_SIZES:
+            suites.append((f"piecewise_{n}", lambda n=n: bench_piecewise(n)))
+            suites.append((f"csv_{n}", lambda n=n: bench_csv_io(n, work_dir)))
+        suites.append(("csv_round_trip", lambda: check_csv_round_trip(work_dir)))
+        suites.append(("kinematics", bench_kinematics))
+        suites.append((f"compress_{COMPRESSION_SAMPLES}", lambda: bench_compression(COMPRESSION_SAMPLES)))
+        for n in PLAYBACK_SIZES:
+            suites.append((f"playback_{n}", lambda n=n: bench_playback(n, work_dir)))
+
+        for suite_name, suite in suites:
+            if name_filter and name_filter not in suite_name:
+                continue
+            # playback 등에서 나오는 진행 메시지는 숨김
+            stdout = sys.stdout
+            sys.stdout = open(os.devnull, "w")
+            try:
+                suite_results = suite()
+            finally:
+                sys.stdout.close()
+                sys.stdout = stdout
+            for name, metrics in suite_results.items():
+                results[name] = metrics
+                print(f"  {name:<36} " + ", ".join(_format_metric(k, v) for k, v in metrics.items()))
+    return results
+
+
+def compare(results: dict, baseline: dict) -> list:
+    """Returns: [(이름, metric, 현재, baseline, 비율), ...] threshold를 넘은 항목"""
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    thresholds.update(baseline.get("thresholds", {}))
+    regressions = []
+    for name, metrics in results.items():
+        base_metrics = baseline.get("results", {}).get(name)
+        if base_metrics is None:
+            continue
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            threshold = thresholds.get(metric)
+            if base is None or threshold is None or base <= 0:
+                continue
+            if value > base * threshold["ratio"] and value - base > threshold["floor"]:
+                regressions.append((name, metric, value, base, value / base))
+    return regressions
+
+
+def _format_metric(metric: str, value: float) -> str:
+    if metric == "time_s":
+        return f"{value * 1000:.3f} ms"
+    if metric == "peak_bytes":
+        return f"{value / 1024:.0f} KiB peak"
+    return f"{metric[:-3]} {value:.1f} us"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LIMS_EX hot path benchmarks")
+    parser.add_argument("--filter", default=None, help="suite 이름에 포함된 문자열")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="현재 결과를 baseline으로 저장")
+    parser.add_argument("--json", default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args(argv)
+
+    print(f"▶️ Benchmarks ({platform.python_implementation()} {platform.python_version()}, numpy {np.__version__})")
+    results = run_all(args.filter)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.setdefault("thresholds", DEFAULT_THRESHOLDS)
+        baseline["machine"] = f"{platform.machine()} {platform.processor()} / python {platform.python_version()}"
+        baseline.setdefault("results", {}).update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"✅ baseline 저장 완료: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️ baseline 없음: {args.baseline} (--update-baseline으로 생성)")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline)
+    if not regressions:
+        print(f"✅ 회귀 없음 ({len(results)} benchmarks)")
+        return 0
+    print(f"❌ 성능 회귀 {len(regressions)}건:")
+    for name, metric, value, base, ratio in regressions:
+        print(f"   {name} {metric}: {_format_metric(metric, value)} vs baseline {_format_metric(metric, base)} "
+              f"(x{ratio:.2f})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())